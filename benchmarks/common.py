@@ -0,0 +1,39 @@
+from typing import Dict, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Возвращает перцентиль методом ближайшего ранга.
+
+    Args:
+        values: Отсортированный список значений
+        pct: Перцентиль от 0 до 100
+
+    Returns:
+        float: Значение перцентиля
+    """
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """
+    Сводка по выборке длительностей в секундах (результат в мс).
+
+    Args:
+        values: Длительности в секундах
+
+    Returns:
+        Dict[str, float]: count, mean, p50, p95, p99, max
+    """
+    ordered = sorted(v * 1000 for v in values)
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "max": round(ordered[-1], 3) if ordered else 0.0,
+    }
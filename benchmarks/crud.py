@@ -0,0 +1,339 @@
+"""
+Бенчмарк функций database/crud на больших таблицах.
+
+Заполняет базу (SQLite по умолчанию, можно PostgreSQL) заданным числом
+пользователей и напоминаний, замеряет каждую функцию CRUD и выборку
+просроченных напоминаний, сохраняет планы запросов и пишет JSON-отчет.
+
+Пример:
+    python -m benchmarks.crud --users 100000 --reminders 1000000 \\
+        --output crud_report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
+
+from benchmarks.common import summarize
+from database.base import Base
+from database.crud import reminders as reminder_crud
+from database.crud import users as user_crud
+from database.models import Reminder, User
+
+
+TG_ID_BASE = 1_000_000_000
+SEED_CHUNK = 10_000
+RECURRENCE_RULES = ("daily@09:00", "weekly:0@10:00", "weekly:4@18:30")
+
+
+class StatementRecorder:
+    """Собирает SQL, выполненный движком, пока запись включена."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.statements: List[Tuple[str, Any]] = []
+        self.enabled = False
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            self._before_cursor_execute
+        )
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if self.enabled and not executemany:
+            self.statements.append((statement, parameters))
+
+    def start(self):
+        self.statements = []
+        self.enabled = True
+
+    def stop(self) -> List[Tuple[str, Any]]:
+        self.enabled = False
+        return self.statements
+
+
+def to_async_url(url: str) -> str:
+    """Подставляет асинхронный драйвер так же, как database/session.py."""
+    return url.replace("sqlite://", "sqlite+aiosqlite://")
+
+
+async def seed(engine: AsyncEngine, users: int, reminders: int, now: int):
+    """
+    Создает схему и заполняет таблицы пачками через executemany.
+
+    Напоминания распределены по пользователям случайно, время -
+    в пределах ±30 дней от текущего; 90% прошедших отмечены
+    отправленными, около 5% повторяющиеся.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(42)
+    for start in range(0, users, SEED_CHUNK):
+        rows = [
+            {
+                "id": i + 1,
+                "tg_id": TG_ID_BASE + i,
+                "is_blocked": rng.random() < 0.01,
+            }
+            for i in range(start, min(start + SEED_CHUNK, users))
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), rows)
+
+    month = 30 * 24 * 3600
+    for start in range(0, reminders, SEED_CHUNK):
+        rows = []
+        for _ in range(start, min(start + SEED_CHUNK, reminders)):
+            remind_at = now + rng.randint(-month, month)
+            rows.append({
+                "user_id": rng.randint(1, users),
+                "text": f"reminder {rng.getrandbits(32):08x}",
+                "remind_at": remind_at,
+                "is_sent": remind_at < now and rng.random() < 0.9,
+                "recurrence": (
+                    rng.choice(RECURRENCE_RULES)
+                    if rng.random() < 0.05 else None
+                ),
+            })
+        async with engine.begin() as conn:
+            await conn.execute(insert(Reminder), rows)
+
+
+async def explain(
+    engine: AsyncEngine,
+    statements: List[Tuple[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Строит планы для записанных запросов.
+
+    Для SQLite используется EXPLAIN QUERY PLAN, для остальных СУБД - EXPLAIN.
+    """
+    prefix = (
+        "EXPLAIN QUERY PLAN "
+        if engine.dialect.name == "sqlite" else "EXPLAIN "
+    )
+    plans = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(
+            ("SELECT", "UPDATE", "DELETE")
+        ):
+            continue
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                prefix + statement,
+                tuple(parameters) if parameters else ()
+            )
+            plan = [" ".join(str(col) for col in row) for row in result]
+            await conn.rollback()
+        plans.append({"statement": statement, "plan": plan})
+    return plans
+
+
+class CrudBenchmark:
+    """Замеры функций CRUD на заполненной базе."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        users: int,
+        reminders: int,
+        now: int
+    ):
+        self.engine = engine
+        self.sessions = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+        self.recorder = StatementRecorder(engine)
+        self.users = users
+        self.reminders = reminders
+        self.now = now
+        self.rng = random.Random(7)
+        self._next_tg_id = TG_ID_BASE + users
+        self._deletable: List[int] = []
+
+    def _random_tg_id(self) -> int:
+        return TG_ID_BASE + self.rng.randrange(self.users)
+
+    def _new_tg_id(self) -> int:
+        self._next_tg_id += 1
+        return self._next_tg_id
+
+    def _random_reminder_id(self) -> int:
+        return self.rng.randint(1, self.reminders)
+
+    def cases(self) -> Dict[str, Callable[[AsyncSession], Awaitable[Any]]]:
+        """Функции CRUD со случайными аргументами из заполненных диапазонов."""
+        rng = self.rng
+        return {
+            "users.get_user": lambda db: user_crud.get_user(
+                db, self._random_tg_id()
+            ),
+            "users.create_user": lambda db: user_crud.create_user(
+                db, self._new_tg_id()
+            ),
+            "users.block_user": lambda db: user_crud.block_user(
+                db, self._random_tg_id(), "benchmark"
+            ),
+            "users.unblock_user": lambda db: user_crud.unblock_user(
+                db, self._random_tg_id()
+            ),
+            "users.set_timezone": lambda db: user_crud.set_timezone(
+                db, self._random_tg_id(), "Europe/Moscow"
+            ),
+            "users.get_all_users": user_crud.get_all_users,
+            "reminders.create_reminder": lambda db: self._create(db),
+            "reminders.get_pending_reminders": (
+                lambda db: reminder_crud.get_pending_reminders(
+                    db, rng.randint(1, self.users)
+                )
+            ),
+            "reminders.get_reminder": lambda db: reminder_crud.get_reminder(
+                db, self._random_reminder_id()
+            ),
+            "reminders.get_due_reminders": (
+                lambda db: reminder_crud.get_due_reminders(db, self.now, 100)
+            ),
+            "reminders.mark_reminder_as_sent": (
+                lambda db: reminder_crud.mark_reminder_as_sent(
+                    db, self._random_reminder_id()
+                )
+            ),
+            "reminders.update_reminder_time": (
+                lambda db: reminder_crud.update_reminder_time(
+                    db, self._random_reminder_id(), self.now + 3600
+                )
+            ),
+            "reminders.delete_reminder": lambda db: self._delete(db),
+            "reminders.get_all_reminders": reminder_crud.get_all_reminders,
+        }
+
+    async def _create(self, db: AsyncSession):
+        reminder = await reminder_crud.create_reminder(
+            db,
+            self.rng.randint(1, self.users),
+            "benchmark",
+            self.now + 3600
+        )
+        self._deletable.append(reminder.id)
+        return reminder
+
+    async def _delete(self, db: AsyncSession):
+        reminder_id = (
+            self._deletable.pop() if self._deletable
+            else self._random_reminder_id()
+        )
+        return await reminder_crud.delete_reminder(db, reminder_id)
+
+    async def measure(
+        self,
+        name: str,
+        case: Callable[[AsyncSession], Awaitable[Any]],
+        runs: int
+    ) -> Dict[str, Any]:
+        """
+        Выполняет функцию `runs` раз, каждый раз в новой сессии,
+        как это делают сервисы. Первый вызов прогревочный: по нему
+        записываются SQL и строятся планы.
+        """
+        self.recorder.start()
+        async with self.sessions() as db:
+            await case(db)
+        statements = self.recorder.stop()
+
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            async with self.sessions() as db:
+                await case(db)
+            timings.append(time.perf_counter() - started)
+
+        return {
+            **summarize(timings),
+            "plans": await explain(self.engine, statements),
+        }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Заполняет базу, выполняет замеры и собирает отчет."""
+    url = args.database_url or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "crud_bench.db"
+    )
+    engine = create_async_engine(to_async_url(url), echo=False)
+    now = int(time.time())
+
+    seed_seconds = None
+    if not args.reuse:
+        started = time.perf_counter()
+        await seed(engine, args.users, args.reminders, now)
+        seed_seconds = round(time.perf_counter() - started, 2)
+
+    async with engine.connect() as conn:
+        users = await conn.scalar(select(func.count()).select_from(User))
+        reminders = await conn.scalar(
+            select(func.max(Reminder.id)).select_from(Reminder)
+        )
+
+    bench = CrudBenchmark(engine, users, reminders or 0, now)
+    results = {}
+    for name, case in bench.cases().items():
+        if any(skipped in name for skipped in args.skip):
+            continue
+        runs = args.scan_runs if ".get_all_" in name else args.runs
+        results[name] = await bench.measure(name, case, runs)
+        print(
+            f"{name:<36}{results[name]['p50']:>10}{results[name]['p95']:>10}"
+            f"{results[name]['p99']:>10}"
+        )
+
+    await engine.dispose()
+    return {
+        "database": engine.dialect.name,
+        "users": users,
+        "reminders": reminders,
+        "seed_seconds": seed_seconds,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url",
+                        help="по умолчанию - временный файл SQLite")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--reminders", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--scan-runs", type=int, default=3,
+                        help="число запусков для get_all_* (полный проход)")
+    parser.add_argument("--skip", nargs="*", default=[],
+                        help="подстроки имен функций, которые не замерять")
+    parser.add_argument("--reuse", action="store_true",
+                        help="не заполнять базу заново")
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    print(f"{'function':<36}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
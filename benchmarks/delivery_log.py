@@ -0,0 +1,150 @@
+"""
+Бенчмарк журнала доставок: запись на каждую отправку против пачек.
+
+Имитирует доставки из --concurrency одновременных отправок в цикле
+событий воркера. Для каждой доставки в журнал добавляется запись:
+в режиме "sync" отдельной вставкой и фиксацией в базе, как если бы
+отправка писала журнал сама, в режиме "buffered" - через
+worker.delivery_log (очередь в памяти и вставки пачками из фонового
+потока). Замеряется время записи на пути доставки, общее время
+и число транзакций.
+
+Пример:
+    python -m benchmarks.delivery_log --deliveries 5000 --concurrency 10 \\
+        --output delivery_log.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import summarize
+
+
+async def deliveries(
+    mode: str,
+    count: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Выполняет count доставок и замеряет запись журнала."""
+    from bot.core.clock import clock
+    from database.crud.delivery_log import add_delivery_log
+    from worker.delivery_log import DeliveryLogBuffer
+    from worker.runtime import get_sessions
+
+    buffer = DeliveryLogBuffer()
+    timings: List[float] = []
+    sessions = get_sessions()
+    now = int(clock.time())
+
+    async def deliver(reminder_id: int):
+        started = time.perf_counter()
+        if mode == "sync":
+            async with sessions() as db:
+                await add_delivery_log(db, [{
+                    "reminder_id": reminder_id,
+                    "chat_id": reminder_id % 1000,
+                    "scheduled_at": now,
+                    "sent_at": now,
+                    "latency_ms": 0,
+                    "outcome": "sent"
+                }])
+        else:
+            buffer.append(reminder_id, reminder_id % 1000, now, "sent")
+        timings.append(time.perf_counter() - started)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(reminder_id: int):
+        async with semaphore:
+            await deliver(reminder_id)
+            # Отправка сообщения уступает цикл событий.
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(count)))
+    delivered = time.perf_counter() - started
+    # Выгрузка в потоке, чтобы не блокировать цикл этого потока.
+    await asyncio.to_thread(buffer.close, 60)
+    total = time.perf_counter() - started
+    return {
+        "mode": mode,
+        "deliveries": count,
+        "write": summarize(timings),
+        "deliver_seconds": round(delivered, 3),
+        "total_seconds": round(total, 3),
+        "transactions": count if mode == "sync" else buffer.batches,
+        "written": count if mode == "sync" else buffer.written,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", help="файл SQLite; по умолчанию временный")
+    parser.add_argument("--deliveries", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--flush-seconds", type=float, default=1.0)
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "delivery_log.db")
+    # Настройки читаются при импорте модулей бота, поэтому окружение
+    # задается до импорта.
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{path}",
+        "DELIVERY_LOG_BATCH_SIZE": str(args.batch_size),
+        "DELIVERY_LOG_FLUSH_SECONDS": str(args.flush_seconds),
+    })
+    os.environ.setdefault("BOT_TOKEN", "123456:DELIVERY_LOG")
+    os.environ.setdefault("REDIS_URL", "redis://localhost:6379/15")
+
+    from benchmarks.crud import to_async_url
+    from database.base import Base
+    from database.models import DeliveryLog
+    from worker.runtime import close, get_sessions, run
+
+    async def create_schema():
+        engine = create_async_engine(to_async_url(os.environ["DATABASE_URL"]))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    async def count_rows() -> int:
+        async with get_sessions()() as db:
+            return await db.scalar(
+                select(func.count()).select_from(DeliveryLog)
+            )
+
+    run(create_schema())
+    results = [
+        run(deliveries(mode, args.deliveries, args.concurrency))
+        for mode in ("sync", "buffered")
+    ]
+    rows = run(count_rows())
+    close()
+
+    for result in results:
+        write = result["write"]
+        print(
+            f"{result['mode']:>8}: write p50 {write['p50']} ms, "
+            f"p99 {write['p99']} ms; {result['deliveries']} deliveries "
+            f"in {result['deliver_seconds']}s "
+            f"({result['total_seconds']}s with flush), "
+            f"{result['transactions']} transactions"
+        )
+    print(f"log rows: {rows}")
+    if args.output:
+        report = {"config": vars(args), "results": results, "rows": rows}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Бенчмарк доставки пика напоминаний узлами воркера.
+
+Планировщик - SCHEDULER_BACKEND (--backend: database, redis или
+dramatiq). Заполняет базу напоминаниями, которые наступают одновременно, и для
+каждого числа узлов запускает столько же процессов воркера (каждый -
+отдельный узел со своей долей шардов) против локальной заглушки
+Bot API. Замеряет время, за которое доставлен весь пик, и число
+повторных доставок. Затем проверяет выкатку посреди пика: узлы по
+очереди получают SIGTERM и заменяются новыми, считаются потерянные
+и повторные напоминания. В конце проверяет отказ узла: один из двух
+узлов убивается SIGKILL, и замеряется время, за которое его шарды
+переходят к оставшемуся.
+
+Пример:
+    python -m benchmarks.dispatch --backend redis --nodes 1 2 4 \\
+        --reminders 800 --latency 0.5 --output dispatch.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from benchmarks.loadtest.fake_api import FakeTelegramAPI
+
+
+async def seed(users: int, reminders: int, due_at: int):
+    """
+    Создает пользователей и напоминания, наступающие в due_at,
+    и планирует их планировщиком SCHEDULER_BACKEND.
+    """
+    from sqlalchemy import delete, insert, select
+
+    from bot.core.redis import get_redis
+    from database.models import Reminder, User
+    from database.session import engine, init_db
+    from worker.scheduler import get_scheduler
+
+    await init_db()
+    async with engine.begin() as conn:
+        await conn.execute(delete(Reminder))
+        await conn.execute(delete(User))
+        await conn.execute(insert(User), [
+            {"id": i + 1, "tg_id": 1_000_000 + i, "is_blocked": False}
+            for i in range(users)
+        ])
+        await conn.execute(insert(Reminder), [
+            {
+                "user_id": i % users + 1,
+                "text": f"dispatch {i}",
+                "remind_at": due_at,
+                "is_sent": False,
+            }
+            for i in range(reminders)
+        ])
+        rows = (await conn.execute(
+            select(
+                Reminder.id,
+                Reminder.user_id,
+                Reminder.text,
+                Reminder.remind_at,
+                User.tg_id
+            )
+            .join(User, Reminder.user_id == User.id)
+        )).all()
+    client = get_redis()
+    keys = list(client.scan_iter("schedule:*"))
+    if keys:
+        client.delete(*keys)
+    get_scheduler().schedule((row, row.tg_id) for row in rows)
+
+
+def start_nodes(count: int) -> List[subprocess.Popen]:
+    """Запускает процессы воркера, каждый - отдельный узел."""
+    return [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "dramatiq", "worker.tasks",
+                "--processes", "1", "--threads", "1",
+            ],
+            env=dict(os.environ),
+            # Своя группа процессов: SIGKILL получают и дочерние
+            # процессы воркера Dramatiq.
+            start_new_session=True
+        )
+        for _ in range(count)
+    ]
+
+
+def stop_nodes(nodes: List[subprocess.Popen]):
+    for node in nodes:
+        if node.poll() is None:
+            node.terminate()
+    for node in nodes:
+        node.wait()
+
+
+def clear_leases():
+    from bot.core.redis import DISPATCH_NODES_KEY, get_redis
+
+    client = get_redis()
+    keys = list(client.scan_iter("dispatch:shard:*"))
+    client.delete(DISPATCH_NODES_KEY, *keys)
+
+
+def lease_holders(shard_count: int) -> Counter:
+    """Число шардов у каждого узла (None - свободные)."""
+    from bot.core.redis import SHARD_LEASE_KEY, get_redis
+
+    return Counter(get_redis().mget([
+        SHARD_LEASE_KEY.format(shard=shard) for shard in range(shard_count)
+    ]))
+
+
+async def run_peak(
+    api: FakeTelegramAPI,
+    nodes: int,
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Доставляет пик напоминаний заданным числом узлов."""
+    clear_leases()
+    due_at = int(time.time() + args.warmup)
+    await seed(args.users, args.reminders, due_at)
+    while not api.deliveries.empty():
+        api.deliveries.get_nowait()
+
+    workers = start_nodes(nodes)
+    texts = Counter()
+    last = due_at
+    try:
+        deadline = due_at + args.timeout
+        while len(texts) < args.reminders and time.time() < deadline:
+            try:
+                entry = await asyncio.wait_for(api.deliveries.get(), 1)
+            except asyncio.TimeoutError:
+                continue
+            texts[entry["text"]] += 1
+            last = entry["received_wall"]
+        shares = sorted(
+            count for node, count in
+            lease_holders(int(os.environ["DISPATCH_SHARDS"])).items()
+            if node is not None
+        )
+    finally:
+        stop_nodes(workers)
+
+    elapsed = max(0.001, last - due_at)
+    return {
+        "nodes": nodes,
+        "delivered": len(texts),
+        "duplicates": sum(texts.values()) - len(texts),
+        "seconds": round(elapsed, 2),
+        "per_second": round(len(texts) / elapsed, 1),
+        "shards_per_node": shares,
+    }
+
+
+async def run_rolling(
+    api: FakeTelegramAPI,
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Перезапускает узлы по одному посреди пика (SIGTERM)."""
+    clear_leases()
+    due_at = int(time.time() + args.warmup)
+    await seed(args.users, args.reminders, due_at)
+    while not api.deliveries.empty():
+        api.deliveries.get_nowait()
+
+    workers = start_nodes(args.rolling_nodes)
+    texts = Counter()
+    last = due_at
+
+    async def collect(until: float):
+        nonlocal last
+        while len(texts) < args.reminders and time.time() < until:
+            try:
+                entry = await asyncio.wait_for(api.deliveries.get(), 0.2)
+            except asyncio.TimeoutError:
+                continue
+            texts[entry["text"]] += 1
+            last = entry["received_wall"]
+
+    restarts = []
+    try:
+        await collect(due_at + args.restart_after)
+        for index in range(len(workers)):
+            started = time.time()
+            workers[index].terminate()
+            while workers[index].poll() is None:
+                await collect(time.time() + 0.2)
+            restarts.append(round(time.time() - started, 2))
+            workers[index] = start_nodes(1)[0]
+        await collect(due_at + args.timeout)
+    finally:
+        stop_nodes(workers)
+
+    elapsed = max(0.001, last - due_at)
+    return {
+        "nodes": args.rolling_nodes,
+        "delivered": len(texts),
+        "lost": args.reminders - len(texts),
+        "duplicates": sum(texts.values()) - len(texts),
+        "seconds": round(elapsed, 2),
+        "per_second": round(len(texts) / elapsed, 1),
+        "shutdown_seconds": restarts,
+    }
+
+
+async def run_failover(args: argparse.Namespace) -> Dict[str, Any]:
+    """Убивает один из двух узлов и ждет, пока шарды перейдут."""
+    shard_count = int(os.environ["DISPATCH_SHARDS"])
+    clear_leases()
+    workers = start_nodes(2)
+    try:
+        started = time.monotonic()
+        while True:
+            holders = lease_holders(shard_count)
+            if None not in holders and len(holders) == 2:
+                break
+            if time.monotonic() - started > args.timeout:
+                return {"error": "узлы не разделили шарды"}
+            await asyncio.sleep(0.1)
+
+        os.killpg(workers[0].pid, signal.SIGKILL)
+        workers[0].wait()
+        killed = time.monotonic()
+        while True:
+            holders = lease_holders(shard_count)
+            if None not in holders and len(holders) == 1:
+                break
+            if time.monotonic() - killed > args.timeout:
+                return {"error": "шарды не перешли к оставшемуся узлу"}
+            await asyncio.sleep(0.1)
+        return {
+            "lease_seconds": float(os.environ["DISPATCH_LEASE_SECONDS"]),
+            "takeover_seconds": round(time.monotonic() - killed, 2),
+        }
+    finally:
+        stop_nodes(workers)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Готовит окружение, выполняет замеры и собирает отчет."""
+    api = FakeTelegramAPI(latency=args.latency)
+    api_url = await api.start(args.host, args.port)
+
+    # Настройки читаются при импорте модулей бота, поэтому окружение
+    # задается до импорта; процессы воркера получают его же.
+    os.environ.update({
+        "TELEGRAM_API_URL": api_url,
+        "SCHEDULER_BACKEND": args.backend,
+        "DISPATCH_SHARDS": str(args.shards),
+        "DISPATCH_LEASE_SECONDS": str(args.lease),
+        "DISPATCH_CONCURRENCY": str(args.concurrency),
+        "WORKER_HEALTH_PORT": "0",
+    })
+    os.environ.setdefault("BOT_TOKEN", "123456:DISPATCH")
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "dispatch.db"
+    ))
+
+    try:
+        peaks = []
+        for nodes in args.nodes:
+            peaks.append(await run_peak(api, nodes, args))
+            row = peaks[-1]
+            print(
+                f"{nodes:>6}{row['delivered']:>11}{row['duplicates']:>12}"
+                f"{row['seconds']:>10}{row['per_second']:>10}"
+                f"  {row['shards_per_node']}"
+            )
+        rolling = await run_rolling(api, args)
+        print(f"rolling restart: {rolling}")
+        failover = None
+        if args.backend != "dramatiq":
+            failover = await run_failover(args)
+            print(f"failover: {failover}")
+    finally:
+        await api.stop()
+
+    return {
+        "config": {
+            "backend": args.backend,
+            "users": args.users,
+            "reminders": args.reminders,
+            "shards": args.shards,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+        },
+        "peaks": peaks,
+        "rolling": rolling,
+        "failover": failover,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend",
+                        choices=("database", "redis", "dramatiq"),
+                        default="database")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--reminders", type=int, default=5000)
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--lease", type=float, default=3.0,
+                        help="срок аренды шарда, секунды")
+    parser.add_argument("--concurrency", type=int, default=10,
+                        help="одновременных отправок на узел")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="задержка ответа заглушки Bot API, секунды")
+    parser.add_argument("--warmup", type=float, default=5.0,
+                        help="реальные секунды на запуск узлов")
+    parser.add_argument("--rolling-nodes", type=int, default=2,
+                        help="узлов при выкатке")
+    parser.add_argument("--restart-after", type=float, default=3.0,
+                        help="секунды пика до первого перезапуска")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8092)
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    print(
+        f"{'nodes':>6}{'delivered':>11}{'duplicates':>12}"
+        f"{'seconds':>10}{'per sec':>10}  shards per node"
+    )
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
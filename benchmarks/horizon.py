@@ -0,0 +1,189 @@
+"""
+Бенчмарк горизонта планирования (SCHEDULE_HORIZON_SECONDS).
+
+Заполняет базу так же, как benchmarks/crud.py (напоминания в пределах
+±30 дней), и передает все будущие напоминания планировщику без
+горизонта и с горизонтом, замеряя число записей и память Redis.
+С горизонтом затем сдвигает виртуальные часы и замеряет продвижение:
+обычные периоды и догон после простоя воркеров. База Redis
+очищается, поэтому по умолчанию используется отдельная база 15.
+
+Пример:
+    python -m benchmarks.horizon --backend redis --reminders 200000 \\
+        --horizon 21600 --output horizon.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import summarize
+from benchmarks.scheduler import redis_state
+
+
+async def load_pending(now: int) -> List[Any]:
+    """Все будущие напоминания, как их передавал бы бот."""
+    from database.crud.reminders import get_upcoming_reminders
+    from worker.runtime import get_sessions
+
+    async with get_sessions()() as db:
+        return await get_upcoming_reminders(db, now, None, 2 ** 62, 2 ** 62)
+
+
+def schedule_all(scheduler, rows: List[Any], chunk: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    scheduled = 0
+    for start in range(0, len(rows), chunk):
+        scheduled += scheduler.schedule(
+            (row, row.tg_id) for row in rows[start:start + chunk]
+        )
+    return {
+        "seconds": round(time.perf_counter() - started, 3),
+        "scheduled": scheduled,
+    }
+
+
+def run_horizon(
+    horizon: float,
+    rows: List[Any],
+    now: int,
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Передает напоминания планировщику с горизонтом horizon."""
+    from bot.core.clock import clock
+    from bot.core.config import settings
+    from bot.core.redis import SCHEDULE_WATERMARK_KEY, get_redis
+    from worker.promoter import Promoter
+    from worker.runtime import run
+    from worker.scheduler import SCHEDULERS
+
+    client = get_redis()
+    client.flushdb()
+    settings.SCHEDULE_HORIZON_SECONDS = horizon
+    clock.configure(now)
+    scheduler = SCHEDULERS[args.backend]()
+    base = redis_state(client, args.backend, args.shards)
+    result: Dict[str, Any] = {"horizon": horizon}
+    result["schedule"] = schedule_all(scheduler, rows, args.chunk)
+    state = redis_state(client, args.backend, args.shards)
+    result["entries"] = state["entries"]
+    result["memory_kib"] = state["used_memory_kib"] - base["used_memory_kib"]
+    if not horizon:
+        return result
+
+    # Продвижение начинается с горизонта момента планирования.
+    client.set(SCHEDULE_WATERMARK_KEY, int(now + horizon))
+    promoter = Promoter(scheduler)
+    timings, promoted = [], []
+    offset = 0.0
+    for _ in range(args.periods):
+        offset += args.interval
+        clock.configure(now + offset)
+        started = time.perf_counter()
+        promoted.append(run(promoter.promote_once()))
+        timings.append(time.perf_counter() - started)
+    result["promote"] = {
+        "interval": args.interval,
+        "rows_per_period": round(sum(promoted) / len(promoted), 1),
+        **summarize(timings),
+    }
+
+    offset += args.outage
+    clock.configure(now + offset)
+    started = time.perf_counter()
+    caught_up = run(promoter.promote_once())
+    result["catch_up"] = {
+        "outage": args.outage,
+        "rows": caught_up,
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    state = redis_state(client, args.backend, args.shards)
+    result["entries_after_promote"] = state["entries"]
+    clock.reset()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=("dramatiq", "redis"),
+                        default="redis")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15",
+                        help="база Redis очищается")
+    parser.add_argument("--db", help="файл SQLite; по умолчанию временный")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--reminders", type=int, default=200_000)
+    parser.add_argument("--horizon", type=float, default=6 * 3600,
+                        help="горизонт, секунды")
+    parser.add_argument("--interval", type=float, default=60,
+                        help="период продвижения, секунды")
+    parser.add_argument("--periods", type=int, default=30)
+    parser.add_argument("--outage", type=float, default=3600,
+                        help="простой воркеров перед догоном, секунды")
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "horizon.db")
+    # Настройки читаются при импорте модулей бота, поэтому окружение
+    # задается до импорта.
+    os.environ.update({
+        "REDIS_URL": args.redis_url,
+        "DATABASE_URL": f"sqlite:///{path}",
+        "SCHEDULER_BACKEND": args.backend,
+        "DISPATCH_SHARDS": str(args.shards),
+    })
+    os.environ.setdefault("BOT_TOKEN", "123456:HORIZON")
+
+    from benchmarks.crud import seed, to_async_url
+    from worker.runtime import close, run
+
+    now = int(time.time())
+    engine = create_async_engine(to_async_url(os.environ["DATABASE_URL"]))
+    run(seed(engine, args.users, args.reminders, now))
+    run(engine.dispose())
+    rows = run(load_pending(now))
+    report = {
+        "config": {
+            "backend": args.backend,
+            "reminders": args.reminders,
+            "pending_future": len(rows),
+        },
+        "results": [
+            run_horizon(horizon, rows, now, args)
+            for horizon in (0, args.horizon)
+        ],
+    }
+    close()
+
+    print(f"pending future reminders: {len(rows)}")
+    for result in report["results"]:
+        print(
+            f"horizon {result['horizon']:>8.0f}s: "
+            f"{result['entries']} entries, {result['memory_kib']} KiB, "
+            f"scheduled in {result['schedule']['seconds']}s"
+        )
+        if "promote" in result:
+            promote = result["promote"]
+            print(
+                f"  promote every {promote['interval']:.0f}s: "
+                f"{promote['rows_per_period']} rows, "
+                f"p50 {promote['p50']} ms, p95 {promote['p95']} ms"
+            )
+            catch_up = result["catch_up"]
+            print(
+                f"  catch-up after {catch_up['outage']:.0f}s outage: "
+                f"{catch_up['rows']} rows in {catch_up['ms']} ms; "
+                f"{result['entries_after_promote']} entries"
+            )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Нагрузочный стенд: локальная заглушка Bot API и симуляция пользователей.
+
+Запускает FakeTelegramAPI, при необходимости поднимает бота и воркер
+Dramatiq с TELEGRAM_API_URL, указывающим на заглушку, и прогоняет
+сценарий /new -> /list -> отложить -> /delete для N пользователей.
+В конце печатает p50/p95/p99 по командам и задержку доставки напоминаний.
+
+Пример:
+    python -m benchmarks.loadtest --users 50 --iterations 2 --latency 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.common import summarize
+from benchmarks.loadtest.fake_api import FakeTelegramAPI
+
+
+USER_ID_BASE = 10_000_000
+SNOOZE_DELAY = 300
+
+
+class LoadSimulator:
+    """Сценарии виртуальных пользователей поверх FakeTelegramAPI."""
+
+    def __init__(
+        self,
+        api: FakeTelegramAPI,
+        reply_timeout: float,
+        delay_minutes: int
+    ):
+        self.api = api
+        self.reply_timeout = reply_timeout
+        self.delay_minutes = delay_minutes
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.expected_deliveries: Dict[str, float] = {}
+        self.delivery_lags: List[float] = []
+
+    async def _request(
+        self,
+        name: str,
+        chat_id: int,
+        push: Callable[[], float],
+        method: str = "sendMessage"
+    ) -> Optional[dict]:
+        """
+        Отправляет обновление и ждет ответ бота в том же чате.
+
+        Время ответа считается от постановки обновления в getUpdates
+        до получения заглушкой вызова `method` для этого чата.
+        """
+        queue = self.api.outbox[chat_id]
+        while not queue.empty():
+            queue.get_nowait()
+
+        started = push()
+        deadline = started + self.reply_timeout
+        while True:
+            try:
+                entry = await asyncio.wait_for(
+                    queue.get(),
+                    max(0.0, deadline - time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                self.errors[name] += 1
+                return None
+            if entry["method"] == method:
+                self.latencies[name].append(entry["received_at"] - started)
+                return entry
+
+    @staticmethod
+    def _find_reminder_id(
+        listing: Optional[dict],
+        marker: str
+    ) -> Optional[int]:
+        if not listing:
+            return None
+        match = re.search(
+            re.escape(marker) + r"\n(?:.*\n)*?ID: (\d+)",
+            listing["text"]
+        )
+        return int(match[1]) if match else None
+
+    async def user_session(self, index: int, iterations: int):
+        """
+        Сценарий одного пользователя.
+
+        На каждой итерации создаются два напоминания: одно доставляется
+        (по нему меряется задержка доставки), второе откладывается
+        кнопкой на 5 минут и удаляется.
+        """
+        api = self.api
+        chat_id = USER_ID_BASE + index
+        when = f"через {self.delay_minutes} минут"
+
+        for i in range(iterations):
+            keep = f"load-{chat_id}-{i}-keep"
+            temp = f"load-{chat_id}-{i}-temp"
+
+            for marker in (keep, temp):
+                await self._request(
+                    "/new", chat_id, lambda: api.push_message(chat_id, "/new")
+                )
+                created_at = time.time()
+                reply = await self._request(
+                    "create",
+                    chat_id,
+                    lambda: api.push_message(chat_id, f"{when} {marker}")
+                )
+                if reply and marker == keep:
+                    self.expected_deliveries[marker] = (
+                        created_at + self.delay_minutes * 60
+                    )
+
+            listing = await self._request(
+                "/list", chat_id, lambda: api.push_message(chat_id, "/list")
+            )
+            temp_id = self._find_reminder_id(listing, temp)
+            if temp_id is None:
+                self.errors["lookup"] += 1
+                continue
+
+            await self._request(
+                "snooze",
+                chat_id,
+                lambda: api.push_callback(
+                    chat_id, f"snooze:{temp_id}:{SNOOZE_DELAY}"
+                ),
+                method="answerCallbackQuery"
+            )
+
+            await self._request(
+                "/delete",
+                chat_id,
+                lambda: api.push_message(chat_id, "/delete")
+            )
+            await self._request(
+                "delete",
+                chat_id,
+                lambda: api.push_message(chat_id, str(temp_id))
+            )
+
+    async def collect_deliveries(self):
+        """Сопоставляет доставленные напоминания с ожидаемым временем."""
+        while True:
+            entry = await self.api.deliveries.get()
+            marker = entry["text"].split(": ", 1)[-1]
+            due = self.expected_deliveries.pop(marker, None)
+            if due is not None:
+                self.delivery_lags.append(entry["received_wall"] - due)
+
+    async def wait_for_deliveries(self, timeout: float):
+        """Ждет доставки всех созданных напоминаний или таймаута."""
+        deadline = time.monotonic() + timeout
+        while self.expected_deliveries and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+        self.errors["undelivered"] += len(self.expected_deliveries)
+
+
+def spawn_services(
+    api_url: str,
+    args: argparse.Namespace
+) -> List[subprocess.Popen]:
+    """
+    Запускает бота и воркер, направленные на заглушку Bot API.
+
+    Returns:
+        List[subprocess.Popen]: Запущенные процессы
+    """
+    env = dict(os.environ)
+    env["TELEGRAM_API_URL"] = api_url
+    env.setdefault("BOT_TOKEN", "123456:LOADTEST")
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    elif "DATABASE_URL" not in env:
+        db_path = os.path.join(tempfile.mkdtemp(), "loadtest.db")
+        env["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    return [
+        subprocess.Popen([sys.executable, "-m", "bot.main"], env=env),
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "dramatiq", "worker.tasks",
+                "--processes", str(args.worker_processes),
+            ],
+            env=env
+        ),
+    ]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Поднимает стенд, прогоняет сценарий и собирает отчет."""
+    api = FakeTelegramAPI(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_ratio=args.rate_limit,
+        retry_after=args.retry_after
+    )
+    api_url = await api.start(args.host, args.port)
+    processes = spawn_services(api_url, args) if args.spawn else []
+
+    try:
+        while not api.requests["getUpdates"]:
+            await asyncio.sleep(0.2)
+
+        simulator = LoadSimulator(api, args.reply_timeout, args.delay_minutes)
+        collector = asyncio.create_task(simulator.collect_deliveries())
+
+        started = time.monotonic()
+        await asyncio.gather(*(
+            simulator.user_session(i, args.iterations)
+            for i in range(args.users)
+        ))
+        commands_elapsed = time.monotonic() - started
+
+        await simulator.wait_for_deliveries(
+            args.delay_minutes * 60 + args.delivery_timeout
+        )
+        collector.cancel()
+    finally:
+        for process in processes:
+            process.terminate()
+        # Заглушка работает в этом же цикле событий и должна отвечать,
+        # пока бот и воркер плавно останавливаются.
+        for process in processes:
+            await asyncio.to_thread(process.wait)
+        await api.stop()
+
+    total_commands = sum(len(v) for v in simulator.latencies.values())
+    return {
+        "config": {
+            "users": args.users,
+            "iterations": args.iterations,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "rate_limit": args.rate_limit,
+        },
+        "commands": {
+            name: summarize(values)
+            for name, values in simulator.latencies.items()
+        },
+        "commands_per_second": round(total_commands / commands_elapsed, 2),
+        "delivery_lag": summarize(simulator.delivery_lags),
+        "errors": dict(simulator.errors),
+        "api_requests": dict(api.requests),
+        "api_rate_limited": dict(api.rate_limited),
+    }
+
+
+def print_report(report: dict):
+    """Печатает отчет в виде таблицы."""
+    print(f"{'step':<14}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    rows = dict(report["commands"], delivery_lag=report["delivery_lag"])
+    for name, stats in rows.items():
+        print(
+            f"{name:<14}{stats['count']:>8}{stats['p50']:>10}"
+            f"{stats['p95']:>10}{stats['p99']:>10}"
+        )
+    print(f"commands/s: {report['commands_per_second']}")
+    print(f"errors: {report['errors']}")
+    print(f"429 injected: {report['api_rate_limited']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=1)
+    parser.add_argument("--delay-minutes", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="доля запросов, получающих 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--reply-timeout", type=float, default=10.0)
+    parser.add_argument("--delivery-timeout", type=float, default=60.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--database-url")
+    parser.add_argument("--worker-processes", type=int, default=1)
+    parser.add_argument("--no-spawn", dest="spawn", action="store_false",
+                        help="не запускать бота и воркер (уже запущены)")
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
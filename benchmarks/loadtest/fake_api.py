@@ -0,0 +1,239 @@
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+
+class FakeTelegramAPI:
+    """
+    Локальная заглушка Telegram Bot API для нагрузочных тестов.
+
+    Отдает боту входящие обновления через getUpdates, принимает
+    sendMessage/answerCallbackQuery и остальные методы, умеет добавлять
+    задержку ответа и имитировать ошибку 429 с заданной вероятностью.
+
+    Все исходящие сообщения бота складываются в очереди по chat_id,
+    чтобы симулятор мог измерить время ответа.
+    """
+
+    DEFAULT_RESULTS = {
+        "getMe": {
+            "id": 1,
+            "is_bot": True,
+            "first_name": "LoadTest",
+            "username": "load_test_bot",
+        },
+    }
+    MESSAGE_METHODS = {
+        "sendMessage",
+        "sendDocument",
+        "editMessageText",
+        "editMessageReplyMarkup",
+    }
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_ratio: float = 0.0,
+        retry_after: int = 1
+    ):
+        """
+        Args:
+            latency: Базовая задержка ответа на запрос бота (секунды)
+            jitter: Случайная добавка к задержке (секунды)
+            rate_limit_ratio: Доля запросов бота, на которые отдается 429
+            retry_after: Значение retry_after в ответах 429
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+
+        self.requests: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.outbox: Dict[int, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self.deliveries: asyncio.Queue = asyncio.Queue()
+
+        self._updates: List[Dict[str, Any]] = []
+        self._callback_chats: Dict[str, int] = {}
+        self._update_id = 0
+        self._message_id = 0
+        self._new_updates = asyncio.Event()
+        self._runner: Optional[web.AppRunner] = None
+
+    def _next_message_id(self) -> int:
+        self._message_id += 1
+        return self._message_id
+
+    def _push_update(self, payload: Dict[str, Any]) -> float:
+        self._update_id += 1
+        self._updates.append({"update_id": self._update_id, **payload})
+        self._new_updates.set()
+        return time.monotonic()
+
+    @staticmethod
+    def _user(chat_id: int) -> Dict[str, Any]:
+        return {"id": chat_id, "is_bot": False, "first_name": f"user{chat_id}"}
+
+    @staticmethod
+    def _chat(chat_id: int) -> Dict[str, Any]:
+        return {"id": chat_id, "type": "private"}
+
+    def push_message(self, chat_id: int, text: str) -> float:
+        """
+        Добавляет входящее текстовое сообщение пользователя.
+
+        Args:
+            chat_id: ID пользователя (совпадает с ID чата)
+            text: Текст сообщения
+
+        Returns:
+            float: Момент постановки обновления (time.monotonic)
+        """
+        message = {
+            "message_id": self._next_message_id(),
+            "date": int(time.time()),
+            "chat": self._chat(chat_id),
+            "from": self._user(chat_id),
+            "text": text,
+        }
+        if text.startswith("/"):
+            command_length = len(text.split()[0])
+            message["entities"] = [
+                {"type": "bot_command", "offset": 0, "length": command_length}
+            ]
+        return self._push_update({"message": message})
+
+    def push_callback(self, chat_id: int, data: str) -> float:
+        """
+        Добавляет нажатие инлайн-кнопки.
+
+        Args:
+            chat_id: ID пользователя
+            data: callback_data кнопки
+
+        Returns:
+            float: Момент постановки обновления (time.monotonic)
+        """
+        callback_id = f"cq{self._update_id + 1}"
+        self._callback_chats[callback_id] = chat_id
+        callback = {
+            "id": callback_id,
+            "from": self._user(chat_id),
+            "chat_instance": str(chat_id),
+            "data": data,
+            "message": {
+                "message_id": self._next_message_id(),
+                "date": int(time.time()),
+                "chat": self._chat(chat_id),
+                "text": "🔔",
+            },
+        }
+        return self._push_update({"callback_query": callback})
+
+    async def _get_updates(
+        self,
+        params: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        timeout = min(float(params.get("timeout") or 0), 1.0)
+
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return list(self._updates[:100])
+
+    def _record_outgoing(self, method: str, params: Dict[str, str]):
+        if "callback_query_id" in params:
+            chat_id = self._callback_chats.pop(params["callback_query_id"], 0)
+        else:
+            chat_id = int(params.get("chat_id") or 0)
+        text = params.get("text", "")
+        reply_markup = (
+            json.loads(params["reply_markup"])
+            if params.get("reply_markup") else None
+        )
+        entry = {
+            "method": method,
+            "chat_id": chat_id,
+            "text": text,
+            "reply_markup": reply_markup,
+            "received_at": time.monotonic(),
+            "received_wall": time.time(),
+        }
+        if method == "sendMessage" and text.startswith("🔔"):
+            self.deliveries.put_nowait(entry)
+        else:
+            self.outbox[chat_id].put_nowait(entry)
+        return entry
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Обрабатывает вызов метода Bot API."""
+        method = request.match_info["method"]
+        params = {k: str(v) for k, v in (await request.post()).items()}
+        self.requests[method] += 1
+
+        if method == "getUpdates":
+            return web.json_response(
+                {"ok": True, "result": await self._get_updates(params)}
+            )
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.rate_limit_ratio and random.random() < self.rate_limit_ratio:
+            self.rate_limited[method] += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": (
+                        f"Too Many Requests: retry after {self.retry_after}"
+                    ),
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429
+            )
+
+        if method in self.DEFAULT_RESULTS:
+            result = self.DEFAULT_RESULTS[method]
+        elif method in self.MESSAGE_METHODS or method == "answerCallbackQuery":
+            entry = self._record_outgoing(method, params)
+            result = True if method == "answerCallbackQuery" else {
+                "message_id": self._next_message_id(),
+                "date": int(time.time()),
+                "chat": self._chat(entry["chat_id"]),
+                "text": entry["text"],
+            }
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8090) -> str:
+        """
+        Запускает HTTP-сервер заглушки.
+
+        Returns:
+            str: Базовый URL для TELEGRAM_API_URL
+        """
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        """Останавливает HTTP-сервер заглушки."""
+        if self._runner:
+            await self._runner.cleanup()
@@ -0,0 +1,213 @@
+"""
+Бенчмарк запросов горячего пути: ORM против database/queries.py.
+
+Заполняет базу так же, как benchmarks/crud.py, и для каждого запроса
+горячего пути (пользователь по tg_id, активные напоминания
+пользователя, напоминание по ID, захват напоминания) сравнивает
+прежний вариант - запрос ORM, который строится и готовится на каждый
+вызов, - с заранее собранным запросом Core из database/queries.py.
+Все вызовы идут в одной сессии, поэтому разница - это накладные
+расходы на вызов, а не работа базы. Захват выполняется с откатом,
+чтобы каждый вызов обновлял строку.
+
+Пример:
+    python -m benchmarks.queries --users 20000 --reminders 200000 \\
+        --calls 5000 --output queries_report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
+
+from benchmarks.common import summarize
+from benchmarks.crud import seed, to_async_url
+from database import queries
+from database.models import Reminder, User
+
+
+Case = Callable[[AsyncSession, int], Awaitable[Any]]
+
+
+async def orm_get_user(db: AsyncSession, tg_id: int):
+    result = await db.execute(select(User).filter_by(tg_id=tg_id))
+    return result.scalar_one_or_none()
+
+
+async def orm_get_reminder(db: AsyncSession, reminder_id: int):
+    result = await db.execute(select(Reminder).filter_by(id=reminder_id))
+    return result.scalar_one_or_none()
+
+
+async def orm_pending_reminders(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(
+            Reminder.id,
+            Reminder.text,
+            Reminder.remind_at,
+            Reminder.recurrence
+        )
+        .filter(Reminder.user_id == user_id, Reminder.is_sent == False)
+        .order_by(Reminder.remind_at)
+    )
+    return result.all()
+
+
+async def orm_claim(db: AsyncSession, reminder_id: int):
+    now = int(time.time())
+    result = await db.execute(
+        update(Reminder)
+        .filter(
+            Reminder.id.in_([reminder_id]),
+            Reminder.is_sent == False,
+            or_(
+                Reminder.claimed_until.is_(None),
+                Reminder.claimed_until <= now
+            )
+        )
+        .values(claimed_until=now + 120)
+        .returning(Reminder.id)
+    )
+    claimed = result.scalars().all()
+    await db.rollback()
+    return claimed
+
+
+async def core_claim(db: AsyncSession, reminder_id: int):
+    now = int(time.time())
+    claimed = await queries.claim_reminders(
+        db, [reminder_id], now, now + 120
+    )
+    await db.rollback()
+    return claimed
+
+
+async def sample_ids(
+    sessions: async_sessionmaker,
+    count: int
+) -> Dict[str, List[int]]:
+    """Случайные аргументы: tg_id, ID пользователей и напоминаний."""
+    async with sessions() as db:
+        tg_ids = (await db.scalars(
+            select(User.tg_id).order_by(func.random()).limit(count)
+        )).all()
+        user_ids = (await db.scalars(
+            select(User.id).order_by(func.random()).limit(count)
+        )).all()
+        reminder_ids = (await db.scalars(
+            select(Reminder.id)
+            .filter(Reminder.is_sent == False)
+            .order_by(func.random())
+            .limit(count)
+        )).all()
+    return {"tg_id": tg_ids, "user_id": user_ids, "reminder_id": reminder_ids}
+
+
+async def measure(
+    sessions: async_sessionmaker,
+    case: Case,
+    args: List[int],
+    calls: int
+) -> Dict[str, float]:
+    """Время вызовов в одной сессии после прогрева."""
+    async with sessions() as db:
+        for arg in args[:100]:
+            await case(db, arg)
+        timings = []
+        for number in range(calls):
+            arg = args[number % len(args)]
+            started = time.perf_counter()
+            await case(db, arg)
+            timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Заполняет базу, выполняет замеры и собирает отчет."""
+    url = args.database_url or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "queries_bench.db"
+    )
+    engine = create_async_engine(to_async_url(url), echo=False)
+    if not args.reuse:
+        await seed(engine, args.users, args.reminders, int(time.time()))
+    sessions = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    ids = await sample_ids(sessions, 1000)
+    rng = random.Random(7)
+
+    pairs: Dict[str, Dict[str, Any]] = {
+        "get_user": {
+            "arg": "tg_id",
+            "orm": orm_get_user,
+            "core": queries.get_user,
+        },
+        "pending_reminders": {
+            "arg": "user_id",
+            "orm": orm_pending_reminders,
+            "core": queries.get_pending_reminders,
+        },
+        "get_reminder": {
+            "arg": "reminder_id",
+            "orm": orm_get_reminder,
+            "core": queries.get_reminder,
+        },
+        "claim_reminder": {
+            "arg": "reminder_id",
+            "orm": orm_claim,
+            "core": core_claim,
+        },
+    }
+
+    results = {}
+    for name, pair in pairs.items():
+        results[name] = {}
+        # Порядок чередуется, чтобы кэш страниц не давал преимущества
+        # одному из вариантов.
+        for kind in rng.sample(["orm", "core"], 2):
+            results[name][kind] = await measure(
+                sessions, pair[kind], ids[pair["arg"]], args.calls
+            )
+        orm, core = results[name]["orm"], results[name]["core"]
+        results[name]["speedup"] = round(orm["mean"] / core["mean"], 2)
+        print(
+            f"{name:<20}{orm['mean'] * 1000:>11.1f}"
+            f"{core['mean'] * 1000:>11.1f}{results[name]['speedup']:>9}"
+        )
+
+    await engine.dispose()
+    return {"database": engine.dialect.name, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url",
+                        help="по умолчанию - временный файл SQLite")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--reminders", type=int, default=200_000)
+    parser.add_argument("--calls", type=int, default=5000,
+                        help="число вызовов каждого варианта")
+    parser.add_argument("--reuse", action="store_true",
+                        help="не заполнять базу заново")
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    print(f"{'query':<20}{'orm us':>11}{'core us':>11}{'speedup':>9}")
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
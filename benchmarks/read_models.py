@@ -0,0 +1,181 @@
+"""
+Бенчмарк строк только для чтения против объектов ORM в списках.
+
+Заполняет базу так же, как benchmarks/crud.py, и для каждой пары
+«функция с объектами ORM - функция с database/views» замеряет время
+и память: пик выделений за вызов и размер, который результат занимает,
+пока его держит обработчик (tracemalloc).
+
+Пример:
+    python -m benchmarks.read_models --users 20000 --reminders 200000 \\
+        --output read_models_report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
+
+from benchmarks.common import summarize
+from benchmarks.crud import seed, to_async_url
+from database.crud import reminders as reminder_crud
+from database.crud import users as user_crud
+from database.models import Reminder
+
+
+Case = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def busiest_user(sessions: async_sessionmaker) -> int:
+    """ID пользователя с наибольшим числом активных напоминаний."""
+    async with sessions() as db:
+        return await db.scalar(
+            select(Reminder.user_id)
+            .filter(Reminder.is_sent == False)
+            .group_by(Reminder.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+
+
+async def measure_time(
+    sessions: async_sessionmaker,
+    case: Case,
+    runs: int
+) -> Dict[str, float]:
+    """Время вызова вместе с открытием сессии, как в сервисах."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        async with sessions() as db:
+            await case(db)
+        timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+async def measure_memory(
+    sessions: async_sessionmaker,
+    case: Case
+) -> Dict[str, Any]:
+    """
+    Память одного вызова: пик выделений и размер результата
+    после закрытия сессии.
+    """
+    async with sessions() as db:
+        await case(db)
+    tracemalloc.start()
+    try:
+        async with sessions() as db:
+            rows = await case(db)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows": len(rows),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Заполняет базу, выполняет замеры и собирает отчет."""
+    url = args.database_url or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "read_models_bench.db"
+    )
+    engine = create_async_engine(to_async_url(url), echo=False)
+    if not args.reuse:
+        await seed(engine, args.users, args.reminders, int(time.time()))
+    sessions = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    user_id = await busiest_user(sessions)
+    rng = random.Random(7)
+
+    pairs: Dict[str, Dict[str, Case]] = {
+        "user_list": {
+            "orm": lambda db: reminder_crud.get_pending_reminders(
+                db, user_id
+            ),
+            "view": lambda db: reminder_crud.list_pending_reminders(
+                db, user_id
+            ),
+        },
+        "admin_reminders": {
+            "orm": reminder_crud.get_all_reminders,
+            "view": reminder_crud.list_all_reminders,
+        },
+        "admin_users": {
+            "orm": user_crud.get_all_users,
+            "view": user_crud.list_users,
+        },
+    }
+
+    results = {}
+    for name, pair in pairs.items():
+        runs = args.runs if name == "user_list" else args.scan_runs
+        results[name] = {}
+        # Порядок чередуется, чтобы кэш страниц не давал преимущества
+        # одной из функций.
+        for kind in rng.sample(list(pair), len(pair)):
+            results[name][kind] = {
+                **await measure_memory(sessions, pair[kind]),
+                **await measure_time(sessions, pair[kind], runs),
+            }
+        orm, view = results[name]["orm"], results[name]["view"]
+        results[name]["speedup"] = round(orm["p50"] / view["p50"], 2)
+        results[name]["memory_ratio"] = round(
+            view["retained_kib"] / orm["retained_kib"], 3
+        )
+        for kind in ("orm", "view"):
+            row = results[name][kind]
+            print(
+                f"{name + '.' + kind:<24}{row['rows']:>9}{row['p50']:>11}"
+                f"{row['peak_kib']:>13}{row['retained_kib']:>13}"
+            )
+
+    await engine.dispose()
+    return {
+        "database": engine.dialect.name,
+        "busiest_user_id": user_id,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url",
+                        help="по умолчанию - временный файл SQLite")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--reminders", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=200,
+                        help="число запусков для списка пользователя")
+    parser.add_argument("--scan-runs", type=int, default=5,
+                        help="число запусков для админских списков")
+    parser.add_argument("--reuse", action="store_true",
+                        help="не заполнять базу заново")
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    print(
+        f"{'case':<24}{'rows':>9}{'p50 ms':>11}"
+        f"{'peak KiB':>13}{'kept KiB':>13}"
+    )
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
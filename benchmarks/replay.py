@@ -0,0 +1,432 @@
+"""
+Воспроизведение суток нагрузки с ускоренными часами.
+
+Прогоняет трассу событий create/snooze/delete (записанную или
+синтетическую с пиком около 09:00) через настоящие сервисы бота,
+воркер Dramatiq и заглушку Bot API. Бот и воркер работают по общим
+виртуальным часам (CLOCK_START, CLOCK_SPEED, CLOCK_ANCHOR), поэтому
+сутки при ускорении 100 проходят за 15 минут. В конце печатает
+точность доставки (опоздание относительно времени напоминания
+в виртуальных секундах) и пропускную способность.
+
+Формат трассы - JSON Lines, поле at - секунды от начала трассы:
+    {"at": 30, "op": "create", "user": 1, "ref": "a", "phrase": "в 09:00 x"}
+    {"at": 32500, "op": "snooze", "user": 1, "ref": "a", "delay": 300}
+    {"at": 100, "op": "delete", "user": 1, "ref": "a"}
+
+Нужен запущенный Redis (REDIS_URL) без чужих сообщений в очереди.
+
+Пример:
+    python -m benchmarks.replay --users 500 --speed 100 --output replay.json
+    python -m benchmarks.replay --trace day.jsonl --start-hour 7 --hours 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from zoneinfo import ZoneInfo
+
+from benchmarks.common import summarize
+from benchmarks.loadtest.fake_api import FakeTelegramAPI
+
+
+USER_ID_BASE = 20_000_000
+SNOOZE_DELAYS = (300, 3600)
+MARKER_PREFIX = "replay"
+
+
+def generate_trace(
+    users: int,
+    seed: int,
+    hours: float
+) -> List[Dict[str, Any]]:
+    """
+    Составляет синтетическую трассу суток.
+
+    Половина напоминаний создается утром (нормальное распределение
+    около 08:30), половина - равномерно в течение суток. Около трети -
+    «в 09:00», остальные - «в ЧЧ:ММ» или «через N минут». Примерно
+    15% доставленных откладываются, 10% удаляются до срабатывания.
+
+    Args:
+        users: Число пользователей
+        seed: Зерно генератора
+        hours: Длина трассы в часах
+
+    Returns:
+        List[Dict[str, Any]]: События, отсортированные по времени
+    """
+    rng = random.Random(seed)
+    end = hours * 3600
+    events = []
+    for user in range(users):
+        for n in range(rng.randint(1, 8)):
+            if rng.random() < 0.5:
+                created = rng.gauss(8.5 * 3600, 45 * 60)
+            else:
+                created = rng.uniform(0, end)
+            created = min(max(0.0, created), end - 120)
+
+            kind = rng.random()
+            if kind < 0.35 and created < 9 * 3600 - 60:
+                due, when = 9 * 3600, "в 09:00"
+            elif kind < 0.6:
+                due = (created // 300 + rng.randint(1, 36)) * 300
+                hour, minute = divmod(int(due) // 60, 60)
+                when = f"в {hour:02d}:{minute:02d}"
+            else:
+                minutes = rng.randint(1, 240)
+                due, when = created + minutes * 60, f"через {minutes} минут"
+            if due >= end:
+                continue
+
+            ref = f"u{user}-{n}"
+            events.append({
+                "at": round(created, 3),
+                "op": "create",
+                "user": user,
+                "ref": ref,
+                "phrase": f"{when} {MARKER_PREFIX} {ref}",
+            })
+            action = rng.random()
+            if action < 0.1:
+                events.append({
+                    "at": round(rng.uniform(created + 1, due - 1), 3),
+                    "op": "delete",
+                    "user": user,
+                    "ref": ref,
+                })
+            elif action < 0.25 and due + 120 < end:
+                events.append({
+                    "at": round(due + rng.uniform(10, 120), 3),
+                    "op": "snooze",
+                    "user": user,
+                    "ref": ref,
+                    "delay": rng.choice(SNOOZE_DELAYS),
+                })
+    events.sort(key=lambda event: event["at"])
+    return events
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """Читает трассу JSON Lines и сортирует события по времени."""
+    with open(path, encoding="utf-8") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    events.sort(key=lambda event: event["at"])
+    return events
+
+
+class Replayer:
+    """Проигрывает события трассы через сервисы бота."""
+
+    def __init__(
+        self,
+        api: FakeTelegramAPI,
+        start: float,
+        anchor: float,
+        speed: float,
+        concurrency: int
+    ):
+        self.api = api
+        self.start = start
+        self.anchor = anchor
+        self.speed = speed
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.reminder_ids: Dict[str, int] = {}
+        self.expected: Dict[str, float] = {}
+        self.op_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.dispatch_lateness: List[float] = []
+        self.delivery_lags: List[float] = []
+        self.errors: Counter = Counter()
+        self.delivered = 0
+
+    def virtual(self, wall: float) -> float:
+        """Переводит реальное время в виртуальное."""
+        return self.start + (wall - self.anchor) * self.speed
+
+    async def create(self, event: Dict[str, Any]):
+        # Повторяет process_reminder_text без Telegram.
+        from bot.core.utils.parsers import (
+            parse_recurring_reminder,
+            parse_reminder_time
+        )
+        from bot.core.utils.timezone import get_timezone, to_timestamp
+        from bot.services.reminders import ReminderService
+        from bot.services.users import UserService
+
+        tg_id = USER_ID_BASE + event["user"]
+        user = await UserService.ensure_user_exists(tg_id)
+        tz = get_timezone(user.timezone)
+        phrase = event["phrase"]
+        remind_at, text, recurrence = parse_recurring_reminder(phrase, tz)
+        if not remind_at:
+            remind_at, text = parse_reminder_time(phrase, tz)
+        if not remind_at or not text:
+            self.errors["parse"] += 1
+            return
+        reminder = await ReminderService.create_reminder(
+            user.id, text, to_timestamp(remind_at), recurrence
+        )
+        ReminderService.schedule_reminder(reminder, tg_id)
+        self.reminder_ids[event["ref"]] = reminder.id
+        self.expected[text] = reminder.remind_at
+
+    async def snooze(self, event: Dict[str, Any]):
+        from bot.services.reminders import ReminderService
+
+        reminder_id = self.reminder_ids.get(event["ref"])
+        tg_id = USER_ID_BASE + event["user"]
+        reminder = reminder_id and await ReminderService.snooze_reminder(
+            reminder_id, tg_id, event["delay"]
+        )
+        if not reminder:
+            self.errors["snooze_missing"] += 1
+            return
+        ReminderService.schedule_reminder(reminder, tg_id)
+        self.expected[reminder.text] = reminder.remind_at
+
+    async def delete(self, event: Dict[str, Any]):
+        from bot.services.reminders import ReminderService
+
+        reminder_id = self.reminder_ids.pop(event["ref"], None)
+        if not reminder_id or not await ReminderService.delete_reminder(
+            reminder_id
+        ):
+            self.errors["delete_missing"] += 1
+            return
+        self.expected.pop(f"{MARKER_PREFIX} {event['ref']}", None)
+
+    async def handle(self, event: Dict[str, Any]):
+        async with self.semaphore:
+            started = time.perf_counter()
+            try:
+                await getattr(self, event["op"])(event)
+            except Exception as e:
+                self.errors[f"{event['op']}: {type(e).__name__}"] += 1
+                return
+            self.op_latencies[event["op"]].append(
+                time.perf_counter() - started
+            )
+
+    async def dispatch(self, events: List[Dict[str, Any]]):
+        """Отправляет события в моменты трассы по виртуальным часам."""
+        from bot.core.clock import clock
+
+        tasks = []
+        for event in events:
+            target = self.start + event["at"]
+            await asyncio.sleep(clock.delay(target))
+            self.dispatch_lateness.append(
+                (clock.time() - target) / self.speed
+            )
+            tasks.append(asyncio.create_task(self.handle(event)))
+        await asyncio.gather(*tasks)
+
+    async def collect_deliveries(self):
+        """Сопоставляет доставки с ожидаемым временем напоминаний."""
+        while True:
+            entry = await self.api.deliveries.get()
+            self.delivered += 1
+            text = entry["text"].split(": ", 1)[-1]
+            due = self.expected.pop(text, None)
+            if due is None:
+                self.errors["unexpected_delivery"] += 1
+                continue
+            delivered_at = self.virtual(entry["received_wall"])
+            self.delivery_lags.append(delivered_at - due)
+
+    async def wait_for_deliveries(self, until: float, timeout: float):
+        """
+        Ждет доставки напоминаний со временем до `until` (виртуальное)
+        не дольше `timeout` реальных секунд.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(
+            due <= until for due in self.expected.values()
+        ):
+            await asyncio.sleep(0.5)
+        self.errors["undelivered"] += sum(
+            1 for due in self.expected.values() if due <= until
+        )
+
+
+def trace_start(start_hour: float, timezone: str) -> float:
+    """Полночь текущих суток в зоне timezone плюс start_hour часов."""
+    midnight = datetime.now(ZoneInfo(timezone)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (midnight + timedelta(hours=start_hour)).timestamp()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Готовит окружение, проигрывает трассу и собирает отчет."""
+    events = (
+        load_trace(args.trace) if args.trace
+        else generate_trace(args.users, args.seed, 24)
+    )
+    # Из окна берутся события, напоминания которых созданы в этом же
+    # окне: отложить или удалить несозданное напоминание нельзя.
+    window = (args.start_hour * 3600, (args.start_hour + args.hours) * 3600)
+    created = set()
+    selected = []
+    for event in events:
+        if not window[0] <= event["at"] < window[1]:
+            continue
+        if event["op"] == "create":
+            created.add(event["ref"])
+        elif event["ref"] not in created:
+            continue
+        selected.append(dict(event, at=event["at"] - window[0]))
+    events = selected
+    if args.save_trace:
+        with open(args.save_trace, "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    api = FakeTelegramAPI(latency=args.latency)
+    api_url = await api.start(args.host, args.port)
+
+    # Настройки читаются при импорте модулей бота, поэтому окружение
+    # (база, заглушка Bot API, часы) задается до импорта сервисов.
+    start = trace_start(
+        args.start_hour,
+        os.environ.get("DEFAULT_TIMEZONE", "Asia/Yekaterinburg")
+    )
+    anchor = time.time() + args.warmup
+    os.environ.update({
+        "TELEGRAM_API_URL": api_url,
+        "CLOCK_START": str(start),
+        "CLOCK_SPEED": str(args.speed),
+        "CLOCK_ANCHOR": str(anchor),
+        "WORKER_HEALTH_PORT": "0",
+        # Отложенные сообщения воркер проверяет раз в worker_timeout
+        # (по умолчанию 1 с); при ускорении период уменьшается так же.
+        "dramatiq_worker_timeout": str(
+            args.worker_timeout or max(10, int(1000 / args.speed))
+        ),
+    })
+    os.environ.setdefault("BOT_TOKEN", "123456:REPLAY")
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(), "replay.db"
+    ))
+
+    import database.models  # noqa: F401 - таблицы для init_db
+    from database.session import init_db
+
+    await init_db()
+    worker = subprocess.Popen(
+        [
+            sys.executable, "-m", "dramatiq", "worker.tasks",
+            "--processes", str(args.worker_processes),
+        ],
+        env=dict(os.environ)
+    )
+
+    replayer = Replayer(api, start, anchor, args.speed, args.concurrency)
+    collector = asyncio.create_task(replayer.collect_deliveries())
+    try:
+        await asyncio.sleep(max(0.0, anchor - time.time()))
+        started = time.monotonic()
+        await replayer.dispatch(events)
+        dispatch_elapsed = time.monotonic() - started
+        await replayer.wait_for_deliveries(
+            start + args.hours * 3600, args.delivery_timeout
+        )
+        elapsed = time.monotonic() - started
+    finally:
+        collector.cancel()
+        worker.terminate()
+        worker.wait()
+        await api.stop()
+
+    lags = replayer.delivery_lags
+    return {
+        "config": {
+            "events": len(events),
+            "speed": args.speed,
+            "start_hour": args.start_hour,
+            "hours": args.hours,
+            "worker_processes": args.worker_processes,
+            "worker_timeout_ms": int(os.environ["dramatiq_worker_timeout"]),
+        },
+        "operations": {
+            op: summarize(values)
+            for op, values in replayer.op_latencies.items()
+        },
+        "dispatch_lateness": summarize(replayer.dispatch_lateness),
+        # Опоздание доставки в виртуальном времени: при ускорении 100
+        # 1 с реальной задержки очереди дает 100 с опоздания.
+        "delivery_lag_virtual": summarize(lags),
+        "delivery_lag_real": summarize([lag / args.speed for lag in lags]),
+        "early_deliveries": sum(1 for lag in lags if lag < -1),
+        "events_per_second": round(len(events) / dispatch_elapsed, 2),
+        "deliveries_per_second": round(replayer.delivered / elapsed, 2),
+        "real_seconds": round(elapsed, 1),
+        "errors": dict(replayer.errors),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """Печатает отчет в виде таблицы (мс)."""
+    print(f"{'step':<22}{'count':>8}{'p50':>12}{'p95':>12}{'p99':>12}")
+    rows = dict(
+        report["operations"],
+        dispatch_lateness=report["dispatch_lateness"],
+        delivery_lag_virtual=report["delivery_lag_virtual"],
+        delivery_lag_real=report["delivery_lag_real"],
+    )
+    for name, stats in rows.items():
+        print(
+            f"{name:<22}{stats['count']:>8}{stats['p50']:>12}"
+            f"{stats['p95']:>12}{stats['p99']:>12}"
+        )
+    print(
+        f"events/s: {report['events_per_second']}  "
+        f"deliveries/s: {report['deliveries_per_second']}  "
+        f"real seconds: {report['real_seconds']}"
+    )
+    print(f"early deliveries: {report['early_deliveries']}")
+    print(f"errors: {report['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trace", help="файл трассы JSON Lines")
+    parser.add_argument("--users", type=int, default=500,
+                        help="пользователей в синтетической трассе")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-trace", help="сохранить проигранную трассу")
+    parser.add_argument("--start-hour", type=float, default=0.0)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--speed", type=float, default=100.0)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=float, default=5.0,
+                        help="реальные секунды на запуск воркера")
+    parser.add_argument("--worker-timeout", type=int,
+                        help="dramatiq_worker_timeout воркера, мс "
+                             "(по умолчанию 1000 / speed)")
+    parser.add_argument("--delivery-timeout", type=float, default=60.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8091)
+    parser.add_argument("--worker-processes", type=int, default=1)
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
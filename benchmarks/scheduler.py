@@ -0,0 +1,199 @@
+"""
+Бенчмарк планировщиков напоминаний в Redis: Dramatiq и индекс таймеров.
+
+Для каждого планировщика планирует N напоминаний, переносит каждое
+K раз (как «отложить»), отменяет половину и замеряет скорость
+операций, число записей и память Redis после каждого шага.
+Для индекса таймеров дополнительно замеряет выбор наступивших
+напоминаний скриптом захвата. База Redis очищается, поэтому
+по умолчанию используется отдельная база 15.
+
+Пример:
+    python -m benchmarks.scheduler --reminders 100000 --snoozes 3 \\
+        --output scheduler.json
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, NamedTuple
+
+
+class Item(NamedTuple):
+    """Напоминание с полями, которые нужны планировщику."""
+    id: int
+    user_id: int
+    text: str
+    remind_at: int
+
+
+def redis_state(client, backend: str, shards: int) -> Dict[str, int]:
+    """Число запланированных записей и память Redis."""
+    if backend == "dramatiq":
+        entries = client.hlen("dramatiq:default.DQ.msgs")
+    else:
+        from bot.core.redis import SCHEDULE_DUE_KEY
+
+        pipe = client.pipeline(transaction=False)
+        for shard in range(shards):
+            pipe.zcard(SCHEDULE_DUE_KEY.format(shard=shard))
+        entries = sum(pipe.execute())
+    return {
+        "entries": entries,
+        "used_memory_kib": client.info("memory")["used_memory"] // 1024,
+    }
+
+
+def timed(step, count: int) -> Dict[str, float]:
+    started = time.perf_counter()
+    step()
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": round(elapsed, 3),
+        "per_second": round(count / elapsed) if elapsed else 0,
+    }
+
+
+def run_backend(
+    backend: str,
+    items: List[Item],
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """Планирует, переносит и отменяет напоминания одним планировщиком."""
+    from bot.core.redis import get_redis
+    from worker.scheduler import SCHEDULERS
+
+    client = get_redis()
+    client.flushdb()
+    scheduler = SCHEDULERS[backend]()
+    chunk = args.chunk
+    result: Dict[str, Any] = {"baseline": redis_state(
+        client, backend, args.shards
+    )}
+
+    def schedule(batch: List[Item]):
+        for start in range(0, len(batch), chunk):
+            scheduler.schedule(
+                (item, item.user_id) for item in batch[start:start + chunk]
+            )
+
+    result["schedule"] = timed(lambda: schedule(items), len(items))
+    result["after_schedule"] = redis_state(client, backend, args.shards)
+
+    snoozed = [
+        item._replace(remind_at=item.remind_at + 600 * (round_ + 1))
+        for round_ in range(args.snoozes) for item in items
+    ]
+    result["reschedule"] = timed(lambda: schedule(snoozed), len(snoozed))
+    result["after_reschedule"] = redis_state(client, backend, args.shards)
+
+    cancelled = items[::2]
+    result["cancel"] = timed(
+        lambda: [
+            scheduler.cancel(item.id, item.user_id) for item in cancelled
+        ],
+        len(cancelled)
+    )
+    result["after_cancel"] = redis_state(client, backend, args.shards)
+
+    if backend == "redis":
+        from bot.core.redis import SCHEDULE_CLAIMED_KEY, SCHEDULE_DUE_KEY
+
+        # Выбор наступивших ID без чтения строк из базы: замеряется
+        # только атомарный скрипт захвата.
+        claim = scheduler._claim
+        keys = []
+        for shard in range(args.shards):
+            keys += [
+                SCHEDULE_DUE_KEY.format(shard=shard),
+                SCHEDULE_CLAIMED_KEY.format(shard=shard),
+            ]
+        horizon = max(item.remind_at for item in snoozed)
+        claimed = 0
+
+        def drain():
+            nonlocal claimed
+            while True:
+                ids = claim(keys=keys, args=[horizon, args.batch, 60_000])
+                if not ids:
+                    break
+                claimed += len(ids)
+
+        result["claim"] = timed(drain, len(items) - len(cancelled))
+        result["claim"]["claimed"] = claimed
+    client.flushdb()
+    return result
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Готовит окружение, выполняет замеры и собирает отчет."""
+    os.environ["REDIS_URL"] = args.redis_url
+    os.environ["DISPATCH_SHARDS"] = str(args.shards)
+    os.environ.setdefault("BOT_TOKEN", "123456:SCHEDULER")
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+    now = int(time.time())
+    items = [
+        Item(i + 1, i % args.users + 1, f"reminder {i}", now + 3600 + i)
+        for i in range(args.reminders)
+    ]
+    results = {
+        backend: run_backend(backend, items, args)
+        for backend in ("dramatiq", "redis")
+    }
+    return {
+        "config": {
+            "reminders": args.reminders,
+            "snoozes": args.snoozes,
+            "shards": args.shards,
+        },
+        "results": results,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"{'backend':<10}{'step':<12}{'per sec':>10}"
+        f"{'entries':>10}{'memory KiB':>12}"
+    )
+    for backend, result in report["results"].items():
+        base = result["baseline"]["used_memory_kib"]
+        for step in ("schedule", "reschedule", "cancel"):
+            state = result[f"after_{step}"]
+            print(
+                f"{backend:<10}{step:<12}{result[step]['per_second']:>10}"
+                f"{state['entries']:>10}"
+                f"{state['used_memory_kib'] - base:>12}"
+            )
+        if "claim" in result:
+            print(
+                f"{backend:<10}{'claim':<12}"
+                f"{result['claim']['per_second']:>10}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15",
+                        help="база Redis очищается")
+    parser.add_argument("--reminders", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--snoozes", type=int, default=3,
+                        help="переносов каждого напоминания")
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--chunk", type=int, default=1000,
+                        help="напоминаний в одном вызове schedule()")
+    parser.add_argument("--batch", type=int, default=200,
+                        help="размер пачки захвата")
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
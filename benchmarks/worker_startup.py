@@ -0,0 +1,110 @@
+"""
+Бенчмарк запуска процесса воркера.
+
+Для каждого модуля в отдельном чистом интерпретаторе замеряет время
+импорта, RSS процесса после импорта, число загруженных модулей
+и то, попали ли в процесс aiogram и pydantic. Так видно, сколько
+стоит каждому процессу Dramatiq загрузка worker.tasks по сравнению
+с полным стеком бота.
+
+Пример:
+    python -m benchmarks.worker_startup --runs 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.common import summarize
+
+
+DEFAULT_MODULES = ["worker.tasks", "bot.main"]
+HEAVY_MODULES = ["aiogram", "pydantic"]
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+with open("/proc/self/statm") as f:
+    rss_pages = int(f.read().split()[1])
+print(json.dumps({{
+    "import_seconds": elapsed,
+    "rss_mb": rss_pages * resource.getpagesize() / 2 ** 20,
+    "modules": len(sys.modules),
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def probe(module: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Импортирует модуль в новом процессе и возвращает замеры.
+
+    Args:
+        module: Имя модуля для импорта
+        env: Переменные окружения процесса
+
+    Returns:
+        Dict[str, Any]: import_seconds, rss_mb, modules, heavy
+    """
+    output = subprocess.run(
+        [
+            sys.executable, "-c",
+            PROBE.format(module=module, heavy=HEAVY_MODULES),
+        ],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(modules: List[str], runs: int) -> Dict[str, Any]:
+    """Выполняет замеры для всех модулей."""
+    env = dict(os.environ)
+    env.setdefault("BOT_TOKEN", "123456:STARTUP")
+    env.setdefault("DATABASE_URL", "sqlite:///startup_bench.db")
+    env.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+    report = {}
+    for module in modules:
+        # Первый запуск прогревает кэш байткода и не учитывается.
+        probe(module, env)
+        samples = [probe(module, env) for _ in range(runs)]
+        report[module] = {
+            "import": summarize([s["import_seconds"] for s in samples]),
+            "rss_mb": round(max(s["rss_mb"] for s in samples), 1),
+            "modules": samples[-1]["modules"],
+            "heavy": samples[-1]["heavy"],
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="файл для JSON-отчета")
+    args = parser.parse_args()
+
+    report = run(args.modules, args.runs)
+    print(
+        f"{'module':<16}{'import p50 ms':>15}{'rss MB':>10}"
+        f"{'modules':>10}  heavy"
+    )
+    for module, stats in report.items():
+        print(
+            f"{module:<16}{stats['import']['p50']:>15}{stats['rss_mb']:>10}"
+            f"{stats['modules']:>10}  {', '.join(stats['heavy']) or '-'}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
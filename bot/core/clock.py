@@ -0,0 +1,77 @@
+import time
+from datetime import datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from bot.core.config import settings
+
+
+class Clock:
+    """
+    Часы сервиса: все «текущее время» бота и воркера берется отсюда.
+
+    По умолчанию это системные часы. После configure() время идет
+    от заданного момента с ускорением speed: так бот и воркер
+    в разных процессах (с одинаковыми CLOCK_*) видят одно и то же
+    виртуальное время, а сутки нагрузки проигрываются за минуты.
+    Задержки очереди Dramatiq и ожидания считаются через delay(),
+    который переводит виртуальные секунды в реальные.
+    """
+
+    def __init__(self):
+        self.speed = 1.0
+        self._start: Optional[float] = None
+        self._anchor = 0.0
+
+    def configure(
+        self,
+        start: float,
+        speed: float = 1.0,
+        anchor: Optional[float] = None
+    ):
+        """
+        Запускает виртуальное время.
+
+        Args:
+            start: Виртуальное время в момент anchor, UTC epoch
+            speed: Во сколько раз виртуальное время идет быстрее
+            anchor: Реальное время, UTC epoch; по умолчанию - сейчас
+        """
+        self._start = start
+        self.speed = speed
+        self._anchor = time.time() if anchor is None else anchor
+
+    def reset(self):
+        """Возвращает системные часы."""
+        self.__init__()
+
+    def time(self) -> float:
+        """Текущее время, UTC epoch."""
+        if self._start is None:
+            return time.time()
+        return self._start + (time.time() - self._anchor) * self.speed
+
+    def now(self, tz: ZoneInfo) -> datetime:
+        """Текущее время в зоне tz."""
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def delay(self, ts: float) -> float:
+        """
+        Реальное время в секундах до момента ts по этим часам.
+
+        Args:
+            ts: Момент, UTC epoch
+
+        Returns:
+            float: Неотрицательная задержка в реальных секундах
+        """
+        return max(0.0, (ts - self.time()) / self.speed)
+
+
+clock = Clock()
+if settings.CLOCK_START or settings.CLOCK_SPEED != 1:
+    clock.configure(
+        settings.CLOCK_START or time.time(),
+        settings.CLOCK_SPEED,
+        settings.CLOCK_ANCHOR or None
+    )
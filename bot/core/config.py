@@ -13,15 +13,187 @@ class Settings:
     Атрибуты:
         BOT_TOKEN (str | None): Токен Telegram-бота.
         REDIS_URL (str | None): URL подключения к Redis.
+        REDIS_MAX_CONNECTIONS (int): Размер пула соединений Redis
+            на процесс.
+        REDIS_SOCKET_TIMEOUT (float): Таймаут операций Redis, секунды.
+        REDIS_CONNECT_TIMEOUT (float): Таймаут подключения к Redis, секунды.
+        REDIS_HEALTH_CHECK_INTERVAL (int): Через сколько секунд простоя
+            соединение проверяется PING перед использованием.
         DATABASE_URL (str | None): URL подключения к базе данных.
         ADMINS (list[int]): Список ID администраторов.
+        DEFAULT_TIMEZONE (str): Временная зона IANA для пользователей,
+            которые не выбрали свою.
+        TELEGRAM_API_URL (str | None): Адрес альтернативного сервера
+            Bot API (локальный сервер или заглушка для нагрузочных тестов).
+        COALESCE_WINDOW_SECONDS (int): Напоминания одного пользователя,
+            срабатывающие в пределах этого окна, отправляются одним
+            сообщением; 0 - выключено.
+        COALESCE_MAX_ITEMS (int): Наибольшее число напоминаний
+            в одном объединенном сообщении.
+        QUOTA_CREATE_LIMIT (int): Сколько напоминаний пользователь может
+            создать за окно QUOTA_CREATE_WINDOW_SECONDS.
+        QUOTA_CREATE_WINDOW_SECONDS (int): Длина скользящего окна.
+        QUOTA_MAX_PENDING (int): Наибольшее число активных напоминаний
+            пользователя.
+        QUOTA_PENDING_CACHE_SECONDS (int): Время жизни кэша числа
+            активных напоминаний в Redis.
+        BROADCAST_BATCH_SIZE (int): Получателей в одной пачке рассылки.
+        BROADCAST_RATE (float): Предел сообщений рассылки в секунду,
+            общий для всех процессов воркера (ведро в Redis).
+        BROADCAST_STALE_SECONDS (int): Через сколько секунд без новой
+            пачки цепочка рассылки считается остановившейся и ее можно
+            продолжить (/broadcast_resume).
+        HEALTH_HOST (str): Адрес HTTP-сервера проверок состояния.
+        BOT_HEALTH_PORT (int): Порт проверок процесса бота; 0 - выключено.
+        WORKER_HEALTH_PORT (int): Порт проверок воркера; 0 - выключено.
+        HEALTH_REFRESH_SECONDS (float): Период обновления снимка
+            состояния, который отдают /health и /ready.
+        HEALTH_OVERDUE_GRACE_SECONDS (int): Через сколько секунд после
+            срока неотправленное напоминание считается просроченным.
+        HEALTH_MAX_LOOP_LAG (float): Задержка цикла событий в секундах,
+            после которой /health отвечает 503.
+        HEALTH_MAX_TASK_SECONDS (float): Сколько секунд может
+            выполняться задача воркера, прежде чем он считается зависшим.
+        SCHEDULER_BACKEND (str): Как планируются напоминания:
+            "dramatiq" - отложенные сообщения очереди, "database" -
+            диспетчеры воркеров выбирают наступившие напоминания
+            из базы по шардам, "redis" - из индекса таймеров (ZSET)
+            в Redis по шардам.
+        SCHEDULE_CLAIM_SECONDS (float): Через сколько секунд
+            неподтвержденный захват напоминания из индекса таймеров
+            истекает и напоминание снова выбирается.
+        SCHEDULE_HORIZON_SECONDS (float): Планировщику передаются
+            только напоминания, наступающие в пределах этого числа
+            секунд; более поздние остаются в базе до входа в окно.
+            0 - без горизонта.
+        SCHEDULE_PROMOTE_INTERVAL_SECONDS (float): Период продвижения
+            напоминаний, входящих в горизонт; должен быть заметно
+            меньше SCHEDULE_HORIZON_SECONDS.
+        SCHEDULE_PROMOTE_BATCH_SIZE (int): Напоминаний в одной пачке
+            продвижения.
+        DISPATCH_SHARDS (int): Число шардов диспетчера (пользователи
+            делятся по users.id).
+        DISPATCH_LEASE_SECONDS (float): Срок аренды шарда узлом;
+            шарды остановившегося узла переходят к другим не позже.
+        DISPATCH_INTERVAL_SECONDS (float): Период опроса базы.
+        DISPATCH_BATCH_SIZE (int): Напоминаний за один опрос.
+        DISPATCH_CONCURRENCY (int): Одновременных отправок на узел.
+        DELIVERY_MAX_RETRIES (int): Сколько раз повторяется доставка
+            после временной ошибки (сеть, 5xx, 429), прежде чем
+            напоминание попадет в недоставленные.
+        DELIVERY_RETRY_BASE_SECONDS (float): Задержка первого повтора;
+            каждый следующий ждет вдвое дольше (со случайным разбросом).
+        DELIVERY_RETRY_MAX_SECONDS (float): Наибольшая задержка повтора.
+        DELIVERY_CLAIM_SECONDS (float): Срок захвата напоминания
+            доставкой; захват, не завершенный отправкой до срока
+            (воркер убит посреди отправки), снова доступен доставке.
+            Должен быть больше таймаута запроса к Bot API.
+        DELIVERY_LOG_BATCH_SIZE (int): Записей журнала доставок
+            в одной вставке.
+        DELIVERY_LOG_FLUSH_SECONDS (float): Наибольшее время, которое
+            записи журнала доставок ждут вставки.
+        SHUTDOWN_TIMEOUT_SECONDS (float): Сколько секунд бот и воркер
+            при остановке (SIGTERM) ждут завершения начатой работы.
+            Это общий срок от сигнала для всех этапов остановки;
+            должен быть меньше срока, после которого контейнер
+            получает SIGKILL.
+        CLOCK_START (float): Виртуальное время запуска, UTC epoch;
+            0 - системные часы (используется при воспроизведении нагрузки).
+        CLOCK_SPEED (float): Ускорение виртуального времени.
+        CLOCK_ANCHOR (float): Реальное время, UTC epoch, которому
+            соответствует CLOCK_START; 0 - момент запуска процесса.
+        TRACE_EXPORTER (str): Экспорт трасс: "file", "otlp" или пусто
+            (трассировка выключена).
+        TRACE_FILE (str): Файл JSON Lines для экспортера "file".
+        TRACE_OTLP_ENDPOINT (str): Адрес OTLP/HTTP коллектора.
+        TRACE_SAMPLE_RATE (float): Доля записываемых трасс от 0 до 1.
+        TRACE_SERVICE_NAME (str): Имя сервиса в трассах.
     """
     BOT_TOKEN = os.getenv("BOT_TOKEN")
     REDIS_URL = os.getenv("REDIS_URL")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+    REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "5"))
+    REDIS_HEALTH_CHECK_INTERVAL = int(
+        os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30")
+    )
     DATABASE_URL = os.getenv("DATABASE_URL")
     ADMINS: list[int] = [
         int(x.strip()) for x in os.getenv("ADMINS", "").split(",") if x.strip()
     ]
+    DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "Asia/Yekaterinburg")
+    TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL")
+    COALESCE_WINDOW_SECONDS = int(os.getenv("COALESCE_WINDOW_SECONDS", "0"))
+    COALESCE_MAX_ITEMS = int(os.getenv("COALESCE_MAX_ITEMS", "10"))
+    QUOTA_CREATE_LIMIT = int(os.getenv("QUOTA_CREATE_LIMIT", "20"))
+    QUOTA_CREATE_WINDOW_SECONDS = int(
+        os.getenv("QUOTA_CREATE_WINDOW_SECONDS", "60")
+    )
+    QUOTA_MAX_PENDING = int(os.getenv("QUOTA_MAX_PENDING", "1000"))
+    QUOTA_PENDING_CACHE_SECONDS = int(
+        os.getenv("QUOTA_PENDING_CACHE_SECONDS", "30")
+    )
+    BROADCAST_BATCH_SIZE = int(os.getenv("BROADCAST_BATCH_SIZE", "500"))
+    BROADCAST_RATE = float(os.getenv("BROADCAST_RATE", "25"))
+    BROADCAST_STALE_SECONDS = int(
+        os.getenv("BROADCAST_STALE_SECONDS", "120")
+    )
+    HEALTH_HOST = os.getenv("HEALTH_HOST", "0.0.0.0")
+    BOT_HEALTH_PORT = int(os.getenv("BOT_HEALTH_PORT", "8080"))
+    WORKER_HEALTH_PORT = int(os.getenv("WORKER_HEALTH_PORT", "8081"))
+    HEALTH_REFRESH_SECONDS = float(os.getenv("HEALTH_REFRESH_SECONDS", "5"))
+    HEALTH_OVERDUE_GRACE_SECONDS = int(
+        os.getenv("HEALTH_OVERDUE_GRACE_SECONDS", "60")
+    )
+    HEALTH_MAX_LOOP_LAG = float(os.getenv("HEALTH_MAX_LOOP_LAG", "2"))
+    HEALTH_MAX_TASK_SECONDS = float(
+        os.getenv("HEALTH_MAX_TASK_SECONDS", "600")
+    )
+    SCHEDULER_BACKEND = os.getenv("SCHEDULER_BACKEND", "dramatiq")
+    SCHEDULE_CLAIM_SECONDS = float(os.getenv("SCHEDULE_CLAIM_SECONDS", "60"))
+    SCHEDULE_HORIZON_SECONDS = float(
+        os.getenv("SCHEDULE_HORIZON_SECONDS", "0")
+    )
+    SCHEDULE_PROMOTE_INTERVAL_SECONDS = float(
+        os.getenv("SCHEDULE_PROMOTE_INTERVAL_SECONDS", "60")
+    )
+    SCHEDULE_PROMOTE_BATCH_SIZE = int(
+        os.getenv("SCHEDULE_PROMOTE_BATCH_SIZE", "1000")
+    )
+    DISPATCH_SHARDS = int(os.getenv("DISPATCH_SHARDS", "64"))
+    DISPATCH_LEASE_SECONDS = float(os.getenv("DISPATCH_LEASE_SECONDS", "10"))
+    DISPATCH_INTERVAL_SECONDS = float(
+        os.getenv("DISPATCH_INTERVAL_SECONDS", "1")
+    )
+    DISPATCH_BATCH_SIZE = int(os.getenv("DISPATCH_BATCH_SIZE", "200"))
+    DISPATCH_CONCURRENCY = int(os.getenv("DISPATCH_CONCURRENCY", "10"))
+    DELIVERY_MAX_RETRIES = int(os.getenv("DELIVERY_MAX_RETRIES", "5"))
+    DELIVERY_RETRY_BASE_SECONDS = float(
+        os.getenv("DELIVERY_RETRY_BASE_SECONDS", "5")
+    )
+    DELIVERY_RETRY_MAX_SECONDS = float(
+        os.getenv("DELIVERY_RETRY_MAX_SECONDS", "600")
+    )
+    DELIVERY_CLAIM_SECONDS = float(
+        os.getenv("DELIVERY_CLAIM_SECONDS", "120")
+    )
+    DELIVERY_LOG_BATCH_SIZE = int(os.getenv("DELIVERY_LOG_BATCH_SIZE", "200"))
+    DELIVERY_LOG_FLUSH_SECONDS = float(
+        os.getenv("DELIVERY_LOG_FLUSH_SECONDS", "1")
+    )
+    SHUTDOWN_TIMEOUT_SECONDS = float(
+        os.getenv("SHUTDOWN_TIMEOUT_SECONDS", "20")
+    )
+    CLOCK_START = float(os.getenv("CLOCK_START", "0"))
+    CLOCK_SPEED = float(os.getenv("CLOCK_SPEED", "1"))
+    CLOCK_ANCHOR = float(os.getenv("CLOCK_ANCHOR", "0"))
+    TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "")
+    TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+    TRACE_OTLP_ENDPOINT = os.getenv(
+        "TRACE_OTLP_ENDPOINT", "http://localhost:4318"
+    )
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+    TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "reminder-service")
 
 
 settings = Settings()
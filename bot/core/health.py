@@ -0,0 +1,177 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from database.crud.reminders import get_overdue_stats
+
+
+# Ключи очереди Dramatiq (RedisBroker, пространство имен по умолчанию).
+# В хэше .msgs лежат все неподтвержденные сообщения очереди.
+QUEUE_MESSAGES_KEY = "dramatiq:default.msgs"
+DELAYED_MESSAGES_KEY = "dramatiq:default.DQ.msgs"
+
+LAG_SAMPLE_SECONDS = 0.5
+CHECK_TIMEOUT_SECONDS = 2
+
+
+class HealthMonitor:
+    """
+    Снимок состояния процесса для проверок оркестратора.
+
+    Фоновая задача раз в HEALTH_REFRESH_SECONDS проверяет базу и Redis,
+    читает размер очередей и число просроченных напоминаний (по индексу,
+    с ограничением). Обработчики /health и /ready отдают последний
+    снимок, поэтому частый опрос не создает нагрузки. Задержка цикла
+    событий - наибольшее опоздание пробуждения отдельной задачи
+    за период обновления.
+    """
+
+    def __init__(
+        self,
+        service: str,
+        sessions: Callable[[], async_sessionmaker],
+        redis: Callable[[], Optional[Redis]],
+        extra: Optional[Callable[[], Dict[str, Any]]] = None
+    ):
+        """
+        Args:
+            service: Имя процесса в ответе
+            sessions: Возвращает фабрику сессий базы данных
+            redis: Возвращает асинхронный клиент Redis или None
+            extra: Дополнительные поля снимка; поле stuck=True
+                переводит /health в 503
+        """
+        self.service = service
+        self.sessions = sessions
+        self.redis = redis
+        self.extra = extra
+        self.snapshot: Dict[str, Any] = {}
+        self._lag = 0.0
+        self._tasks = []
+
+    async def _check_database(self) -> Dict[str, Any]:
+        before = int(clock.time()) - settings.HEALTH_OVERDUE_GRACE_SECONDS
+        async with self.sessions()() as db:
+            await db.execute(text("SELECT 1"))
+            count, oldest = await get_overdue_stats(db, before)
+        return {
+            "database": True,
+            "overdue_count": count,
+            "overdue_oldest_seconds": (
+                round(clock.time() - oldest) if oldest is not None else None
+            ),
+        }
+
+    async def _check_redis(self) -> Dict[str, Any]:
+        client = self.redis()
+        if client is None:
+            return {"redis": None}
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.ping()
+            pipe.hlen(QUEUE_MESSAGES_KEY)
+            pipe.hlen(DELAYED_MESSAGES_KEY)
+            _, queued, delayed = await pipe.execute()
+        return {"redis": True, "queued": queued, "delayed": delayed}
+
+    async def _run_check(self, check, name: str) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(check(), CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"HEALTH: Ошибка проверки {name}: {e!r}")
+            return {name: False}
+
+    async def refresh(self):
+        """Обновляет снимок состояния."""
+        database, redis = await asyncio.gather(
+            self._run_check(self._check_database, "database"),
+            self._run_check(self._check_redis, "redis")
+        )
+        snapshot = {
+            "service": self.service,
+            "updated_at": time.time(),
+            "loop_lag_seconds": round(self._lag, 3),
+            **database,
+            **redis,
+        }
+        if self.extra is not None:
+            snapshot.update(self.extra())
+        self._lag = 0.0
+        self.snapshot = snapshot
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(settings.HEALTH_REFRESH_SECONDS)
+
+    async def _lag_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LAG_SAMPLE_SECONDS)
+            lag = loop.time() - started - LAG_SAMPLE_SECONDS
+            self._lag = max(self._lag, lag)
+
+    def is_alive(self) -> bool:
+        """Процесс обновляет снимок, цикл событий и задачи не зависли."""
+        if not self.snapshot:
+            return False
+        age = time.time() - self.snapshot["updated_at"]
+        return (
+            age <= settings.HEALTH_REFRESH_SECONDS * 3
+            and self.snapshot["loop_lag_seconds"]
+            <= settings.HEALTH_MAX_LOOP_LAG
+            and not self.snapshot.get("stuck")
+        )
+
+    def is_ready(self) -> bool:
+        """База данных и Redis (если используется) доступны."""
+        return bool(self.snapshot.get("database")) and (
+            self.snapshot.get("redis") is not False
+        )
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            self.snapshot, status=200 if self.is_alive() else 503
+        )
+
+    async def _ready(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            self.snapshot, status=200 if self.is_ready() else 503
+        )
+
+    async def start(self, host: str, port: int) -> web.AppRunner:
+        """
+        Запускает фоновое обновление снимка и HTTP-сервер проверок.
+
+        Args:
+            host: Адрес сервера
+            port: Порт сервера
+
+        Returns:
+            web.AppRunner: Запущенный сервер (для остановки)
+
+        Raises:
+            OSError: Если порт занят
+        """
+        app = web.Application()
+        app.router.add_get("/health", self._health)
+        app.router.add_get("/ready", self._ready)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError:
+            await runner.cleanup()
+            raise
+        self._tasks = [
+            asyncio.create_task(self._lag_loop()),
+            asyncio.create_task(self._refresh_loop()),
+        ]
+        return runner
@@ -1,9 +1,25 @@
 from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
 
 from bot.core.config import settings
+from bot.core.redis import get_async_redis
 
 
-bot = Bot(token=settings.BOT_TOKEN)
+session = (
+    AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_URL))
+    if settings.TELEGRAM_API_URL
+    else None
+)
 
-dp = Dispatcher(storage=MemoryStorage())
+bot = Bot(token=settings.BOT_TOKEN, session=session)
+
+storage = (
+    RedisStorage(redis=get_async_redis())
+    if settings.REDIS_URL
+    else MemoryStorage()
+)
+
+dp = Dispatcher(storage=storage)
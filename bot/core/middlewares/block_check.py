@@ -3,6 +3,7 @@ from typing import Any, Awaitable, Callable, Dict
 from aiogram import BaseMiddleware
 from aiogram.types import Message
 
+from bot.services.reminders import ReminderService
 from bot.services.users import UserService
 
 
@@ -12,6 +13,10 @@ class BlockCheckMiddleware(BaseMiddleware):
 
     Проверяет, заблокирован ли пользователь перед обработкой сообщения.
     Если пользователь заблокирован, сообщение не передается дальше по цепочке.
+
+    Пользователь, помеченный недоступным (ранее заблокировал бота),
+    раз пишет боту, снова доступен: отметка снимается, а его активные
+    напоминания планируются заново.
     """
 
     async def __call__(
@@ -43,4 +48,10 @@ class BlockCheckMiddleware(BaseMiddleware):
             )
             return
 
+        if user and user.is_unreachable:
+            if await UserService.reactivate(user.tg_id):
+                await ReminderService.reschedule_pending(
+                    user.id, user.tg_id, user.timezone
+                )
+
         return await handler(event, data)
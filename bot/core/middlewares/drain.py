@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+
+class DrainMiddleware(BaseMiddleware):
+    """
+    Outer-middleware для Update, которое учитывает обновления
+    в обработке для плавной остановки бота.
+
+    При остановке опрос прекращается сразу, а обновления, уже
+    полученные из getUpdates, обрабатываются в своих задачах.
+    wait() дожидается их, а offset() говорит, до какого обновления
+    подтвердить получение: необработанные к сроку обновления Telegram
+    пришлет снова, обработанные - нет.
+    """
+
+    def __init__(self):
+        self._in_flight: Set[int] = set()
+        self._last_done = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        """
+        Отмечает обновление как обрабатываемое на время обработки.
+
+        Args:
+            handler: Следующий обработчик в цепочке middleware
+            event: Входящее обновление
+            data: Данные контекста
+
+        Returns:
+            Any: Результат обработки handler
+        """
+        self._in_flight.add(event.update_id)
+        self._idle.clear()
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight.discard(event.update_id)
+            self._last_done = max(self._last_done, event.update_id)
+            if not self._in_flight:
+                self._idle.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Ждет завершения обработки полученных обновлений.
+
+        Args:
+            timeout: Предельное время ожидания, секунды
+
+        Returns:
+            bool: True, если все обновления обработаны
+        """
+        # Задачи обновлений последней пачки могли еще не начаться.
+        await asyncio.sleep(0)
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def offset(self) -> Optional[int]:
+        """
+        Offset для getUpdates, подтверждающий обработанные обновления.
+
+        Returns:
+            Optional[int]: Наименьший ID необработанного обновления
+            или следующий за последним обработанным; None, если
+            обновлений не было
+        """
+        if self._in_flight:
+            return min(self._in_flight)
+        return self._last_done + 1 if self._last_done else None
@@ -0,0 +1,184 @@
+import secrets
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import Message
+from redis.exceptions import RedisError
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import (
+    QUOTA_CREATE_KEY,
+    QUOTA_PENDING_KEY,
+    get_async_redis
+)
+from bot.core.utils.helpers import is_admin
+from bot.services.reminders import ReminderService
+
+
+# Проверка обоих лимитов одним атомарным вызовом.
+# KEYS[1] - окно создания (ZSET с метками времени в мс),
+# KEYS[2] - кэш числа активных напоминаний.
+# ARGV: now_ms, window_ms, limit, max_pending, member.
+# Ответ {код, значение}: -1 - кэш пуст; 0 - превышен лимит активных;
+# 1 - превышен лимит частоты (значение - мс до освобождения);
+# 2 - разрешено (значение - число активных с учетом нового).
+QUOTA_SCRIPT = """
+local pending = redis.call('GET', KEYS[2])
+if not pending then
+    return {-1, 0}
+end
+if tonumber(pending) >= tonumber(ARGV[4]) then
+    return {0, tonumber(pending)}
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1] - ARGV[2])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {1, tonumber(oldest[2]) + ARGV[2] - ARGV[1]}
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[5])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return {2, redis.call('INCR', KEYS[2])}
+"""
+
+# Возврат места, занятого QUOTA_SCRIPT, если напоминание не создано.
+# KEYS - те же; ARGV[1] - member из QUOTA_SCRIPT. Кэш уменьшается,
+# только если он еще есть: сброшенный кэш пересчитается из базы.
+RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('DECR', KEYS[2])
+end
+return 1
+"""
+
+CACHE_MISS, PENDING_FULL, RATE_LIMITED, ALLOWED = -1, 0, 1, 2
+
+
+def _keys(tg_id: int) -> list:
+    return [
+        QUOTA_CREATE_KEY.format(tg_id=tg_id),
+        QUOTA_PENDING_KEY.format(tg_id=tg_id)
+    ]
+
+
+async def invalidate_pending(tg_id: int):
+    """
+    Сбрасывает кэш числа активных напоминаний пользователя.
+
+    Нужен после операций, создающих сразу много напоминаний (импорт),
+    и после удаления напоминания: следующая проверка пересчитает
+    число активных в базе.
+    """
+    try:
+        await get_async_redis().delete(_keys(tg_id)[1])
+    except RedisError:
+        pass
+
+
+class CreationQuotaMiddleware(BaseMiddleware):
+    """
+    Middleware для ограничения создания напоминаний.
+
+    Действует на обработчики с флагом creates_reminder и проверяет
+    два лимита: число созданий за скользящее окно и общее число
+    активных напоминаний пользователя. Оба проверяются одним
+    Lua-скриптом в Redis до обращения к базе; число активных берется
+    из кэша и считается в базе только при его отсутствии.
+
+    Скрипт занимает место в обоих лимитах до вызова обработчика.
+    Обработчик с флагом возвращает число созданных напоминаний;
+    если он ничего не создал (например, не разобрал текст) или упал,
+    место возвращается.
+
+    При ошибке Redis сообщение пропускается (fail-open): ограничитель
+    не должен останавливать бота. Администраторы не ограничиваются.
+    """
+
+    def __init__(self):
+        self.script = get_async_redis().register_script(QUOTA_SCRIPT)
+        self.release = get_async_redis().register_script(RELEASE_SCRIPT)
+
+    async def _check(self, tg_id: int, member: str) -> tuple:
+        now_ms = int(clock.time() * 1000)
+        keys = _keys(tg_id)
+        args = [
+            now_ms,
+            settings.QUOTA_CREATE_WINDOW_SECONDS * 1000,
+            settings.QUOTA_CREATE_LIMIT,
+            settings.QUOTA_MAX_PENDING,
+            member,
+        ]
+        code, value = await self.script(keys=keys, args=args)
+        if code == CACHE_MISS:
+            pending = await ReminderService.count_pending(tg_id)
+            await get_async_redis().set(
+                keys[1],
+                pending,
+                ex=settings.QUOTA_PENDING_CACHE_SECONDS,
+                nx=True
+            )
+            code, value = await self.script(keys=keys, args=args)
+        return code, value
+
+    async def _release(self, tg_id: int, member: str):
+        try:
+            await self.release(keys=_keys(tg_id), args=[member])
+        except RedisError as e:
+            print(f"QUOTA: Не удалось вернуть место: {e}")
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any]
+    ) -> Any:
+        """
+        Проверяет лимиты перед обработчиком, создающим напоминания.
+
+        Args:
+            handler: Следующий обработчик в цепочке middleware
+            event: Объект сообщения от пользователя
+            data: Данные контекста
+
+        Returns:
+            Any: Результат обработки handler или None,
+            если лимит превышен
+        """
+        tg_id = event.from_user.id
+        if not get_flag(data, "creates_reminder") or is_admin(tg_id):
+            return await handler(event, data)
+
+        member = f"{int(clock.time() * 1000)}-{secrets.token_hex(4)}"
+        try:
+            code, value = await self._check(tg_id, member)
+        except RedisError as e:
+            print(f"QUOTA: Redis недоступен, проверка пропущена: {e}")
+            return await handler(event, data)
+
+        if code == PENDING_FULL:
+            await event.answer(
+                f"❌ У вас уже {value} активных напоминаний "
+                f"(максимум {settings.QUOTA_MAX_PENDING}). "
+                "Удалите ненужные через /delete."
+            )
+            return
+        if code == RATE_LIMITED:
+            await event.answer(
+                "⏳ Слишком много напоминаний подряд. "
+                f"Попробуйте через {int(value) // 1000 + 1} с."
+            )
+            return
+
+        if code != ALLOWED:
+            return await handler(event, data)
+
+        data["pending_quota_left"] = settings.QUOTA_MAX_PENDING - value + 1
+        created = None
+        try:
+            created = await handler(event, data)
+            return created
+        finally:
+            if not created:
+                await self._release(tg_id, member)
@@ -0,0 +1,47 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from bot.core.tracing import tracer
+
+
+class TracingMiddleware(BaseMiddleware):
+    """
+    Middleware для замера времени обработки событий.
+
+    Как outer-middleware для Update открывает корневой участок трассы
+    на все обновление, как inner-middleware для сообщений и колбэков -
+    участок с именем конкретного обработчика.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        """
+        Оборачивает обработку события в участок трассы.
+
+        Args:
+            handler: Следующий обработчик в цепочке middleware
+            event: Входящее событие
+            data: Данные контекста
+
+        Returns:
+            Any: Результат обработки handler
+        """
+        if not tracer.enabled:
+            return await handler(event, data)
+
+        handler_object = data.get("handler")
+        if handler_object is not None:
+            name = f"handler.{handler_object.callback.__name__}"
+        elif isinstance(event, Update):
+            name = f"update.{event.event_type}"
+        else:
+            name = f"event.{type(event).__name__}"
+
+        with tracer.span(name):
+            return await handler(event, data)
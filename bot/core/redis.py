@@ -0,0 +1,102 @@
+from functools import lru_cache
+
+import redis
+import redis.asyncio as aioredis
+
+from bot.core.config import settings
+
+
+# Множество tg_id пользователей, недоступных для доставки.
+# Копия флага users.is_unreachable для проверки без обращения к базе.
+UNREACHABLE_USERS_KEY = "reminders:unreachable"
+
+# Число доставленных напоминаний за минуту (номер минуты от epoch).
+DELIVERIES_KEY = "stats:deliveries:{minute}"
+DELIVERIES_TTL_SECONDS = 2 * 3600
+
+# Аренда шарда диспетчера: значение - ID узла, срок - DISPATCH_LEASE_SECONDS.
+SHARD_LEASE_KEY = "dispatch:shard:{shard}"
+# Живые узлы диспетчера: ID узла -> время последнего сигнала, мс.
+DISPATCH_NODES_KEY = "dispatch:nodes"
+
+# Индекс таймеров (SCHEDULER_BACKEND=redis): ZSET reminder_id -> remind_at
+# на шард и ZSET захваченных диспетчером ID -> срок захвата, мс.
+SCHEDULE_DUE_KEY = "schedule:due:{shard}"
+SCHEDULE_CLAIMED_KEY = "schedule:claimed:{shard}"
+# Число неудачных попыток доставки напоминаний диспетчером:
+# reminder_id -> попытки; запись удаляется после доставки.
+DELIVERY_ATTEMPTS_KEY = "delivery:attempts"
+
+# Квоты создания напоминаний (bot/core/middlewares/quota.py): ZSET
+# меток времени созданий в окне и кэш числа активных напоминаний.
+# Кэш сбрасывается, когда число активных уменьшается (удаление,
+# доставка разового напоминания), и пересчитывается из базы.
+QUOTA_CREATE_KEY = "quota:create:{tg_id}"
+QUOTA_PENDING_KEY = "quota:pending:{tg_id}"
+
+# Владелец цепочки задач рассылки: значение - токен цепочки,
+# срок - BROADCAST_STALE_SECONDS, продлевается каждой пачкой.
+BROADCAST_OWNER_KEY = "broadcast:owner:{broadcast_id}"
+
+# Ведро токенов рассылки (worker/ratelimit.py): время следующего
+# свободного токена, мкс; общий предел BROADCAST_RATE для всех воркеров.
+BROADCAST_RATE_KEY = "ratelimit:broadcast"
+
+# Горизонт планирования (SCHEDULE_HORIZON_SECONDS): напоминания
+# с remind_at до этой отметки уже переданы планировщику.
+SCHEDULE_WATERMARK_KEY = "schedule:watermark"
+# Блокировка продвижения: значение - ID узла, срок - один период.
+SCHEDULE_PROMOTER_KEY = "schedule:promoter"
+
+
+def _pool_options() -> dict:
+    # Пул блокирующий: при исчерпании соединений вызов ждет свободное
+    # до socket_timeout, а не открывает новое сверх лимита.
+    return {
+        "max_connections": settings.REDIS_MAX_CONNECTIONS,
+        "timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_CONNECT_TIMEOUT,
+        "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_redis() -> redis.Redis:
+    """
+    Возвращает общий синхронный клиент Redis процесса.
+
+    Используется брокером Dramatiq и кодом воркера. Все потоки
+    берут соединения из одного пула размером REDIS_MAX_CONNECTIONS,
+    поэтому число соединений процесса ограничено. Несколько команд
+    подряд стоит отправлять через pipeline(transaction=False) -
+    одним обращением к серверу.
+
+    Returns:
+        redis.Redis: Клиент с общим пулом соединений
+    """
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        **_pool_options()
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+@lru_cache(maxsize=None)
+def get_async_redis() -> aioredis.Redis:
+    """
+    Возвращает общий асинхронный клиент Redis процесса бота.
+
+    Используется хранилищем FSM, кэшами и ограничителями частоты.
+    Соединения асинхронного пула привязаны к циклу событий, поэтому
+    клиент рассчитан на процесс с одним циклом (бот); в потоках
+    воркера нужно использовать get_redis().
+
+    Returns:
+        redis.asyncio.Redis: Клиент с общим пулом соединений
+    """
+    pool = aioredis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        **_pool_options()
+    )
+    return aioredis.Redis(connection_pool=pool)
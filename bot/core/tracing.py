@@ -0,0 +1,377 @@
+import contextvars
+import json
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from bot.core.config import settings
+
+
+class Span:
+    """Завершенный или текущий участок трассы."""
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id",
+        "start_ns", "end_ns", "attributes",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any]
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Заглушка для трасс, не попавших в выборку."""
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+# Текущий участок трассы: Span, NOOP_SPAN (трасса не в выборке) или None.
+_current_span: contextvars.ContextVar = contextvars.ContextVar(
+    "current_span", default=None
+)
+# Имя функции CRUD, выполняющей запросы в текущем контексте.
+_crud_function: contextvars.ContextVar = contextvars.ContextVar(
+    "crud_function", default=None
+)
+
+
+class BatchExporter:
+    """
+    Базовый экспортер: копит участки в очереди и выгружает их пачками
+    из фонового потока, чтобы не задерживать обработчики.
+    """
+
+    def __init__(self, batch_size: int = 512, interval: float = 1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: queue.Queue = queue.Queue(maxsize=batch_size * 20)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def flush(self):
+        """Выгружает накопленные участки сразу (при остановке процесса)."""
+        batch: List[Span] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(batch), self.batch_size):
+            try:
+                self.write(batch[start:start + self.batch_size])
+            except Exception as e:
+                print(f"TRACING: Ошибка экспорта: {e}")
+
+    def _run(self):
+        while True:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.write(batch)
+                except Exception as e:
+                    print(f"TRACING: Ошибка экспорта: {e}")
+
+    def write(self, spans: List[Span]):
+        raise NotImplementedError
+
+
+class FileExporter(BatchExporter):
+    """Пишет участки в файл в формате JSON Lines."""
+
+    def __init__(self, path: str, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    def write(self, spans: List[Span]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False) + "\n")
+
+
+class OTLPExporter(BatchExporter):
+    """Отправляет участки в OTLP/HTTP коллектор (JSON-кодирование)."""
+
+    def __init__(self, endpoint: str, service_name: str, **kwargs):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        super().__init__(**kwargs)
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def write(self, spans: List[Span]):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    self._attribute("service.name", self.service_name)
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "reminder-service"},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            "parentSpanId": span.parent_id or "",
+                            "name": span.name,
+                            "kind": 1,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": [
+                                self._attribute(k, v)
+                                for k, v in span.attributes.items()
+                            ],
+                        }
+                        for span in spans
+                    ],
+                }],
+            }],
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        urllib.request.urlopen(request, timeout=5).close()
+
+
+class Tracer:
+    """
+    Трассировщик с выборкой на уровне корневого участка.
+
+    Решение о записи принимается один раз при открытии корневого участка
+    (обновление Telegram, задача воркера). Если трасса не попала
+    в выборку или экспорт выключен, вложенные участки стоят одну
+    проверку contextvar.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[BatchExporter],
+        sample_rate: float = 1.0
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def flush(self):
+        """Выгружает участки, еще не отправленные экспортером."""
+        if self.exporter is not None:
+            self.exporter.flush()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """
+        Открывает участок трассы.
+
+        Args:
+            name: Имя участка
+            **attributes: Атрибуты участка
+
+        Yields:
+            Span или NOOP_SPAN, если трасса не записывается
+        """
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        if parent is NOOP_SPAN:
+            yield NOOP_SPAN
+            return
+
+        if parent is None and random.random() >= self.sample_rate:
+            token = _current_span.set(NOOP_SPAN)
+            try:
+                yield NOOP_SPAN
+            finally:
+                _current_span.reset(token)
+            return
+
+        span = Span(
+            name,
+            parent.trace_id if parent else secrets.token_hex(16),
+            parent.span_id if parent else None,
+            attributes
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = repr(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.export(span)
+
+    def record(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        **attributes: Any
+    ):
+        """
+        Записывает уже завершившийся участок как дочерний к текущему.
+
+        Используется хуками SQLAlchemy, где начало и конец
+        приходят разными событиями.
+        """
+        parent = _current_span.get()
+        if self.exporter is None or not isinstance(parent, Span):
+            return
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+        span.start_ns = start_ns
+        span.end_ns = end_ns
+        self.exporter.export(span)
+
+
+def _build_exporter() -> Optional[BatchExporter]:
+    if settings.TRACE_EXPORTER == "file":
+        return FileExporter(settings.TRACE_FILE)
+    if settings.TRACE_EXPORTER == "otlp":
+        return OTLPExporter(
+            settings.TRACE_OTLP_ENDPOINT,
+            settings.TRACE_SERVICE_NAME
+        )
+    return None
+
+
+tracer = Tracer(_build_exporter(), settings.TRACE_SAMPLE_RATE)
+
+
+def traced_crud(func):
+    """
+    Декоратор для функций CRUD: оборачивает вызов в участок трассы
+    и помечает выполняемые внутри SQL-запросы именем функции.
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return await func(*args, **kwargs)
+        token = _crud_function.set(name)
+        try:
+            with tracer.span(f"crud.{name}"):
+                return await func(*args, **kwargs)
+        finally:
+            _crud_function.reset(token)
+
+    return wrapper
+
+
+def instrument_engine(engine: Engine):
+    """
+    Подключает к движку хуки, замеряющие каждый SQL-запрос.
+
+    Args:
+        engine: Синхронный движок (для AsyncEngine - engine.sync_engine)
+    """
+    if not tracer.enabled:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if isinstance(_current_span.get(), Span):
+            conn.info.setdefault("trace_start_ns", []).append(time.time_ns())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        starts = conn.info.get("trace_start_ns")
+        if not starts:
+            return
+        start_ns = starts.pop()
+        tracer.record(
+            "db.statement",
+            start_ns,
+            time.time_ns(),
+            statement=statement[:300],
+            crud_function=_crud_function.get() or "",
+        )
+
+    # Запрос с ошибкой не доходит до after_cursor_execute: без этого
+    # хука его отметка начала осталась бы в conn.info соединения пула
+    # и сдвинула бы замеры следующих запросов.
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        conn = context.connection
+        starts = conn.info.get("trace_start_ns") if conn is not None else None
+        if not starts:
+            return
+        tracer.record(
+            "db.statement",
+            starts.pop(),
+            time.time_ns(),
+            statement=(context.statement or "")[:300],
+            crud_function=_crud_function.get() or "",
+            error=type(context.original_exception).__name__,
+        )
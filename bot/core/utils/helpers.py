@@ -1,20 +1,49 @@
-from datetime import datetime
+from zoneinfo import ZoneInfo
 
 from bot.core.config import settings
-from bot.core.utils.timezone import YEKATERINBURG_TZ
+from bot.core.utils.timezone import DEFAULT_TZ, from_timestamp
 
 
-def fmt_datetime(dt: datetime) -> str:
+_WEEKDAYS_PLURAL = (
+    "понедельникам",
+    "вторникам",
+    "средам",
+    "четвергам",
+    "пятницам",
+    "субботам",
+    "воскресеньям",
+)
+
+
+def fmt_datetime(ts: int, tz: ZoneInfo = DEFAULT_TZ) -> str:
     """
-    Форматирует datetime в строку с учетом временной зоны Екатеринбурга.
+    Форматирует UTC epoch в строку во временной зоне пользователя.
 
     Args:
-        dt: Объект datetime для форматирования
+        ts: Время в секундах с начала эпохи UTC
+        tz: Временная зона пользователя
 
     Returns:
         str: Отформатированная строка в формате 'дд.мм.гггг чч:мм'
     """
-    return dt.replace(tzinfo=YEKATERINBURG_TZ).strftime("%d.%m.%Y %H:%M")
+    return from_timestamp(ts, tz).strftime("%d.%m.%Y %H:%M")
+
+
+def fmt_recurrence(rule: str) -> str:
+    """
+    Форматирует правило повтора в человекочитаемую строку.
+
+    Args:
+        rule: Правило повтора ('daily@09:00', 'weekly:0@10:00')
+
+    Returns:
+        str: Строка вида 'каждый день в 09:00' или 'по понедельникам в 10:00'
+    """
+    kind, time_part = rule.split("@")
+    if kind == "daily":
+        return f"каждый день в {time_part}"
+    weekday = int(kind.split(":")[1])
+    return f"по {_WEEKDAYS_PLURAL[weekday]} в {time_part}"
 
 
 def is_admin(user_id: int) -> bool:
@@ -1,8 +1,21 @@
 import re
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 
-from bot.core.utils.timezone import YEKATERINBURG_TZ
+from bot.core.clock import clock
+from bot.core.utils.timezone import DEFAULT_TZ
+
+
+_WEEKDAY_STEMS = (
+    ("понедельн", 0),
+    ("вторн", 1),
+    ("сред", 2),
+    ("четверг", 3),
+    ("пятниц", 4),
+    ("суббот", 5),
+    ("воскресен", 6),
+)
 
 
 def _parse_relative_time(
@@ -13,6 +26,10 @@ def _parse_relative_time(
     """
     Парсит относительное время (через X минут/часов/дней).
 
+    Смещение прибавляется в UTC, а результат переводится обратно
+    в зону now: сложение в зоне пользователя сдвигает местное время
+    и ошибается на час при переходе на летнее время и обратно.
+
     Args:
         value: Числовое значение (количество единиц времени)
         unit: Единица времени ('минут', 'час', 'день' и т.д.)
@@ -23,12 +40,14 @@ def _parse_relative_time(
     """
     unit_lower = unit.lower()
     if "мин" in unit_lower:
-        return now + timedelta(minutes=value)
+        delta = timedelta(minutes=value)
     elif "час" in unit_lower:
-        return now + timedelta(hours=value)
-    elif "дн" in unit_lower:
-        return now + timedelta(days=value)
-    return None
+        delta = timedelta(hours=value)
+    elif unit_lower.startswith("д"):
+        delta = timedelta(days=value)
+    else:
+        return None
+    return (now.astimezone(timezone.utc) + delta).astimezone(now.tzinfo)
 
 
 def _parse_absolute_time(
@@ -64,14 +83,14 @@ def _parse_absolute_time(
             result_time = datetime(
                 year=int(year), month=int(month), day=int(day),
                 hour=int(hours), minute=int(minutes), second=0, microsecond=0,
-                tzinfo=YEKATERINBURG_TZ
+                tzinfo=now.tzinfo
             )
         elif day and month:
             current_year = now.year
             result_time = datetime(
                 year=current_year, month=int(month), day=int(day),
                 hour=int(hours), minute=int(minutes), second=0, microsecond=0,
-                tzinfo=YEKATERINBURG_TZ
+                tzinfo=now.tzinfo
             )
             if result_time < now:
                 result_time = result_time.replace(year=current_year + 1)
@@ -94,7 +113,8 @@ def _parse_absolute_time(
 
 def _parse_time_patterns(
     text: str,
-    include_reminder_text: bool = True
+    include_reminder_text: bool = True,
+    tz: ZoneInfo = DEFAULT_TZ
 ) -> Union[Tuple[Optional[datetime], Optional[str]], Optional[datetime]]:
     """
     Основная функция парсинга с поддержкой обоих режимов.
@@ -108,15 +128,18 @@ def _parse_time_patterns(
         text: Текст для парсинга
         include_reminder_text: Если True - возвращает время и текст,
                               если False - возвращает только время
+        tz: Временная зона, в которой пользователь указывает время
 
     Returns:
         Union[Tuple[Optional[datetime], Optional[str]], Optional[datetime]]:
         - Если include_reminder_text=True: кортеж (время, текст_напоминания)
         - Если include_reminder_text=False: время или None
     """
-    now = datetime.now(YEKATERINBURG_TZ)
+    now = clock.now(tz)
     text = text.strip()
 
+    # Более конкретные шаблоны идут раньше: иначе «в HH:MM» нашелся бы
+    # внутри «завтра в 10:00» или «20.12 в 15:00».
     patterns = [
         {
             'pattern': (
@@ -131,24 +154,27 @@ def _parse_time_patterns(
         },
         {
             'pattern': (
-                r"в\s+(\d{1,2}):(\d{2})" +
+                r"(\d{1,2})\.(\d{1,2})\.(\d{4})\s+в\s+(\d{1,2}):(\d{2})" +
                 (r"\s+(.+)" if include_reminder_text else "")
             ),
             'handler': lambda m: (
-                _parse_absolute_time(hours=m[1], minutes=m[2], now=now),
-                m[3] if include_reminder_text else None
+                _parse_absolute_time(
+                    day=m[1], month=m[2], year=m[3], hours=m[4], minutes=m[5],
+                    now=now
+                ),
+                m[6] if include_reminder_text else None
             )
         },
         {
             'pattern': (
-                r"завтра\s+в\s+(\d{1,2}):(\d{2})" +
+                r"(\d{1,2})\.(\d{1,2})\s+в\s+(\d{1,2}):(\d{2})" +
                 (r"\s+(.+)" if include_reminder_text else "")
             ),
             'handler': lambda m: (
                 _parse_absolute_time(
-                    hours=m[1], minutes=m[2], now=now, days_offset=1
+                    day=m[1], month=m[2], hours=m[3], minutes=m[4], now=now
                 ),
-                m[3] if include_reminder_text else None
+                m[5] if include_reminder_text else None
             )
         },
         {
@@ -165,27 +191,24 @@ def _parse_time_patterns(
         },
         {
             'pattern': (
-                r"(\d{1,2})\.(\d{1,2})\.(\d{4})\s+в\s+(\d{1,2}):(\d{2})" +
+                r"завтра\s+в\s+(\d{1,2}):(\d{2})" +
                 (r"\s+(.+)" if include_reminder_text else "")
             ),
             'handler': lambda m: (
                 _parse_absolute_time(
-                    day=m[1], month=m[2], year=m[3], hours=m[4], minutes=m[5],
-                    now=now
+                    hours=m[1], minutes=m[2], now=now, days_offset=1
                 ),
-                m[6] if include_reminder_text else None
+                m[3] if include_reminder_text else None
             )
         },
         {
             'pattern': (
-                r"(\d{1,2})\.(\d{1,2})\s+в\s+(\d{1,2}):(\d{2})" +
+                r"в\s+(\d{1,2}):(\d{2})" +
                 (r"\s+(.+)" if include_reminder_text else "")
             ),
             'handler': lambda m: (
-                _parse_absolute_time(
-                    day=m[1], month=m[2], hours=m[3], minutes=m[4], now=now
-                ),
-                m[5] if include_reminder_text else None
+                _parse_absolute_time(hours=m[1], minutes=m[2], now=now),
+                m[3] if include_reminder_text else None
             )
         }
     ]
@@ -203,22 +226,29 @@ def _parse_time_patterns(
     return (None, None) if include_reminder_text else None
 
 
-def parse_reminder_time(text: str) -> Tuple[Optional[datetime], Optional[str]]:
+def parse_reminder_time(
+    text: str,
+    tz: ZoneInfo = DEFAULT_TZ
+) -> Tuple[Optional[datetime], Optional[str]]:
     """
     Парсит текст напоминания и возвращает время и текст.
 
     Args:
         text: Текст напоминания с указанием времени
+        tz: Временная зона пользователя
 
     Returns:
         Tuple[Optional[datetime], Optional[str]]:
         Кортеж (время_напоминания, текст_напоминания)
         или (None, None) при ошибке
     """
-    return _parse_time_patterns(text, include_reminder_text=True)
+    return _parse_time_patterns(text, include_reminder_text=True, tz=tz)
 
 
-def parse_reminder_again(text: str) -> Optional[datetime]:
+def parse_reminder_again(
+    text: str,
+    tz: ZoneInfo = DEFAULT_TZ
+) -> Optional[datetime]:
     """
     Парсит только время для повторного напоминания.
 
@@ -227,8 +257,113 @@ def parse_reminder_again(text: str) -> Optional[datetime]:
 
     Args:
         text: Текст с указанием времени (например, "через 10 минут")
+        tz: Временная зона пользователя
 
     Returns:
         Optional[datetime]: Время напоминания или None при ошибке
     """
-    return _parse_time_patterns(text, include_reminder_text=False)
+    return _parse_time_patterns(text, include_reminder_text=False, tz=tz)
+
+
+def _parse_weekday(word: str) -> Optional[int]:
+    """
+    Определяет день недели по слову в любой падежной форме.
+
+    Args:
+        word: Слово вроде 'понедельникам', 'среду', 'воскресенье'
+
+    Returns:
+        Optional[int]: Номер дня недели (0 - понедельник) или None
+    """
+    word = word.lower()
+    for stem, weekday in _WEEKDAY_STEMS:
+        if word.startswith(stem):
+            return weekday
+    return None
+
+
+def next_occurrence(rule: str, after: datetime) -> Optional[datetime]:
+    """
+    Вычисляет ближайшее срабатывание правила повтора строго после `after`.
+
+    Поддерживаемые правила:
+    - "daily@ЧЧ:ММ" - каждый день в указанное время
+    - "weekly:N@ЧЧ:ММ" - раз в неделю, N - день недели (0 - понедельник)
+
+    Args:
+        rule: Правило повтора
+        after: Момент, после которого ищется срабатывание
+               (время вычисляется в его временной зоне)
+
+    Returns:
+        Optional[datetime]: Время следующего срабатывания
+        или None, если правило некорректно
+    """
+    try:
+        kind, time_part = rule.split("@")
+        hours, minutes = (int(x) for x in time_part.split(":"))
+        weekday = None
+        if kind.startswith("weekly:"):
+            weekday = int(kind.split(":")[1])
+        if kind != "daily" and weekday not in range(7):
+            return None
+        candidate = after.replace(
+            hour=hours, minute=minutes, second=0, microsecond=0
+        )
+    except ValueError:
+        return None
+
+    if weekday is not None:
+        candidate += timedelta(days=(weekday - candidate.weekday()) % 7)
+    if candidate <= after:
+        candidate += timedelta(days=1 if weekday is None else 7)
+    return candidate
+
+
+def parse_recurring_reminder(
+    text: str,
+    tz: ZoneInfo = DEFAULT_TZ
+) -> Tuple[Optional[datetime], Optional[str], Optional[str]]:
+    """
+    Парсит повторяющееся напоминание.
+
+    Распознает форматы:
+    - "каждый день в 9:00 зарядка", "ежедневно в 9:00 зарядка"
+    - "по понедельникам в 10:00 планёрка", "каждую среду в 19:00 спорт"
+
+    Args:
+        text: Текст напоминания с правилом повтора
+        tz: Временная зона пользователя
+
+    Returns:
+        Tuple[Optional[datetime], Optional[str], Optional[str]]:
+        Кортеж (первое_срабатывание, текст_напоминания, правило)
+        или (None, None, None), если текст не описывает повтор
+    """
+    now = clock.now(tz)
+    text = text.strip()
+
+    match = re.match(
+        r"(?:каждый\s+день|ежедневно)\s+в\s+(\d{1,2}):(\d{2})\s+(.+)",
+        text,
+        re.IGNORECASE
+    )
+    if match:
+        rule = f"daily@{int(match[1]):02d}:{match[2]}"
+        reminder_text = match[3]
+    else:
+        match = re.match(
+            r"(?:по|кажд(?:ый|ую|ое))\s+(\w+)\s+в\s+(\d{1,2}):(\d{2})\s+(.+)",
+            text,
+            re.IGNORECASE
+        )
+        weekday = _parse_weekday(match[1]) if match else None
+        if weekday is None:
+            return None, None, None
+        rule = f"weekly:{weekday}@{int(match[2]):02d}:{match[3]}"
+        reminder_text = match[4]
+
+    remind_at = next_occurrence(rule, now)
+    if not remind_at:
+        return None, None, None
+    return remind_at, reminder_text, rule
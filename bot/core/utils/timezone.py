@@ -1,3 +1,75 @@
-from zoneinfo import ZoneInfo
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-YEKATERINBURG_TZ = ZoneInfo("Asia/Yekaterinburg")
+from bot.core.config import settings
+
+
+DEFAULT_TZ = ZoneInfo(settings.DEFAULT_TIMEZONE)
+
+
+@lru_cache(maxsize=256)
+def get_timezone(name: Optional[str]) -> ZoneInfo:
+    """
+    Возвращает временную зону по имени IANA.
+
+    Args:
+        name: Имя зоны ('Europe/Moscow') или None
+
+    Returns:
+        ZoneInfo: Зона пользователя или зона по умолчанию,
+        если имя не задано либо неизвестно
+    """
+    if not name:
+        return DEFAULT_TZ
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return DEFAULT_TZ
+
+
+def is_valid_timezone(name: str) -> bool:
+    """
+    Проверяет, что строка является известным именем временной зоны IANA.
+
+    Args:
+        name: Имя зоны для проверки
+
+    Returns:
+        bool: True если зона существует
+    """
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def to_timestamp(dt: datetime) -> int:
+    """
+    Переводит datetime с временной зоной в UTC epoch (секунды).
+
+    Args:
+        dt: Время с заполненным tzinfo
+
+    Returns:
+        int: Количество секунд с начала эпохи UTC
+    """
+    if dt.tzinfo is None:
+        raise ValueError("Ожидается datetime с временной зоной")
+    return int(dt.timestamp())
+
+
+def from_timestamp(ts: int, tz: ZoneInfo = DEFAULT_TZ) -> datetime:
+    """
+    Переводит UTC epoch в datetime в указанной временной зоне.
+
+    Args:
+        ts: Количество секунд с начала эпохи UTC
+        tz: Временная зона результата
+
+    Returns:
+        datetime: Время в зоне tz
+    """
+    return datetime.fromtimestamp(ts, tz)
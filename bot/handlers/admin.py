@@ -4,7 +4,12 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
 from bot.core.utils.helpers import fmt_datetime, is_admin
+from bot.core.utils.timezone import DEFAULT_TZ
+from bot.services.broadcasts import BroadcastService
+from bot.services.dead_letters import DeadLetterService
+from bot.services.delivery_log import DeliveryLogService
 from bot.services.reminders import ReminderService
+from bot.services.stats import StatsService
 from bot.services.users import UserService
 
 
@@ -20,7 +25,7 @@ class BlockUser(StatesGroup):
 @router.message(Command("admin"))
 async def admin_panel(message: types.Message):
     """Показывает админ-панель с доступными командами."""
-    if not is_admin(message.fro_user.id):
+    if not is_admin(message.from_user.id):
         await message.answer("❌ Доступ запрещен")
         return
 
@@ -28,11 +33,62 @@ async def admin_panel(message: types.Message):
         "👨‍💼 Админ панель:\n\n"
         "/admin_users - список пользователей\n"
         "/admin_reminders - все напоминания\n"
+        "/stats - статистика\n"
         "/block_user - заблокировать пользователя\n"
-        "/unblock_user - разблокировать пользователя"
+        "/unblock_user - разблокировать пользователя\n"
+        "/broadcast ТЕКСТ - рассылка всем пользователям\n"
+        "/broadcast_resume - продолжить прерванные рассылки\n"
+        "/dead_letters - недоставленные напоминания\n"
+        "/dead_letters_replay - повторить недоставленные\n"
+        "/deliveries USER_ID [REMINDER_ID] - журнал доставок"
     )
 
 
+@router.message(Command("stats"))
+async def stats(message: types.Message):
+    """Показывает сводку по напоминаниям, пользователям и доставкам."""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ запрещен")
+        return
+
+    result = await StatsService.get_stats()
+    counters = result.counters
+    users_total = counters.get("users_total", 0)
+    users_blocked = counters.get("users_blocked", 0)
+    due = result.due_by_hour
+
+    text = (
+        "📊 Статистика\n\n"
+        "Напоминания:\n"
+        f"⏳ Активные: {counters.get('reminders_pending', 0)} "
+        f"(повторяющиеся: {counters.get('reminders_recurring', 0)})\n"
+        f"✅ Отправленные: {counters.get('reminders_sent', 0)}\n\n"
+        f"Сработают в ближайший час: {due[0]}\n"
+        f"Сработают в ближайшие сутки: {sum(due)}\n"
+    )
+    peak = max(due) or 1
+    for hour, count in enumerate(due):
+        bar = "█" * round(count * 10 / peak)
+        text += f"+{hour}ч {bar} {count}\n"
+
+    text += (
+        "\nПользователи:\n"
+        f"✅ Активные: {users_total - users_blocked}\n"
+        f"🚫 Заблокированные: {users_blocked}\n"
+        f"📵 Недоступные: {counters.get('users_unreachable', 0)}\n"
+    )
+    if result.deliveries is not None:
+        deliveries = result.deliveries
+        text += (
+            "\nДоставки:\n"
+            f"За последнюю минуту: {deliveries[0]}\n"
+            f"В среднем за 15 минут: {sum(deliveries[:15]) / 15:.1f}/мин\n"
+            f"За час: {sum(deliveries)}"
+        )
+
+    await message.answer(text)
+
+
 @router.message(Command("admin_users"))
 async def admin_users(message: types.Message):
     """Показывает список всех пользователей бота."""
@@ -49,7 +105,7 @@ async def admin_users(message: types.Message):
         text += f"Статус: {status}\n"
         if user.is_blocked:
             text += f"Причина: {user.reason or 'Не указана'}\n"
-        text += f"Напоминаний: {len(user.reminders)}\n\n"
+        text += f"Напоминаний: {user.reminders}\n\n"
 
     await message.answer(text)
 
@@ -67,9 +123,11 @@ async def admin_reminders(message: types.Message):
     for reminder in reminders:
         status = "✅ Отправлено" if reminder.is_sent else "⏰ Ожидает"
         text += f"ID: {reminder.id}\n"
-        text += f"Пользователь: {reminder.user.tg_id}\n"
+        text += f"Пользователь: {reminder.tg_id}\n"
         text += f"Текст: {reminder.text}\n"
-        text += f"Время: {fmt_datetime(reminder.remind_at)}\n"
+        text += (
+            f"Время: {fmt_datetime(reminder.remind_at)} ({DEFAULT_TZ.key})\n"
+        )
         text += f"Статус: {status}\n\n"
 
     await message.answer(text)
@@ -136,3 +194,123 @@ async def unblock_user(message: types.Message):
         await message.answer(f"✅ Пользователь {user_id} разблокирован")
     else:
         await message.answer("❌ Пользователь не найден или не заблокирован")
+
+
+@router.message(Command("broadcast"))
+async def broadcast(message: types.Message):
+    """Запускает рассылку сообщения всем незаблокированным пользователям."""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ запрещен")
+        return
+
+    parts = message.text.split(maxsplit=1)
+    if len(parts) < 2:
+        await message.answer("Используйте: /broadcast ТЕКСТ")
+        return
+
+    status = await message.answer("📣 Рассылка запускается...")
+    started = await BroadcastService.start_broadcast(
+        parts[1],
+        message.chat.id,
+        status.message_id
+    )
+    await message.answer(
+        f"✅ Рассылка #{started.id} поставлена в очередь. "
+        "Ход отображается в сообщении выше."
+    )
+
+
+@router.message(Command("broadcast_resume"))
+async def broadcast_resume(message: types.Message):
+    """Продолжает остановившиеся рассылки с места остановки."""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ запрещен")
+        return
+
+    broadcasts = await BroadcastService.resume_broadcasts()
+    if not broadcasts:
+        await message.answer(
+            "Остановившихся рассылок нет: идущие рассылки продолжаются сами"
+        )
+        return
+
+    await message.answer(
+        "🔄 Продолжены рассылки: "
+        + ", ".join(f"#{b.id} (курсор {b.cursor})" for b in broadcasts)
+    )
+
+
+@router.message(Command("dead_letters"))
+async def dead_letters(message: types.Message):
+    """Показывает напоминания, которые не удалось доставить."""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ запрещен")
+        return
+
+    result = await DeadLetterService.get_dead_letters()
+    if not result.total:
+        await message.answer("Недоставленных напоминаний нет")
+        return
+
+    text = f"📭 Недоставленные напоминания: {result.total}\n\n"
+    for letter in result.items:
+        text += f"ID: {letter.reminder_id}\n"
+        text += f"Пользователь: {letter.tg_id}\n"
+        text += f"Текст: {letter.text or 'Удалено'}\n"
+        text += (
+            f"Время: {fmt_datetime(letter.failed_at)} ({DEFAULT_TZ.key})\n"
+        )
+        text += f"Попыток: {letter.attempts}\n"
+        text += f"Ошибка: {letter.error[:200]}\n\n"
+    text += "/dead_letters_replay - повторить все"
+
+    await message.answer(text)
+
+
+@router.message(Command("dead_letters_replay"))
+async def dead_letters_replay(message: types.Message):
+    """Снова отправляет все недоставленные напоминания."""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ запрещен")
+        return
+
+    scheduled = await DeadLetterService.replay()
+    await message.answer(f"🔄 Снова запланировано напоминаний: {scheduled}")
+
+
+@router.message(Command("deliveries"))
+async def deliveries(message: types.Message):
+    """Показывает журнал доставок пользователю."""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Доступ запрещен")
+        return
+
+    try:
+        args = [int(arg) for arg in message.text.split()[1:3]]
+        user_id = args[0]
+    except (IndexError, ValueError):
+        await message.answer("Используйте: /deliveries USER_ID [REMINDER_ID]")
+        return
+    reminder_id = args[1] if len(args) > 1 else None
+
+    entries = await DeliveryLogService.get_deliveries(user_id, reminder_id)
+    if not entries:
+        await message.answer("Доставок не найдено")
+        return
+
+    outcomes = {
+        "sent": "✅ Доставлено",
+        "unreachable": "📵 Чат недоступен",
+        "error": "⚠️ Ошибка"
+    }
+    text = f"📬 Доставки пользователю {user_id}:\n\n"
+    for entry in entries:
+        text += f"Напоминание: {entry.reminder_id}\n"
+        text += (
+            f"Время: {fmt_datetime(entry.scheduled_at)} ({DEFAULT_TZ.key})\n"
+        )
+        text += f"Отправка: {fmt_datetime(entry.sent_at)}\n"
+        text += f"Задержка: {entry.latency_ms / 1000:.1f} с\n"
+        text += f"Результат: {outcomes.get(entry.outcome, entry.outcome)}\n\n"
+
+    await message.answer(text)
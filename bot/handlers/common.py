@@ -1,6 +1,8 @@
 from aiogram import Router, types
 from aiogram.filters import Command
 
+from bot.core.utils.timezone import DEFAULT_TZ
+
 router = Router()
 
 
@@ -14,10 +16,12 @@ async def start_command(message: types.Message):
     """
     await message.answer(
         "👋 Привет! Я бот-напоминаний.\n\n"
-        "🕔 **Все время указывается по Екатеринбургу (UTC+5)**\n\n"
+        f"🕔 **По умолчанию время указывается в зоне {DEFAULT_TZ.key}**\n"
+        "Сменить часовой пояс: /timezone\n\n"
         "Команды:\n"
         "/new - создать напоминание\n"
         "/list - список напоминаний\n"
-        "/delete - удалить напоминание\n",
+        "/delete - удалить напоминание\n"
+        "/timezone - часовой пояс\n",
         parse_mode="Markdown"
     )
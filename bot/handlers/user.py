@@ -1,21 +1,41 @@
+import os
+import tempfile
+from typing import Optional
+
 from aiogram import Router, types, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 
-from bot.core.utils.parsers import parse_reminder_time, parse_reminder_again
-from bot.core.utils.helpers import fmt_datetime
+from bot.core.middlewares.quota import invalidate_pending
+from bot.core.utils.parsers import (
+    parse_recurring_reminder,
+    parse_reminder_again,
+    parse_reminder_time
+)
+from bot.core.utils.helpers import fmt_datetime, fmt_recurrence, is_admin
+from bot.keyboards.buttons import SNOOZE_PRESETS, pager_buttons
+from bot.keyboards.reply import inline_keyboard
+from bot.core.utils.timezone import (
+    get_timezone,
+    is_valid_timezone,
+    to_timestamp
+)
 from bot.services.users import UserService
 from bot.services.reminders import ReminderService
+from bot.services.transfer import TransferService
 
 
 router = Router()
 
+FIND_PAGE_SIZE = 5
+
 
 class ReminderStates(StatesGroup):
     """Состояния для управления напоминаниями."""
     waiting_for_reminder_text = State()
     waiting_for_reminder_to_delete = State()
+    waiting_for_import_file = State()
 
 
 class ReminderAgainStates(StatesGroup):
@@ -23,12 +43,44 @@ class ReminderAgainStates(StatesGroup):
     waiting_for_delay_text = State()
 
 
+@router.callback_query(F.data.startswith("snooze:"))
+async def snooze_callback(callback: types.CallbackQuery):
+    """
+    Обрабатывает кнопки '⏰ 5 минут / 1 час / 1 день'.
+
+    Задержка приходит в callback_data, поэтому без диалога FSM:
+    один UPDATE с проверкой владельца и одна постановка в очередь.
+    """
+    try:
+        _, reminder_id, delay = callback.data.split(":")
+        reminder_id, delay = int(reminder_id), int(delay)
+    except ValueError:
+        await callback.answer("❌ Некорректная кнопка.")
+        return
+    label = SNOOZE_PRESETS.get(delay)
+    if not label:
+        await callback.answer("❌ Неизвестный интервал.")
+        return
+
+    reminder = await ReminderService.snooze_reminder(
+        reminder_id,
+        callback.from_user.id,
+        delay
+    )
+    if not reminder:
+        await callback.answer("❌ Напоминание не найдено.")
+        return
+
+    ReminderService.schedule_reminder(reminder, callback.from_user.id)
+    await callback.answer(f"✅ Напомню через {label}")
+
+
 @router.callback_query(F.data.startswith("remind_again:"))
 async def remind_again_callback(
     callback: types.CallbackQuery,
     state: FSMContext
 ):
-    """Обрабатывает нажатие кнопки '🔁 Напомнить'."""
+    """Обрабатывает нажатие кнопки '🔁 Другое время'."""
     reminder_id = int(callback.data.split(":")[1])
     reminder = await ReminderService.get_reminder(reminder_id)
 
@@ -59,7 +111,9 @@ async def process_remind_again_delay(
     user_data = await state.get_data()
     reminder_id = user_data["reminder_id"]
 
-    remind_at = parse_reminder_again(message.text)
+    user = await UserService.get_user(message.from_user.id)
+    tz = get_timezone(user.timezone if user else None)
+    remind_at = parse_reminder_again(message.text, tz)
     if not remind_at:
         await message.answer(
             "❌ Не удалось распознать время. Пример:\n"
@@ -70,7 +124,7 @@ async def process_remind_again_delay(
 
     reminder = await ReminderService.update_reminder_time(
         reminder_id,
-        remind_at
+        to_timestamp(remind_at)
     )
     if not reminder:
         await message.answer("❌ Напоминание не найдено.")
@@ -81,7 +135,7 @@ async def process_remind_again_delay(
 
     await message.answer(
         f"✅ Хорошо! Напомню ещё раз.\n"
-        f"🕒 {fmt_datetime(remind_at)} (Екатеринбург)"
+        f"🕒 {fmt_datetime(reminder.remind_at, tz)} ({tz.key})"
     )
     await state.clear()
 
@@ -98,20 +152,34 @@ async def new_reminder(message: types.Message, state: FSMContext):
         "• `через 2 часа сделать домашку`\n"
         "• `в 18:30 позвонить маме`\n"
         "• `завтра в 10:00 встреча`\n"
-        "• `20.12 в 15:00 забрать посылку`\n\n"
-        "🕔 Я установлю напоминание по времени Екатеринбурга",
+        "• `20.12 в 15:00 забрать посылку`\n"
+        "• `каждый день в 9:00 зарядка`\n"
+        "• `по понедельникам в 10:00 планёрка`\n\n"
+        "🕔 Время указывается в вашем часовом поясе "
+        "(сменить: /timezone)",
         parse_mode="Markdown"
     )
     await state.set_state(ReminderStates.waiting_for_reminder_text)
 
 
-@router.message(ReminderStates.waiting_for_reminder_text)
+@router.message(
+    ReminderStates.waiting_for_reminder_text,
+    flags={"creates_reminder": True}
+)
 async def process_reminder_text(message: types.Message, state: FSMContext):
     """
     Обрабатывает текст напоминания и создает его.
+
+    Returns:
+        int: Число созданных напоминаний для CreationQuotaMiddleware
     """
     text = message.text.strip()
-    remind_at, reminder_text = parse_reminder_time(text)
+    user = await UserService.ensure_user_exists(message.from_user.id)
+    tz = get_timezone(user.timezone)
+
+    remind_at, reminder_text, recurrence = parse_recurring_reminder(text, tz)
+    if not remind_at:
+        remind_at, reminder_text = parse_reminder_time(text, tz)
 
     if not remind_at or not reminder_text:
         await message.answer(
@@ -122,27 +190,33 @@ async def process_reminder_text(message: types.Message, state: FSMContext):
             "• `через 2 часа сделать домашку`\n"
             "• `в 18:30 позвонить маме`\n"
             "• `завтра в 10:00 встреча`\n"
-            "• `20.12 в 15:00 забрать посылку`",
+            "• `20.12 в 15:00 забрать посылку`\n"
+            "• `каждый день в 9:00 зарядка`",
             parse_mode="Markdown"
         )
-        return
+        return 0
 
-    user = await UserService.ensure_user_exists(message.from_user.id)
     reminder = await ReminderService.create_reminder(
         user.id,
         reminder_text,
-        remind_at
+        to_timestamp(remind_at),
+        recurrence
     )
     ReminderService.schedule_reminder(reminder, message.from_user.id)
 
+    repeat_line = (
+        f"🔁 **Повтор:** {fmt_recurrence(recurrence)}\n" if recurrence else ""
+    )
     await message.answer(
         f"✅ Напоминание установлено на:\n"
-        f"🕔 **{fmt_datetime(remind_at)}** (время Екатеринбурга)\n\n"
+        f"🕔 **{fmt_datetime(reminder.remind_at, tz)}** ({tz.key})\n"
+        f"{repeat_line}\n"
         f"📝 **Текст:** {reminder_text}",
         parse_mode="Markdown"
     )
 
     await state.clear()
+    return 1
 
 
 @router.message(Command("list"))
@@ -160,13 +234,89 @@ async def list_reminders(message: types.Message):
         await message.answer("У вас пока нет активных напоминаний.")
         return
 
-    text = "📋 Ваши напоминания (время Екатеринбурга):\n\n"
+    tz = get_timezone(user.timezone)
+    text = f"📋 Ваши напоминания ({tz.key}):\n\n"
     for i, r in enumerate(reminders, 1):
-        text += f"{i}. {r.text}\n⏰ {fmt_datetime(r.remind_at)}\nID: {r.id}\n\n"
+        text += f"{i}. {r.text}\n⏰ {fmt_datetime(r.remind_at, tz)}\n"
+        if r.recurrence:
+            text += f"🔁 {fmt_recurrence(r.recurrence)}\n"
+        text += f"ID: {r.id}\n\n"
 
     await message.answer(text)
 
 
+async def _find_page(tg_id: int, phrase: str, page: int):
+    """
+    Готовит страницу результатов поиска.
+
+    Returns:
+        Tuple[str, Optional[InlineKeyboardMarkup]]: Текст и кнопки
+    """
+    user = await UserService.get_user(tg_id)
+    if not user:
+        return "У вас пока нет напоминаний.", None
+
+    # Одна лишняя запись показывает, есть ли следующая страница.
+    reminders = await ReminderService.search_reminders(
+        user.id, phrase, FIND_PAGE_SIZE + 1, page * FIND_PAGE_SIZE
+    )
+    has_next = len(reminders) > FIND_PAGE_SIZE
+    reminders = reminders[:FIND_PAGE_SIZE]
+    if not reminders:
+        return "🔍 Ничего не найдено.", None
+
+    tz = get_timezone(user.timezone)
+    text = f"🔍 Найдено по запросу «{phrase}», страница {page + 1}:\n\n"
+    for i, r in enumerate(reminders, page * FIND_PAGE_SIZE + 1):
+        text += f"{i}. {r.text}\n⏰ {fmt_datetime(r.remind_at, tz)}\n"
+        if r.recurrence:
+            text += f"🔁 {fmt_recurrence(r.recurrence)}\n"
+        text += f"ID: {r.id}\n\n"
+
+    buttons = pager_buttons("find", page, has_next)
+    return text, inline_keyboard(buttons) if buttons else None
+
+
+@router.message(Command("find"))
+async def find_reminders(message: types.Message, state: FSMContext):
+    """
+    Ищет активные напоминания пользователя по словам из текста.
+
+    Запрос сохраняется в данных FSM, чтобы кнопки страниц
+    не передавали его в callback_data.
+    """
+    parts = message.text.split(maxsplit=1)
+    if len(parts) < 2:
+        await message.answer("Используйте: /find СЛОВА")
+        return
+
+    await state.update_data(find_query=parts[1])
+    text, markup = await _find_page(message.from_user.id, parts[1], 0)
+    await message.answer(text, reply_markup=markup)
+
+
+@router.callback_query(F.data.startswith("find:"))
+async def find_page_callback(
+    callback: types.CallbackQuery,
+    state: FSMContext
+):
+    """Показывает другую страницу результатов поиска."""
+    try:
+        _, page = callback.data.split(":")
+        page = max(0, int(page))
+    except ValueError:
+        await callback.answer("❌ Некорректная кнопка.")
+        return
+    phrase = (await state.get_data()).get("find_query")
+    if not phrase:
+        await callback.answer("❌ Повторите поиск командой /find.")
+        return
+
+    text, markup = await _find_page(callback.from_user.id, phrase, page)
+    await callback.message.edit_text(text, reply_markup=markup)
+    await callback.answer()
+
+
 @router.message(Command("delete"))
 async def delete_reminder_start(message: types.Message, state: FSMContext):
     """Показывает список и просит выбрать ID для удаления"""
@@ -180,9 +330,13 @@ async def delete_reminder_start(message: types.Message, state: FSMContext):
         await message.answer("Нет активных напоминаний для удаления.")
         return
 
-    text = "📋 Ваши напоминания (время Екатеринбурга):\n\n"
+    tz = get_timezone(user.timezone)
+    text = f"📋 Ваши напоминания ({tz.key}):\n\n"
     for i, r in enumerate(reminders, 1):
-        text += f"{i}. {r.text}\n⏰ {fmt_datetime(r.remind_at)}\nID: {r.id}\n\n"
+        text += f"{i}. {r.text}\n⏰ {fmt_datetime(r.remind_at, tz)}\n"
+        if r.recurrence:
+            text += f"🔁 {fmt_recurrence(r.recurrence)}\n"
+        text += f"ID: {r.id}\n\n"
 
     text += (
         "✏️ **Напишите номер ID напоминания, которое хотите удалить.**\n\n"
@@ -211,8 +365,131 @@ async def process_reminder_delete(message: types.Message, state: FSMContext):
         return
 
     if await ReminderService.delete_reminder(reminder_id):
+        await invalidate_pending(message.from_user.id)
         await message.answer(f"✅ Напоминание #{reminder_id} удалено.")
     else:
         await message.answer("❌ Напоминание не найдено.")
     await state.clear()
-    
\ No newline at end of file
+
+
+@router.message(Command("timezone"))
+async def set_timezone(message: types.Message):
+    """
+    Показывает или меняет часовой пояс пользователя.
+    """
+    user = await UserService.ensure_user_exists(message.from_user.id)
+    args = message.text.split(maxsplit=1)
+
+    if len(args) < 2:
+        await message.answer(
+            f"🕔 Ваш часовой пояс: {get_timezone(user.timezone).key}\n\n"
+            "Чтобы сменить, укажите зону IANA:\n"
+            "`/timezone Europe/Moscow`",
+            parse_mode="Markdown"
+        )
+        return
+
+    tz_name = args[1].strip()
+    if not is_valid_timezone(tz_name):
+        await message.answer(
+            "❌ Неизвестный часовой пояс. Пример: `Europe/Moscow`",
+            parse_mode="Markdown"
+        )
+        return
+
+    await UserService.set_timezone(message.from_user.id, tz_name)
+    await message.answer(f"✅ Часовой пояс изменен на {tz_name}")
+
+
+@router.message(Command("import"))
+async def import_start(message: types.Message, state: FSMContext):
+    """
+    Просит прислать файл для массового импорта напоминаний.
+    """
+    await message.answer(
+        "📥 Пришлите файл с напоминаниями:\n\n"
+        "• CSV с колонками `when,text`\n"
+        "• JSON Lines: `{\"when\": \"завтра в 10:00\", \"text\": \"...\"}`\n"
+        "• .txt - по одному напоминанию в строке, как для /new\n\n"
+        "Файл из /export подходит для импорта без изменений.",
+        parse_mode="Markdown"
+    )
+    await state.set_state(ReminderStates.waiting_for_import_file)
+
+
+@router.message(
+    ReminderStates.waiting_for_import_file,
+    F.document,
+    flags={"creates_reminder": True}
+)
+async def import_file(
+    message: types.Message,
+    state: FSMContext,
+    pending_quota_left: Optional[int] = None
+):
+    """
+    Импортирует напоминания из присланного файла.
+
+    Файл сохраняется во временный каталог и читается построчно.
+    Администратор может указать владельцев в колонке tg_id.
+    Пользователь может импортировать не больше остатка квоты
+    активных напоминаний.
+
+    Returns:
+        int: Число созданных напоминаний для CreationQuotaMiddleware
+    """
+    await state.clear()
+    await UserService.ensure_user_exists(message.from_user.id)
+
+    extension = os.path.splitext(message.document.file_name or "")[1]
+    fd, path = tempfile.mkstemp(suffix=extension.lower() or ".txt")
+    os.close(fd)
+    try:
+        await message.bot.download(message.document, destination=path)
+        result = await TransferService.import_file(
+            path,
+            message.from_user.id,
+            allow_owner=is_admin(message.from_user.id),
+            limit=pending_quota_left
+        )
+    finally:
+        os.remove(path)
+    await invalidate_pending(message.from_user.id)
+
+    text = (
+        f"✅ Импортировано: {result.imported}\n"
+        f"⚠️ Пропущено: {result.skipped}"
+    )
+    if result.errors:
+        lines = ", ".join(str(line) for line in result.errors)
+        text += f"\nНе распознаны строки: {lines}"
+    await message.answer(text)
+    return result.imported
+
+
+@router.message(Command("export"))
+async def export_reminders(message: types.Message):
+    """
+    Выгружает активные напоминания пользователя в CSV.
+
+    Администратор командой `/export all` получает напоминания
+    всех пользователей с колонкой tg_id.
+    """
+    args = message.text.split()
+    export_all = (
+        len(args) > 1 and args[1] == "all" and is_admin(message.from_user.id)
+    )
+    user = None
+    if not export_all:
+        user = await UserService.get_user(message.from_user.id)
+        if not user:
+            await message.answer("У вас пока нет напоминаний.")
+            return
+
+    path = await TransferService.export_file(user.id if user else None)
+    try:
+        await message.answer_document(
+            types.FSInputFile(path, filename="reminders.csv")
+        )
+    finally:
+        os.remove(path)
@@ -0,0 +1,81 @@
+from typing import List, Tuple
+
+
+Button = Tuple[str, str]
+
+# Варианты отложить напоминание одним нажатием: задержка в секундах
+# и подпись. Задержка передается в callback_data, поэтому обработчик
+# принимает только значения из этого словаря.
+SNOOZE_PRESETS = {
+    300: "5 минут",
+    3600: "1 час",
+    86400: "1 день",
+}
+
+
+def reminder_buttons(reminder_id: int) -> List[List[Button]]:
+    """
+    Описывает кнопки под отправленным напоминанием.
+
+    Модуль не зависит от aiogram: раскладку использует и бот,
+    и тонкий клиент воркера.
+
+    Args:
+        reminder_id: ID напоминания для callback_data
+
+    Returns:
+        List[List[Button]]: Ряды кнопок (текст, callback_data)
+    """
+    return [
+        [
+            (f"⏰ {label}", f"snooze:{reminder_id}:{delay}")
+            for delay, label in SNOOZE_PRESETS.items()
+        ],
+        [("🔁 Другое время", f"remind_again:{reminder_id}")],
+    ]
+
+
+def coalesced_buttons(reminder_ids: List[int]) -> List[List[Button]]:
+    """
+    Описывает кнопки под сообщением с несколькими напоминаниями.
+
+    Для каждого напоминания - свой ряд кнопок «отложить»,
+    подписанный номером пункта в сообщении.
+
+    Args:
+        reminder_ids: ID напоминаний в порядке пунктов сообщения
+
+    Returns:
+        List[List[Button]]: Ряды кнопок (текст, callback_data)
+    """
+    return [
+        [
+            (f"{number} · {label}", f"snooze:{reminder_id}:{delay}")
+            for delay, label in SNOOZE_PRESETS.items()
+        ]
+        for number, reminder_id in enumerate(reminder_ids, 1)
+    ]
+
+
+def pager_buttons(
+    prefix: str,
+    page: int,
+    has_next: bool
+) -> List[List[Button]]:
+    """
+    Описывает кнопки перехода между страницами результатов.
+
+    Args:
+        prefix: Префикс callback_data, к нему добавляется номер страницы
+        page: Номер текущей страницы, с нуля
+        has_next: Есть ли следующая страница
+
+    Returns:
+        List[List[Button]]: Один ряд кнопок или пустой список
+    """
+    row = []
+    if page > 0:
+        row.append(("◀️ Назад", f"{prefix}:{page - 1}"))
+    if has_next:
+        row.append(("Дальше ▶️", f"{prefix}:{page + 1}"))
+    return [row] if row else []
@@ -1,5 +1,30 @@
+from typing import List
+
 from aiogram import types
 
+from bot.keyboards.buttons import Button, reminder_buttons
+
+
+def inline_keyboard(rows: List[List[Button]]) -> types.InlineKeyboardMarkup:
+    """
+    Создает инлайн-клавиатуру из описания кнопок.
+
+    Args:
+        rows: Ряды кнопок (текст, callback_data)
+
+    Returns:
+        types.InlineKeyboardMarkup: Готовая клавиатура
+    """
+    return types.InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                types.InlineKeyboardButton(text=text, callback_data=data)
+                for text, data in row
+            ]
+            for row in rows
+        ]
+    )
+
 
 def reply_keyboard(reminder_id: int) -> types.InlineKeyboardMarkup:
     """
@@ -11,14 +36,4 @@ def reply_keyboard(reminder_id: int) -> types.InlineKeyboardMarkup:
     Returns:
         types.InlineKeyboardMarkup: Готовая клавиатура с кнопкой
     """
-    keyboard = types.InlineKeyboardMarkup(
-                    inline_keyboard=[
-                        [
-                            types.InlineKeyboardButton(
-                                text="🔁 Повторить",
-                                callback_data=f"remind_again:{reminder_id}"
-                            )
-                        ]
-                    ]
-                )
-    return keyboard
+    return inline_keyboard(reminder_buttons(reminder_id))
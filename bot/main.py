@@ -1,11 +1,42 @@
 import asyncio
 
+from aiogram import Bot
 from aiogram.types import BotCommand
 
+from bot.core.config import settings
+from bot.core.health import HealthMonitor
 from bot.core.loader import bot, dp
 from bot.core.middlewares.block_check import BlockCheckMiddleware
+from bot.core.middlewares.drain import DrainMiddleware
+from bot.core.middlewares.quota import CreationQuotaMiddleware
+from bot.core.middlewares.tracing import TracingMiddleware
+from bot.core.redis import get_async_redis
+from bot.core.tracing import tracer
 from bot.handlers import admin, common, user
-from database.session import init_db
+from database.session import AsyncSessionLocal, init_db
+
+
+drain = DrainMiddleware()
+
+
+async def on_shutdown(bot: Bot):
+    """
+    Плавная остановка бота (SIGTERM, SIGINT).
+
+    Опрос к этому моменту уже остановлен. Обновления в обработке
+    получают SHUTDOWN_TIMEOUT_SECONDS на завершение, затем
+    обработанные подтверждаются в Telegram, чтобы после перезапуска
+    они не пришли снова, и выгружаются накопленные участки трасс.
+    """
+    if not await drain.wait(settings.SHUTDOWN_TIMEOUT_SECONDS):
+        print("BOT: Не все обновления обработаны до остановки")
+    offset = drain.offset()
+    if offset is not None:
+        try:
+            await bot.get_updates(offset=offset, limit=1, timeout=0)
+        except Exception as e:
+            print(f"BOT: Ошибка подтверждения обновлений: {e!r}")
+    tracer.flush()
 
 
 async def main():
@@ -13,9 +44,15 @@ async def main():
     Основная функция запуска бота.
 
     Инициализирует middleware, регистрирует роутеры,
-    устанавливает команды бота и запускает опрос сервера.
+    устанавливает команды бота, поднимает сервер проверок
+    состояния и запускает опрос сервера.
     """
+    dp.update.outer_middleware(drain)
+    dp.update.outer_middleware(TracingMiddleware())
+    dp.message.middleware(TracingMiddleware())
+    dp.callback_query.middleware(TracingMiddleware())
     dp.message.middleware(BlockCheckMiddleware())
+    dp.message.middleware(CreationQuotaMiddleware())
 
     dp.include_router(common.router)
     dp.include_router(user.router)
@@ -25,11 +62,23 @@ async def main():
         BotCommand(command="start", description="Начать"),
         BotCommand(command="new", description="Создать напоминание"),
         BotCommand(command="list", description="Список напоминаний"),
+        BotCommand(command="find", description="Поиск напоминаний"),
         BotCommand(command="delete", description="Удалить напоминание"),
+        BotCommand(command="timezone", description="Часовой пояс"),
+        BotCommand(command="import", description="Импорт из файла"),
+        BotCommand(command="export", description="Выгрузка в CSV"),
     ])
 
     await init_db()
 
+    if settings.BOT_HEALTH_PORT:
+        await HealthMonitor(
+            "bot",
+            lambda: AsyncSessionLocal,
+            lambda: get_async_redis() if settings.REDIS_URL else None
+        ).start(settings.HEALTH_HOST, settings.BOT_HEALTH_PORT)
+
+    dp.shutdown.register(on_shutdown)
     await dp.start_polling(bot)
 
 if __name__ == "__main__":
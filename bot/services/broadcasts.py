@@ -0,0 +1,94 @@
+import uuid
+from typing import List
+
+from dramatiq import Message
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import BROADCAST_OWNER_KEY, get_async_redis
+from database.crud import broadcasts as broadcast_crud
+from database.models import Broadcast
+from database.session import AsyncSessionLocal
+from worker.broker import broker
+
+
+def _enqueue_batch(broadcast_id: int, token: str):
+    """Ставит в очередь пачку рассылки для цепочки token."""
+    # Сообщение собирается без объекта задачи, как в DramatiqScheduler:
+    # бот ставит задачи воркера, не импортируя worker.tasks.
+    broker.enqueue(Message(
+        queue_name="default",
+        actor_name="process_broadcast",
+        args=(broadcast_id, token),
+        kwargs={},
+        options={}
+    ))
+
+
+class BroadcastService:
+    """Сервис для рассылок всем пользователям."""
+
+    @staticmethod
+    async def start_broadcast(
+        text: str,
+        admin_chat_id: int,
+        status_message_id: int
+    ) -> Broadcast:
+        """
+        Создает рассылку и ставит в очередь первую пачку.
+
+        Args:
+            text: Текст рассылки
+            admin_chat_id: Чат администратора
+            status_message_id: ID сообщения, в котором показывается ход
+
+        Returns:
+            Broadcast: Созданная рассылка
+        """
+        async with AsyncSessionLocal() as db:
+            broadcast = await broadcast_crud.create_broadcast(
+                db,
+                text,
+                admin_chat_id,
+                status_message_id,
+                int(clock.time())
+            )
+        token = uuid.uuid4().hex
+        await get_async_redis().set(
+            BROADCAST_OWNER_KEY.format(broadcast_id=broadcast.id),
+            token,
+            ex=settings.BROADCAST_STALE_SECONDS
+        )
+        _enqueue_batch(broadcast.id, token)
+        return broadcast
+
+    @staticmethod
+    async def resume_broadcasts() -> List[Broadcast]:
+        """
+        Возобновляет остановившиеся рассылки с сохраненного курсора.
+
+        Рассылка, цепочка которой еще идет (владелец в Redis продлен
+        за последние BROADCAST_STALE_SECONDS), пропускается: вторая
+        цепочка отправляла бы те же пачки. Возобновленная цепочка
+        получает новый токен, и старая, если ее повтор все же
+        выполнится, останавливается.
+
+        Returns:
+            List[Broadcast]: Возобновленные рассылки
+        """
+        async with AsyncSessionLocal() as db:
+            broadcasts = await broadcast_crud.get_unfinished_broadcasts(db)
+        client = get_async_redis()
+        resumed = []
+        for broadcast in broadcasts:
+            token = uuid.uuid4().hex
+            taken = await client.set(
+                BROADCAST_OWNER_KEY.format(broadcast_id=broadcast.id),
+                token,
+                nx=True,
+                ex=settings.BROADCAST_STALE_SECONDS
+            )
+            if taken:
+                _enqueue_batch(broadcast.id, token)
+                resumed.append(broadcast)
+        return resumed
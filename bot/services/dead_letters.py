@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import List
+
+from bot.services.reminders import ReminderService
+from database.crud import dead_letters as dead_letter_crud
+from database.session import AsyncSessionLocal
+from database.views import DeadLetterItem
+
+
+@dataclass
+class DeadLetters:
+    """Недоставленные напоминания для администратора."""
+    total: int
+    # Последние записи, самые новые первыми.
+    items: List[DeadLetterItem]
+
+
+class DeadLetterService:
+    """Сервис недоставленных напоминаний."""
+
+    @staticmethod
+    async def get_dead_letters(limit: int = 20) -> DeadLetters:
+        """
+        Получает число и последние недоставленные напоминания.
+
+        Args:
+            limit: Сколько последних записей вернуть
+
+        Returns:
+            DeadLetters: Общее число и последние записи
+        """
+        async with AsyncSessionLocal() as db:
+            total = await dead_letter_crud.count_dead_letters(db)
+            items = await dead_letter_crud.list_dead_letters(db, limit)
+        return DeadLetters(total=total, items=items)
+
+    @staticmethod
+    async def replay() -> int:
+        """
+        Снова планирует все недоставленные напоминания.
+
+        Записи удаляются, а еще не отправленные напоминания доступных
+        пользователей отправляются сразу с новым счетчиком попыток.
+
+        Returns:
+            int: Сколько напоминаний запланировано
+        """
+        async with AsyncSessionLocal() as db:
+            rows = await dead_letter_crud.take_dead_letters(db)
+        return ReminderService.schedule_reminders(
+            ((row, row.tg_id) for row in rows),
+            include_overdue=True
+        )
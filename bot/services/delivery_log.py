@@ -0,0 +1,34 @@
+from typing import List, Optional
+
+from database.crud import delivery_log as delivery_log_crud
+from database.session import AsyncSessionLocal
+from database.views import DeliveryLogItem
+
+
+class DeliveryLogService:
+    """Сервис журнала доставок."""
+
+    @staticmethod
+    async def get_deliveries(
+        chat_id: int,
+        reminder_id: Optional[int] = None,
+        limit: int = 20
+    ) -> List[DeliveryLogItem]:
+        """
+        Получает последние попытки доставки пользователю.
+
+        Записи попадают в журнал пачками, поэтому последние
+        DELIVERY_LOG_FLUSH_SECONDS секунд могут быть еще не видны.
+
+        Args:
+            chat_id: ID пользователя в Telegram
+            reminder_id: Только попытки этого напоминания
+            limit: Максимальное количество записей
+
+        Returns:
+            List[DeliveryLogItem]: Записи, самые новые первыми
+        """
+        async with AsyncSessionLocal() as db:
+            return await delivery_log_crud.get_delivery_log(
+                db, chat_id, reminder_id, limit
+            )
@@ -1,11 +1,16 @@
-from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple, Union
 
-from bot.core.utils.timezone import YEKATERINBURG_TZ
+from sqlalchemy import Row
+
+from bot.core.clock import clock
+from bot.core.tracing import tracer
+from bot.core.utils.parsers import next_occurrence
+from bot.core.utils.timezone import get_timezone, to_timestamp
 from database.crud import reminders as reminder_crud
 from database.models import Reminder
 from database.session import AsyncSessionLocal
-from worker.tasks import send_reminder
+from database.views import AdminReminderItem, ReminderItem
+from worker.scheduler import get_scheduler
 
 
 class ReminderService:
@@ -15,7 +20,8 @@ class ReminderService:
     async def create_reminder(
         user_id: int,
         text: str,
-        remind_at: datetime
+        remind_at: int,
+        recurrence: Optional[str] = None
     ) -> Reminder:
         """
         Создает новое напоминание.
@@ -23,7 +29,8 @@ class ReminderService:
         Args:
             user_id: ID пользователя в базе данных
             text: Текст напоминания
-            remind_at: Время напоминания
+            remind_at: Время напоминания, UTC epoch
+            recurrence: Правило повтора или None для разового напоминания
 
         Returns:
             Reminder: Созданный объект напоминания
@@ -33,11 +40,12 @@ class ReminderService:
                 db,
                 user_id,
                 text,
-                remind_at
+                remind_at,
+                recurrence
             )
 
     @staticmethod
-    async def get_user_reminders(user_id: int) -> List[Reminder]:
+    async def get_user_reminders(user_id: int) -> List[ReminderItem]:
         """
         Получает все активные напоминания пользователя.
 
@@ -45,13 +53,51 @@ class ReminderService:
             user_id: ID пользователя в базе данных
 
         Returns:
-            List[Reminder]: Список активных напоминаний
+            List[ReminderItem]: Список активных напоминаний
+        """
+        async with AsyncSessionLocal() as db:
+            return await reminder_crud.list_pending_reminders(db, user_id)
+
+    @staticmethod
+    async def search_reminders(
+        user_id: int,
+        phrase: str,
+        limit: int,
+        offset: int = 0
+    ) -> List[ReminderItem]:
+        """
+        Ищет активные напоминания пользователя по словам.
+
+        Args:
+            user_id: ID пользователя в базе данных
+            phrase: Слова для поиска
+            limit: Максимальное количество записей
+            offset: Сколько записей пропустить
+
+        Returns:
+            List[ReminderItem]: Найденные напоминания по релевантности
+        """
+        async with AsyncSessionLocal() as db:
+            return await reminder_crud.search_reminders(
+                db, user_id, phrase, limit, offset
+            )
+
+    @staticmethod
+    async def count_pending(tg_id: int) -> int:
+        """
+        Считает активные напоминания пользователя.
+
+        Args:
+            tg_id: ID пользователя в Telegram
+
+        Returns:
+            int: Количество неотправленных напоминаний
         """
         async with AsyncSessionLocal() as db:
-            return await reminder_crud.get_pending_reminders(db, user_id)
+            return await reminder_crud.count_pending_reminders(db, tg_id)
 
     @staticmethod
-    async def get_reminder(reminder_id: int) -> Optional[Reminder]:
+    async def get_reminder(reminder_id: int) -> Optional[Row]:
         """
         Получает напоминание по ID.
 
@@ -59,7 +105,7 @@ class ReminderService:
             reminder_id: ID напоминания
 
         Returns:
-            Optional[Reminder]: Напоминание или None если не найдено
+            Optional[Row]: Строка напоминания или None если не найдено
         """
         async with AsyncSessionLocal() as db:
             return await reminder_crud.get_reminder(db, reminder_id)
@@ -76,18 +122,23 @@ class ReminderService:
             bool: True если удалено, False если не найдено
         """
         async with AsyncSessionLocal() as db:
-            return await reminder_crud.delete_reminder(db, reminder_id)
+            reminder = await reminder_crud.delete_reminder(db, reminder_id)
+        if reminder is None:
+            return False
+        get_scheduler().cancel(reminder.id, reminder.user_id)
+        return True
 
     @staticmethod
-    async def get_all_reminders() -> List[Reminder]:
+    async def get_all_reminders() -> List[AdminReminderItem]:
         """
         Получает все напоминания из базы данных.
 
         Returns:
-            List[Reminder]: Список всех напоминаний
+            List[AdminReminderItem]: Список всех напоминаний
+            с ID Telegram владельцев
         """
         async with AsyncSessionLocal() as db:
-            return await reminder_crud.get_all_reminders(db)
+            return await reminder_crud.list_all_reminders(db)
 
     @staticmethod
     async def mark_as_sent(reminder_id: int) -> bool:
@@ -106,14 +157,14 @@ class ReminderService:
     @staticmethod
     async def update_reminder_time(
         reminder_id: int,
-        remind_at: datetime
+        remind_at: int
     ) -> Optional[Reminder]:
         """
         Обновляет время напоминания.
 
         Args:
             reminder_id: ID напоминания
-            remind_at: Новое время напоминания
+            remind_at: Новое время напоминания, UTC epoch
 
         Returns:
             Optional[Reminder]: Обновленное напоминание или None,
@@ -127,23 +178,114 @@ class ReminderService:
             )
 
     @staticmethod
-    def schedule_reminder(reminder: Reminder, user_tg_id: int):
+    async def snooze_reminder(
+        reminder_id: int,
+        tg_id: int,
+        delay_seconds: int
+    ) -> Optional[Row]:
+        """
+        Откладывает напоминание пользователя на заданное время.
+
+        Args:
+            reminder_id: ID напоминания
+            tg_id: ID пользователя в Telegram
+            delay_seconds: Задержка от текущего момента, секунды
+
+        Returns:
+            Optional[Row]: Строка (id, user_id, text, remind_at) или None,
+            если напоминание не найдено
+        """
+        async with AsyncSessionLocal() as db:
+            return await reminder_crud.snooze_reminder(
+                db,
+                reminder_id,
+                tg_id,
+                int(clock.time()) + delay_seconds
+            )
+
+    @staticmethod
+    def schedule_reminder(reminder: Union[Reminder, Row], user_tg_id: int):
         """
-        Планирует отправку напоминания через Dramatiq.
+        Планирует отправку напоминания планировщиком SCHEDULER_BACKEND.
+
+        Перенос уже запланированного напоминания - тот же вызов.
 
         Args:
-            reminder: Объект напоминания
+            reminder: Объект напоминания или строка с полями
+                id, user_id, text и remind_at
             user_tg_id: ID пользователя в Telegram
         """
-        now = datetime.now(YEKATERINBURG_TZ)
-        remind_at = reminder.remind_at
-        if remind_at.tzinfo is None:
-            remind_at = remind_at.replace(tzinfo=YEKATERINBURG_TZ)
-
-        time_diff = remind_at - now
-        delay_seconds = max(0, time_diff.total_seconds())
-        if delay_seconds > 0:
-            send_reminder.send_with_options(
-                args=(reminder.id, user_tg_id, reminder.text),
-                delay=delay_seconds * 1000
+        if clock.delay(reminder.remind_at) > 0:
+            with tracer.span("scheduler.schedule", reminder_id=reminder.id):
+                get_scheduler().schedule([(reminder, user_tg_id)])
+
+    @staticmethod
+    def schedule_reminders(
+        reminders: Iterable[Tuple[Row, int]],
+        include_overdue: bool = False
+    ) -> int:
+        """
+        Планирует пачку напоминаний.
+
+        Все напоминания планируются внутри одного участка трассы
+        и через общий пул соединений Redis.
+
+        Args:
+            reminders: Пары (строка с полями id, user_id, text,
+                remind_at; ID пользователя в Telegram)
+            include_overdue: Отправить просроченные сразу,
+                а не пропускать их
+
+        Returns:
+            int: Сколько напоминаний запланировано
+        """
+        with tracer.span("scheduler.schedule_batch") as span:
+            scheduled = get_scheduler().schedule(
+                (reminder, user_tg_id)
+                for reminder, user_tg_id in reminders
+                if include_overdue or clock.delay(reminder.remind_at)
             )
+            span.set_attribute("count", scheduled)
+        return scheduled
+
+    @staticmethod
+    async def reschedule_pending(
+        user_id: int,
+        user_tg_id: int,
+        timezone: Optional[str]
+    ) -> int:
+        """
+        Заново планирует активные напоминания вернувшегося пользователя.
+
+        Пока пользователь был недоступен, сообщения из очереди
+        пропускались. Повторяющиеся напоминания переносятся на следующее
+        срабатывание, разовые просроченные отправляются сразу.
+
+        Args:
+            user_id: ID пользователя в базе данных
+            user_tg_id: ID пользователя в Telegram
+            timezone: Временная зона пользователя
+
+        Returns:
+            int: Сколько сообщений поставлено в очередь
+        """
+        tz = get_timezone(timezone)
+        now = clock.now(tz)
+        now_ts = now.timestamp()
+        async with AsyncSessionLocal() as db:
+            reminders = await reminder_crud.get_pending_reminders(db, user_id)
+            scheduled = []
+            for reminder in reminders:
+                if reminder.recurrence and reminder.remind_at < now_ts:
+                    next_at = next_occurrence(reminder.recurrence, now)
+                    if not next_at:
+                        continue
+                    reminder = await reminder_crud.update_reminder_time(
+                        db, reminder.id, to_timestamp(next_at)
+                    )
+                    if not reminder:
+                        continue
+                scheduled.append((reminder, user_tg_id))
+        return ReminderService.schedule_reminders(
+            scheduled, include_overdue=True
+        )
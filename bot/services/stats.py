@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import DELIVERIES_KEY, get_async_redis
+from database.crud import stats as stats_crud
+from database.session import AsyncSessionLocal
+
+
+HISTOGRAM_HOURS = 24
+
+
+@dataclass
+class Stats:
+    """Сводка для администратора."""
+    counters: Dict[str, int]
+    # Активные напоминания по часам от текущего момента.
+    due_by_hour: List[int]
+    # Доставки за каждую из последних завершенных минут, новые первыми;
+    # None, если Redis не используется.
+    deliveries: Optional[List[int]] = field(default=None)
+
+
+class StatsService:
+    """Сервис статистики для администратора."""
+
+    @staticmethod
+    async def get_stats() -> Stats:
+        """
+        Собирает статистику из заранее посчитанных счетчиков.
+
+        Итоги по статусам и гистограмма срабатываний читаются
+        из таблиц, которые поддерживают триггеры, а доставки -
+        из поминутных счетчиков Redis. Стоимость не зависит от числа
+        напоминаний; точность гистограммы - DUE_BUCKET_SECONDS.
+
+        Returns:
+            Stats: Счетчики, гистограмма и доставки по минутам
+        """
+        now = int(clock.time())
+        async with AsyncSessionLocal() as db:
+            counters = await stats_crud.get_counters(db)
+            buckets = await stats_crud.get_due_buckets(
+                db, now, now + HISTOGRAM_HOURS * 3600
+            )
+
+        due_by_hour = [0] * HISTOGRAM_HOURS
+        for start, pending in buckets:
+            hour = max(0, start - now) // 3600
+            if hour < HISTOGRAM_HOURS:
+                due_by_hour[hour] += pending
+
+        deliveries = None
+        if settings.REDIS_URL:
+            minute = now // 60
+            values = await get_async_redis().mget([
+                DELIVERIES_KEY.format(minute=minute - offset)
+                for offset in range(1, 61)
+            ])
+            deliveries = [int(value or 0) for value in values]
+
+        return Stats(counters, due_by_hour, deliveries)
@@ -0,0 +1,208 @@
+import asyncio
+import csv
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from bot.core.clock import clock
+from bot.core.utils.helpers import fmt_recurrence
+from bot.core.utils.parsers import (
+    parse_recurring_reminder,
+    parse_reminder_time
+)
+from bot.core.utils.timezone import (
+    from_timestamp,
+    get_timezone,
+    to_timestamp
+)
+from bot.services.reminders import ReminderService
+from database.crud import reminders as reminder_crud
+from database.crud import users as user_crud
+from database.session import AsyncSessionLocal
+
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_FIELDS = ["when", "text"]
+
+# Строка файла импорта: номер строки, tg_id владельца (если указан)
+# и фраза для парсера - время вместе с текстом напоминания.
+ImportRow = Tuple[int, Optional[int], str]
+
+
+@dataclass
+class ImportResult:
+    """Итог импорта файла."""
+    imported: int = 0
+    skipped: int = 0
+    errors: List[int] = field(default_factory=list)
+
+    def reject(self, line: int):
+        self.skipped += 1
+        if len(self.errors) < 10:
+            self.errors.append(line)
+
+
+def iter_import_rows(path: str) -> Iterator[ImportRow]:
+    """
+    Читает файл импорта построчно.
+
+    Поддерживаются CSV с колонками when и text (и tg_id для
+    администратора), JSON Lines с теми же ключами и обычный текст,
+    где каждая строка - фраза как для /new.
+
+    Args:
+        path: Путь к файлу
+
+    Yields:
+        ImportRow: (номер строки, tg_id или None, фраза для парсера)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if extension == ".csv":
+            for line, row in enumerate(csv.DictReader(f), 2):
+                yield line, row.get("tg_id"), _phrase(row)
+        elif extension in (".jsonl", ".json"):
+            for line, raw in enumerate(f, 1):
+                if not raw.strip():
+                    continue
+                try:
+                    row = json.loads(raw)
+                except ValueError:
+                    yield line, None, ""
+                    continue
+                yield line, row.get("tg_id"), _phrase(row)
+        else:
+            for line, raw in enumerate(f, 1):
+                if raw.strip():
+                    yield line, None, raw.strip()
+
+
+def _phrase(row: dict) -> str:
+    return f"{row.get('when') or ''} {row.get('text') or ''}".strip()
+
+
+class TransferService:
+    """Сервис для массового импорта и выгрузки напоминаний."""
+
+    @staticmethod
+    async def import_file(
+        path: str,
+        tg_id: int,
+        allow_owner: bool = False,
+        limit: Optional[int] = None
+    ) -> ImportResult:
+        """
+        Импортирует напоминания из файла.
+
+        Файл читается построчно, строки разбираются тем же парсером,
+        что и /new, и вставляются пачками по IMPORT_BATCH_SIZE
+        в отдельных транзакциях. Каждая пачка сразу планируется,
+        поэтому память не растет с размером файла.
+
+        Args:
+            path: Путь к загруженному файлу
+            tg_id: ID отправителя в Telegram
+            allow_owner: Учитывать колонку tg_id (для администратора)
+            limit: Сколько строк можно импортировать (остаток квоты
+                активных напоминаний); остальные пропускаются
+
+        Returns:
+            ImportResult: Число импортированных и пропущенных строк
+        """
+        result = ImportResult()
+        batch: List[ImportRow] = []
+        for line, owner, phrase in iter_import_rows(path):
+            if limit is not None and result.imported + len(batch) >= limit:
+                result.reject(line)
+                continue
+            try:
+                owner = int(owner) if allow_owner and owner else tg_id
+            except ValueError:
+                result.reject(line)
+                continue
+            batch.append((line, owner, phrase))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await TransferService._import_batch(batch, result)
+                batch = []
+        await TransferService._import_batch(batch, result)
+        return result
+
+    @staticmethod
+    async def _import_batch(batch: List[ImportRow], result: ImportResult):
+        if not batch:
+            return
+        now = clock.time()
+        async with AsyncSessionLocal() as db:
+            users = await user_crud.get_or_create_users(
+                db, {owner for _, owner, _ in batch}
+            )
+            rows = []
+            for line, owner, phrase in batch:
+                user_id, timezone = users[owner]
+                tz = get_timezone(timezone)
+                remind_at, text, recurrence = parse_recurring_reminder(
+                    phrase, tz
+                )
+                if not remind_at:
+                    remind_at, text = parse_reminder_time(phrase, tz)
+                if not remind_at or not text or remind_at.timestamp() <= now:
+                    result.reject(line)
+                    continue
+                rows.append({
+                    "user_id": user_id,
+                    "text": text,
+                    "remind_at": to_timestamp(remind_at),
+                    "recurrence": recurrence,
+                })
+            created = await reminder_crud.create_reminders(db, rows)
+
+        # Постановка в очередь - синхронные обращения к Redis: пачка
+        # уходит в поток, чтобы не задерживать цикл событий бота.
+        tg_ids = {user_id: owner for owner, (user_id, _) in users.items()}
+        await asyncio.to_thread(
+            ReminderService.schedule_reminders,
+            [(reminder, tg_ids[reminder.user_id]) for reminder in created]
+        )
+        result.imported += len(created)
+
+    @staticmethod
+    async def export_file(user_id: Optional[int] = None) -> str:
+        """
+        Выгружает активные напоминания в CSV во временный файл.
+
+        Строки читаются из базы потоком и сразу пишутся в файл.
+        Колонка when содержит фразу, которую понимает импорт: дату
+        во временной зоне владельца или правило повтора.
+
+        Args:
+            user_id: ID пользователя в базе или None для всех
+                (тогда добавляется колонка tg_id)
+
+        Returns:
+            str: Путь к CSV-файлу; удалить его должен вызывающий
+        """
+        fields = EXPORT_FIELDS if user_id is not None else (
+            ["tg_id"] + EXPORT_FIELDS
+        )
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            async with AsyncSessionLocal() as db:
+                rows = await reminder_crud.stream_pending_reminders(
+                    db, user_id
+                )
+                async for tg_id, timezone, text, remind_at, rule in rows:
+                    if rule:
+                        when = fmt_recurrence(rule)
+                    else:
+                        when = from_timestamp(
+                            remind_at, get_timezone(timezone)
+                        ).strftime("%d.%m.%Y в %H:%M")
+                    writer.writerow(
+                        [when, text] if user_id is not None
+                        else [tg_id, when, text]
+                    )
+        return path
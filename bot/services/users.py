@@ -1,15 +1,19 @@
 from typing import Optional
 
+from sqlalchemy import Row
+
+from bot.core.redis import UNREACHABLE_USERS_KEY, get_async_redis
 from database.session import AsyncSessionLocal
 from database.crud import users as user_crud
 from database.models import User
+from database.views import AdminUserItem
 
 
 class UserService:
     """Сервис для работы с пользователями."""
 
     @staticmethod
-    async def ensure_user_exists(tg_id: int) -> User:
+    async def ensure_user_exists(tg_id: int) -> Row | User:
         """
         Создает пользователя если не существует, иначе возвращает существующего
 
@@ -17,7 +21,8 @@ class UserService:
             tg_id: ID пользователя в Telegram
 
         Returns:
-            User: Объект пользователя
+            Row | User: Строка существующего пользователя
+            или созданный объект
         """
         async with AsyncSessionLocal() as db:
             user = await user_crud.get_user(db, tg_id)
@@ -26,7 +31,7 @@ class UserService:
             return user
 
     @staticmethod
-    async def get_user(tg_id: int) -> Optional[User]:
+    async def get_user(tg_id: int) -> Optional[Row]:
         """
         Получает пользователя по ID Telegram.
 
@@ -34,7 +39,8 @@ class UserService:
             tg_id: ID пользователя в Telegram
 
         Returns:
-            Optional[User]: Объект пользователя или None если не найден
+            Optional[Row]: Строка (id, tg_id, is_blocked, reason,
+            timezone, is_unreachable) или None если не найден
         """
         async with AsyncSessionLocal() as db:
             return await user_crud.get_user(db, tg_id)
@@ -87,12 +93,46 @@ class UserService:
             return await user_crud.unblock_user(db, tg_id)
 
     @staticmethod
-    async def get_all_users() -> list[User]:
+    async def set_timezone(tg_id: int, timezone: str) -> Optional[User]:
+        """
+        Устанавливает временную зону пользователя.
+
+        Args:
+            tg_id: ID пользователя в Telegram
+            timezone: Имя временной зоны IANA
+
+        Returns:
+            Optional[User]: Обновленный пользователь или None,
+            если не найден
+        """
+        async with AsyncSessionLocal() as db:
+            return await user_crud.set_timezone(db, tg_id, timezone)
+
+    @staticmethod
+    async def get_all_users() -> list[AdminUserItem]:
         """
         Получает всех пользователей из базы данных.
 
         Returns:
-            List[User]: Список всех пользователей
+            List[AdminUserItem]: Список всех пользователей
+            с числом их напоминаний
+        """
+        async with AsyncSessionLocal() as db:
+            return await user_crud.list_users(db)
+
+    @staticmethod
+    async def reactivate(tg_id: int) -> bool:
+        """
+        Снимает отметку недоступности с пользователя, написавшего боту.
+
+        Args:
+            tg_id: ID пользователя в Telegram
+
+        Returns:
+            bool: True если пользователь был недоступен
         """
         async with AsyncSessionLocal() as db:
-            return await user_crud.get_all_users(db)
+            reactivated = await user_crud.reactivate_user(db, tg_id)
+        if reactivated:
+            await get_async_redis().srem(UNREACHABLE_USERS_KEY, tg_id)
+        return reactivated
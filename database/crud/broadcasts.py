@@ -0,0 +1,121 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.core.tracing import traced_crud
+from database.models import Broadcast
+
+
+@traced_crud
+async def create_broadcast(
+    db: AsyncSession,
+    text: str,
+    admin_chat_id: int,
+    status_message_id: int | None,
+    started_at: int
+) -> Broadcast:
+    """
+    Создает рассылку.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        text: Текст рассылки
+        admin_chat_id: Чат администратора для отчета о ходе
+        status_message_id: ID сообщения с ходом рассылки
+        started_at: Время запуска, UTC epoch
+
+    Returns:
+        Broadcast: Созданная рассылка
+    """
+    broadcast = Broadcast(
+        text=text,
+        admin_chat_id=admin_chat_id,
+        status_message_id=status_message_id,
+        started_at=started_at
+    )
+    db.add(broadcast)
+    await db.commit()
+    await db.refresh(broadcast)
+    return broadcast
+
+
+@traced_crud
+async def get_broadcast(
+    db: AsyncSession,
+    broadcast_id: int
+) -> Broadcast | None:
+    """
+    Получает рассылку по ID.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        broadcast_id: ID рассылки
+
+    Returns:
+        Broadcast | None: Рассылка или None если не найдена
+    """
+    result = await db.execute(select(Broadcast).filter_by(id=broadcast_id))
+    return result.scalar_one_or_none()
+
+
+@traced_crud
+async def get_unfinished_broadcasts(db: AsyncSession) -> list[Broadcast]:
+    """
+    Получает незавершенные рассылки.
+
+    Args:
+        db: Асинхронная сессия базы данных
+
+    Returns:
+        List[Broadcast]: Рассылки без времени завершения
+    """
+    result = await db.execute(
+        select(Broadcast)
+        .filter(Broadcast.finished_at.is_(None))
+        .order_by(Broadcast.id)
+    )
+    return result.scalars().all()
+
+
+@traced_crud
+async def advance_broadcast(
+    db: AsyncSession,
+    broadcast_id: int,
+    cursor: int,
+    sent: int,
+    failed: int,
+    finished_at: int | None = None
+) -> Broadcast | None:
+    """
+    Сохраняет прогресс после обработанной пачки получателей.
+
+    Счетчики увеличиваются в самом UPDATE, курсор только растет,
+    поэтому повторная обработка пачки не отматывает прогресс назад.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        broadcast_id: ID рассылки
+        cursor: Последний обработанный users.id
+        sent: Сколько сообщений доставлено в пачке
+        failed: Сколько сообщений не доставлено в пачке
+        finished_at: Время завершения, если пачка последняя
+
+    Returns:
+        Broadcast | None: Обновленная рассылка или None если не найдена
+    """
+    await db.execute(
+        update(Broadcast)
+        .filter(Broadcast.id == broadcast_id, Broadcast.cursor < cursor)
+        .values(
+            cursor=cursor,
+            sent=Broadcast.sent + sent,
+            failed=Broadcast.failed + failed
+        )
+    )
+    if finished_at is not None:
+        await db.execute(
+            update(Broadcast)
+            .filter(Broadcast.id == broadcast_id)
+            .values(finished_at=finished_at)
+        )
+    await db.commit()
+    return await get_broadcast(db, broadcast_id)
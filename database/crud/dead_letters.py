@@ -0,0 +1,136 @@
+from sqlalchemy import Row, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.core.tracing import traced_crud
+from database.models import DeadLetter, Reminder, User
+from database.views import DeadLetterItem
+
+
+@traced_crud
+async def add_dead_letter(
+    db: AsyncSession,
+    reminder_id: int,
+    tg_id: int,
+    error: str,
+    attempts: int,
+    failed_at: int
+) -> DeadLetter:
+    """
+    Сохраняет недоставленное напоминание.
+
+    Повторная запись того же напоминания обновляет ошибку,
+    число попыток и время.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_id: ID напоминания
+        tg_id: ID пользователя в Telegram
+        error: Последняя ошибка
+        attempts: Сколько попыток доставки сделано
+        failed_at: Время последней попытки, UTC epoch
+
+    Returns:
+        DeadLetter: Сохраненная запись
+    """
+    letter = await db.scalar(
+        select(DeadLetter).filter(DeadLetter.reminder_id == reminder_id)
+    )
+    if letter is None:
+        letter = DeadLetter(reminder_id=reminder_id)
+        db.add(letter)
+    letter.tg_id = tg_id
+    letter.error = error
+    letter.attempts = attempts
+    letter.failed_at = failed_at
+    await db.commit()
+    return letter
+
+
+@traced_crud
+async def count_dead_letters(db: AsyncSession) -> int:
+    """
+    Считает недоставленные напоминания.
+
+    Args:
+        db: Асинхронная сессия базы данных
+
+    Returns:
+        int: Количество записей
+    """
+    return await db.scalar(select(func.count()).select_from(DeadLetter))
+
+
+@traced_crud
+async def list_dead_letters(
+    db: AsyncSession,
+    limit: int
+) -> list[DeadLetterItem]:
+    """
+    Получает последние недоставленные напоминания с их текстом.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        limit: Максимальное количество записей
+
+    Returns:
+        List[DeadLetterItem]: Записи, самые новые первыми; текст None,
+        если напоминание удалено
+    """
+    result = await db.execute(
+        select(
+            DeadLetter.reminder_id,
+            DeadLetter.tg_id,
+            Reminder.text,
+            DeadLetter.error,
+            DeadLetter.attempts,
+            DeadLetter.failed_at
+        )
+        .outerjoin(Reminder, DeadLetter.reminder_id == Reminder.id)
+        .order_by(DeadLetter.failed_at.desc(), DeadLetter.id.desc())
+        .limit(limit)
+    )
+    return [DeadLetterItem._make(row) for row in result]
+
+
+@traced_crud
+async def take_dead_letters(db: AsyncSession) -> list[Row]:
+    """
+    Удаляет все записи о недоставленных напоминаниях и возвращает
+    те из напоминаний, которые еще нужно отправить.
+
+    Args:
+        db: Асинхронная сессия базы данных
+
+    Returns:
+        List[Row]: Строки (id, user_id, tg_id, text, remind_at)
+        активных напоминаний доступных пользователей
+    """
+    # Удаляются только прочитанные записи: напоминание, которое
+    # воркер записал во время повтора, останется до следующего.
+    letter_ids = (await db.scalars(select(DeadLetter.id))).all()
+    if not letter_ids:
+        return []
+    result = await db.execute(
+        select(
+            Reminder.id,
+            Reminder.user_id,
+            User.tg_id,
+            Reminder.text,
+            Reminder.remind_at
+        )
+        .join(DeadLetter, DeadLetter.reminder_id == Reminder.id)
+        .join(User, Reminder.user_id == User.id)
+        .filter(
+            DeadLetter.id.in_(letter_ids),
+            Reminder.is_sent == False,
+            User.is_blocked.isnot(True),
+            User.is_unreachable == False
+        )
+        .order_by(Reminder.remind_at)
+    )
+    rows = result.all()
+    await db.execute(
+        delete(DeadLetter).filter(DeadLetter.id.in_(letter_ids))
+    )
+    await db.commit()
+    return rows
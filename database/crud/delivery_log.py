@@ -0,0 +1,59 @@
+from typing import Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.core.tracing import traced_crud
+from database.models import DeliveryLog
+from database.views import DeliveryLogItem
+
+
+@traced_crud
+async def add_delivery_log(db: AsyncSession, entries: list[dict]):
+    """
+    Вставляет пачку записей журнала доставок одним запросом.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        entries: Записи с полями reminder_id, chat_id, scheduled_at,
+            sent_at, latency_ms и outcome
+    """
+    if not entries:
+        return
+    await db.execute(insert(DeliveryLog), entries)
+    await db.commit()
+
+
+@traced_crud
+async def get_delivery_log(
+    db: AsyncSession,
+    chat_id: int,
+    reminder_id: Optional[int],
+    limit: int
+) -> list[DeliveryLogItem]:
+    """
+    Получает последние записи журнала доставок пользователя.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        chat_id: ID пользователя в Telegram
+        reminder_id: Только записи этого напоминания; None - все
+        limit: Максимальное количество записей
+
+    Returns:
+        List[DeliveryLogItem]: Записи, самые новые первыми
+    """
+    query = select(
+        DeliveryLog.reminder_id,
+        DeliveryLog.chat_id,
+        DeliveryLog.scheduled_at,
+        DeliveryLog.sent_at,
+        DeliveryLog.latency_ms,
+        DeliveryLog.outcome
+    ).filter(DeliveryLog.chat_id == chat_id)
+    if reminder_id is not None:
+        query = query.filter(DeliveryLog.reminder_id == reminder_id)
+    result = await db.execute(
+        query.order_by(DeliveryLog.id.desc()).limit(limit)
+    )
+    return [DeliveryLogItem._make(row) for row in result]
@@ -1,16 +1,37 @@
-from datetime import datetime
+from sqlalchemy import (
+    Row,
+    and_,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    update
+)
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from bot.core.tracing import traced_crud
+from database import queries
+from database.models import DeadLetter, Reminder, User
+from database.search import RANK, build_match
+from database.views import AdminReminderItem, ReminderItem
 
-from database.models import Reminder
+
+def _claimable(now: int):
+    """Условие: у напоминания нет действующего захвата доставкой."""
+    return or_(
+        Reminder.claimed_until.is_(None),
+        Reminder.claimed_until <= now
+    )
 
 
+@traced_crud
 async def create_reminder(
     db: AsyncSession,
     user_id: int,
     text: str,
-    remind_at: datetime
+    remind_at: int,
+    recurrence: str | None = None
 ) -> Reminder:
     """
     Создает новое напоминание в базе данных.
@@ -19,18 +40,97 @@ async def create_reminder(
         db: Сессия базы данных
         user_id: ID пользователя
         text: Текст напоминания
-        remind_at: Время напоминания
+        remind_at: Время напоминания, UTC epoch
+                   (для повторяющихся - первое срабатывание)
+        recurrence: Правило повтора или None для разового напоминания
 
     Returns:
         Reminder: Созданный объект напоминания
     """
-    reminder = Reminder(user_id=user_id, text=text, remind_at=remind_at)
+    reminder = Reminder(
+        user_id=user_id,
+        text=text,
+        remind_at=remind_at,
+        recurrence=recurrence
+    )
     db.add(reminder)
     await db.commit()
     await db.refresh(reminder)
     return reminder
 
 
+@traced_crud
+async def create_reminders(
+    db: AsyncSession,
+    rows: list[dict]
+) -> list[Row]:
+    """
+    Создает пачку напоминаний одной транзакцией.
+
+    Вставка выполняется одним INSERT ... RETURNING на пачку, без
+    создания объектов ORM.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        rows: Словари с ключами user_id, text, remind_at, recurrence
+
+    Returns:
+        List[Row]: Строки (id, user_id, text, remind_at) созданных
+        напоминаний
+    """
+    if not rows:
+        return []
+    result = await db.execute(
+        insert(Reminder).returning(
+            Reminder.id,
+            Reminder.user_id,
+            Reminder.text,
+            Reminder.remind_at
+        ),
+        rows
+    )
+    created = result.all()
+    await db.commit()
+    return created
+
+
+@traced_crud
+async def stream_pending_reminders(
+    db: AsyncSession,
+    user_id: int | None = None
+) -> AsyncResult:
+    """
+    Открывает потоковое чтение активных напоминаний для выгрузки.
+
+    Строки читаются с сервера порциями, поэтому память не зависит
+    от числа напоминаний.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        user_id: ID пользователя или None для всех пользователей
+
+    Returns:
+        AsyncResult: Строки (tg_id, timezone, text, remind_at, recurrence)
+    """
+    query = (
+        select(
+            User.tg_id,
+            User.timezone,
+            Reminder.text,
+            Reminder.remind_at,
+            Reminder.recurrence
+        )
+        .join(User, Reminder.user_id == User.id)
+        .filter(Reminder.is_sent == False)
+        .order_by(Reminder.user_id, Reminder.remind_at)
+        .execution_options(yield_per=1000)
+    )
+    if user_id is not None:
+        query = query.filter(Reminder.user_id == user_id)
+    return await db.stream(query)
+
+
+@traced_crud
 async def get_pending_reminders(
     db: AsyncSession,
     user_id: int
@@ -53,7 +153,376 @@ async def get_pending_reminders(
     return result.scalars().all()
 
 
-async def get_reminder(db: AsyncSession, reminder_id: int) -> Reminder | None:
+@traced_crud
+async def list_pending_reminders(
+    db: AsyncSession,
+    user_id: int
+) -> list[ReminderItem]:
+    """
+    Получает активные напоминания пользователя для показа в списке.
+
+    Выбираются только нужные колонки заранее собранным запросом
+    из database/queries.py, объекты ORM не создаются.
+
+    Args:
+        db: Сессия базы данных
+        user_id: ID пользователя
+
+    Returns:
+        List[ReminderItem]: Активные напоминания, отсортированные
+        по времени
+    """
+    rows = await queries.get_pending_reminders(db, user_id)
+    return [ReminderItem._make(row) for row in rows]
+
+
+@traced_crud
+async def search_reminders(
+    db: AsyncSession,
+    user_id: int,
+    phrase: str,
+    limit: int,
+    offset: int = 0
+) -> list[ReminderItem]:
+    """
+    Ищет активные напоминания пользователя по словам из текста.
+
+    Поиск идет по индексу FTS5 reminders_fts, результаты отсортированы
+    по релевантности (BM25); время не зависит от размера таблицы.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        user_id: ID пользователя в базе
+        phrase: Слова для поиска (ищутся по префиксу, все сразу)
+        limit: Максимальное количество записей
+        offset: Сколько записей пропустить (для постраничного вывода)
+
+    Returns:
+        List[ReminderItem]: Найденные напоминания, самые релевантные
+        первыми
+    """
+    match = build_match(user_id, phrase)
+    if match is None:
+        return []
+    result = await db.execute(
+        text(
+            "SELECT reminders.id, reminders.text, reminders.remind_at, "
+            "reminders.recurrence FROM reminders_fts "
+            "JOIN reminders ON reminders.id = reminders_fts.rowid "
+            "WHERE reminders_fts MATCH :match "
+            "AND reminders.user_id = :user_id "
+            f"ORDER BY {RANK} LIMIT :limit OFFSET :offset"
+        ),
+        {
+            "match": match,
+            "user_id": user_id,
+            "limit": limit,
+            "offset": offset,
+        }
+    )
+    return [ReminderItem._make(row) for row in result]
+
+
+@traced_crud
+async def count_pending_reminders(db: AsyncSession, tg_id: int) -> int:
+    """
+    Считает активные напоминания пользователя.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        tg_id: ID пользователя в Telegram
+
+    Returns:
+        int: Количество неотправленных напоминаний
+    """
+    return await db.scalar(
+        select(func.count())
+        .select_from(Reminder)
+        .join(User, Reminder.user_id == User.id)
+        .filter(User.tg_id == tg_id, Reminder.is_sent == False)
+    )
+
+
+@traced_crud
+async def get_due_reminders(
+    db: AsyncSession,
+    now: int,
+    limit: int = 100
+) -> list[Reminder]:
+    """
+    Получает неотправленные напоминания, время которых уже наступило.
+
+    Запрос использует индекс (is_sent, remind_at) и читает только
+    диапазон просроченных записей. Напоминания, захваченные доставкой,
+    пропускаются до истечения захвата.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        now: Текущее время, UTC epoch
+        limit: Максимальное количество записей
+
+    Returns:
+        List[Reminder]: Просроченные напоминания, самые старые первыми
+    """
+    result = await db.execute(
+        select(Reminder)
+        .filter(
+            Reminder.is_sent == False,
+            Reminder.remind_at <= now,
+            _claimable(now)
+        )
+        .order_by(Reminder.remind_at)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+@traced_crud
+async def get_shard_due_reminders(
+    db: AsyncSession,
+    now: int,
+    shards: list[int],
+    shard_count: int,
+    limit: int,
+    exclude: list[int] | None = None
+) -> list[Row]:
+    """
+    Получает наступившие напоминания пользователей из заданных шардов.
+
+    Шард пользователя - users.id по модулю shard_count. Запрос читает
+    диапазон индекса (is_sent, remind_at) и отбрасывает чужие шарды,
+    заблокированных и недоступных пользователей, недоставленные
+    напоминания (dead_letters), ждущие повтора администратором,
+    и напоминания с действующим захватом доставкой. Истекший захват
+    (воркер упал посреди отправки) не мешает: такое напоминание
+    выбирается снова.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        now: Текущее время, UTC epoch
+        shards: Номера шардов
+        shard_count: Общее число шардов
+        limit: Максимальное количество записей
+        exclude: ID напоминаний, которые не нужно выбирать
+
+    Returns:
+        List[Row]: Строки (id, user_id, tg_id, text), самые старые
+        первыми
+    """
+    query = (
+        select(Reminder.id, Reminder.user_id, User.tg_id, Reminder.text)
+        .join(User, Reminder.user_id == User.id)
+        .filter(
+            Reminder.is_sent == False,
+            Reminder.remind_at <= now,
+            _claimable(now),
+            (Reminder.user_id % shard_count).in_(shards),
+            User.is_blocked.isnot(True),
+            User.is_unreachable == False,
+            ~select(DeadLetter.id)
+            .filter(DeadLetter.reminder_id == Reminder.id)
+            .exists()
+        )
+        .order_by(Reminder.remind_at)
+        .limit(limit)
+    )
+    if exclude:
+        query = query.filter(Reminder.id.notin_(exclude))
+    result = await db.execute(query)
+    return result.all()
+
+
+@traced_crud
+async def get_upcoming_reminders(
+    db: AsyncSession,
+    after_at: int,
+    after_id: int | None,
+    until: int,
+    limit: int
+) -> list[Row]:
+    """
+    Получает неотправленные напоминания, наступающие в окне
+    (after_at, until], для передачи планировщику.
+
+    Запрос читает диапазон индекса (is_sent, remind_at) и листается
+    по ключу (remind_at, id), поэтому стоимость пачки не зависит
+    от числа напоминаний за окном. Напоминания заблокированных
+    и недоступных пользователей пропускаются.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        after_at: Начало окна, UTC epoch (не включается)
+        after_id: ID последнего напоминания предыдущей пачки с
+            remind_at == after_at или None для первой пачки
+        until: Конец окна, UTC epoch (включается)
+        limit: Максимальное количество записей
+
+    Returns:
+        List[Row]: Строки (id, user_id, tg_id, text, remind_at),
+        отсортированные по (remind_at, id)
+    """
+    if after_id is None:
+        after = Reminder.remind_at > after_at
+    else:
+        after = and_(
+            Reminder.remind_at >= after_at,
+            or_(
+                Reminder.remind_at > after_at,
+                Reminder.id > after_id
+            )
+        )
+    result = await db.execute(
+        select(
+            Reminder.id,
+            Reminder.user_id,
+            User.tg_id,
+            Reminder.text,
+            Reminder.remind_at
+        )
+        .join(User, Reminder.user_id == User.id)
+        .filter(
+            Reminder.is_sent == False,
+            after,
+            Reminder.remind_at <= until,
+            User.is_blocked.isnot(True),
+            User.is_unreachable == False
+        )
+        .order_by(Reminder.remind_at, Reminder.id)
+        .limit(limit)
+    )
+    return result.all()
+
+
+@traced_crud
+async def get_dispatch_rows(
+    db: AsyncSession,
+    reminder_ids: list[int]
+) -> list[Row]:
+    """
+    Получает данные для отправки напоминаний, выбранных планировщиком.
+
+    Отправленные и удаленные напоминания, а также напоминания
+    заблокированных и недоступных пользователей не возвращаются.
+    Захваченные доставкой напоминания возвращаются вместе со сроком
+    захвата: неотправленное напоминание с истекшим захватом (воркер
+    упал посреди отправки) нужно отправить снова.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_ids: ID напоминаний
+
+    Returns:
+        List[Row]: Строки (id, user_id, tg_id, text, claimed_until)
+    """
+    if not reminder_ids:
+        return []
+    result = await db.execute(
+        select(
+            Reminder.id,
+            Reminder.user_id,
+            User.tg_id,
+            Reminder.text,
+            Reminder.claimed_until
+        )
+        .join(User, Reminder.user_id == User.id)
+        .filter(
+            Reminder.id.in_(reminder_ids),
+            Reminder.is_sent == False,
+            User.is_blocked.isnot(True),
+            User.is_unreachable == False
+        )
+    )
+    return result.all()
+
+
+@traced_crud
+async def get_overdue_stats(
+    db: AsyncSession,
+    before: int,
+    cap: int = 10_000
+) -> tuple[int, int | None]:
+    """
+    Считает неотправленные напоминания, время которых прошло до `before`.
+
+    Учитываются только напоминания, которые еще будут отправлены:
+    без напоминаний заблокированных и недоступных пользователей
+    и недоставленных (dead_letters). Подсчет идет по диапазону индекса
+    (is_sent, remind_at) и ограничен `cap` записями, поэтому запрос
+    дешев даже при большом отставании.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        before: Граница просрочки, UTC epoch
+        cap: Наибольшее число подсчитываемых записей
+
+    Returns:
+        tuple[int, int | None]: Число просроченных (не больше cap)
+        и время самого старого из них или None
+    """
+    overdue = (
+        select(Reminder.remind_at)
+        .join(User, Reminder.user_id == User.id)
+        .filter(
+            Reminder.is_sent == False,
+            Reminder.remind_at < before,
+            User.is_blocked.isnot(True),
+            User.is_unreachable == False,
+            ~select(DeadLetter.id)
+            .filter(DeadLetter.reminder_id == Reminder.id)
+            .exists()
+        )
+        .order_by(Reminder.remind_at)
+        .limit(cap)
+        .subquery()
+    )
+    row = (await db.execute(
+        select(func.count(), func.min(overdue.c.remind_at))
+    )).one()
+    return row[0], row[1]
+
+
+@traced_crud
+async def get_user_due_reminders(
+    db: AsyncSession,
+    user_id: int,
+    until: int,
+    limit: int
+) -> list[Reminder]:
+    """
+    Получает неотправленные напоминания пользователя со временем
+    не позже `until`.
+
+    Запрос читает диапазон индекса (user_id, is_sent, remind_at).
+    Недоставленные напоминания (dead_letters), ждущие повтора
+    администратором, не возвращаются.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        user_id: ID пользователя в базе данных
+        until: Верхняя граница времени, UTC epoch
+        limit: Максимальное количество записей
+
+    Returns:
+        List[Reminder]: Напоминания, самые ранние первыми
+    """
+    result = await db.execute(
+        select(Reminder)
+        .filter(
+            Reminder.user_id == user_id,
+            Reminder.is_sent == False,
+            Reminder.remind_at <= until,
+            ~select(DeadLetter.id)
+            .filter(DeadLetter.reminder_id == Reminder.id)
+            .exists()
+        )
+        .order_by(Reminder.remind_at)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+@traced_crud
+async def get_reminder(db: AsyncSession, reminder_id: int) -> Row | None:
     """
     Получает напоминание по ID.
 
@@ -62,13 +531,17 @@ async def get_reminder(db: AsyncSession, reminder_id: int) -> Reminder | None:
         reminder_id: ID напоминания
 
     Returns:
-        Reminder: Объект напоминания или None если не найдено
+        Row | None: Строка (id, user_id, text, remind_at, is_sent,
+        recurrence, claimed_until) или None если не найдено
     """
-    result = await db.execute(select(Reminder).filter_by(id=reminder_id))
-    return result.scalar_one_or_none()
+    return await queries.get_reminder(db, reminder_id)
 
 
-async def delete_reminder(db: AsyncSession, reminder_id: int) -> bool:
+@traced_crud
+async def delete_reminder(
+    db: AsyncSession,
+    reminder_id: int
+) -> Reminder | None:
     """
     Удаляет напоминание по ID.
 
@@ -77,16 +550,16 @@ async def delete_reminder(db: AsyncSession, reminder_id: int) -> bool:
         reminder_id: ID напоминания для удаления
 
     Returns:
-        bool: True если удалено, False если не найдено
+        Reminder | None: Удаленное напоминание или None если не найдено
     """
-    reminder = await get_reminder(db, reminder_id)
+    reminder = await db.get(Reminder, reminder_id, populate_existing=True)
     if reminder:
         await db.delete(reminder)
         await db.commit()
-        return True
-    return False
+    return reminder
 
 
+@traced_crud
 async def get_all_reminders(db: AsyncSession) -> list[Reminder]:
     """
     Получает все напоминания из базы данных.
@@ -101,6 +574,34 @@ async def get_all_reminders(db: AsyncSession) -> list[Reminder]:
     return result.scalars().all()
 
 
+@traced_crud
+async def list_all_reminders(db: AsyncSession) -> list[AdminReminderItem]:
+    """
+    Получает все напоминания с ID Telegram владельцев для администратора.
+
+    Владелец подтягивается тем же запросом, объекты ORM не создаются.
+
+    Args:
+        db: Асинхронная сессия базы данных
+
+    Returns:
+        List[AdminReminderItem]: Список всех напоминаний
+    """
+    result = await db.execute(
+        select(
+            Reminder.id,
+            User.tg_id,
+            Reminder.text,
+            Reminder.remind_at,
+            Reminder.is_sent
+        )
+        .join(User, Reminder.user_id == User.id)
+        .order_by(Reminder.id)
+    )
+    return [AdminReminderItem._make(row) for row in result]
+
+
+@traced_crud
 async def mark_reminder_as_sent(db: AsyncSession, reminder_id: int) -> bool:
     """
     Помечает напоминание как отправленное.
@@ -112,7 +613,7 @@ async def mark_reminder_as_sent(db: AsyncSession, reminder_id: int) -> bool:
     Returns:
         bool: True если обновлено, False если не найдено
     """
-    reminder = await get_reminder(db, reminder_id)
+    reminder = await db.get(Reminder, reminder_id, populate_existing=True)
     if reminder:
         reminder.is_sent = True
         await db.commit()
@@ -120,27 +621,172 @@ async def mark_reminder_as_sent(db: AsyncSession, reminder_id: int) -> bool:
     return False
 
 
+@traced_crud
+async def claim_reminders(
+    db: AsyncSession,
+    reminder_ids: list[int],
+    now: int,
+    until: int
+) -> list[int]:
+    """
+    Захватывает напоминания до отправки сообщения.
+
+    Захват - срок claimed_until, а не отметка об отправке. Условный
+    UPDATE делает его атомарным: из двух одновременных доставок
+    одного напоминания (повтор сообщения очереди, два узла
+    диспетчера) напоминание получает только одна. Отправленным
+    напоминание помечает complete_reminders после отправки.
+    Если воркер остановлен посреди отправки (SIGKILL, нехватка
+    памяти), захват истекает в until, и напоминание снова доступно
+    доставке; в этом случае сообщение может прийти дважды.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_ids: ID напоминаний
+        now: Текущее время, UTC epoch
+        until: Срок захвата, UTC epoch
+
+    Returns:
+        List[int]: ID захваченных напоминаний
+    """
+    if not reminder_ids:
+        return []
+    claimed = await queries.claim_reminders(db, reminder_ids, now, until)
+    await db.commit()
+    return claimed
+
+
+@traced_crud
+async def complete_reminders(
+    db: AsyncSession,
+    reminder_ids: list[int],
+    until: int
+) -> int:
+    """
+    Помечает захваченные напоминания отправленными после отправки.
+
+    Обновляются только напоминания, захват которых не изменился:
+    перенесенное во время отправки напоминание остается активным.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_ids: ID напоминаний
+        until: Срок захвата из claim_reminders, UTC epoch
+
+    Returns:
+        int: Количество обновленных записей
+    """
+    if not reminder_ids:
+        return 0
+    result = await db.execute(
+        update(Reminder)
+        .filter(
+            Reminder.id.in_(reminder_ids),
+            Reminder.claimed_until == until
+        )
+        .values(is_sent=True, claimed_until=None)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+@traced_crud
+async def release_reminders(
+    db: AsyncSession,
+    reminder_ids: list[int],
+    until: int
+) -> int:
+    """
+    Снимает захват с напоминаний, отправка которых не удалась.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_ids: ID напоминаний
+        until: Срок захвата из claim_reminders, UTC epoch
+
+    Returns:
+        int: Количество обновленных записей
+    """
+    if not reminder_ids:
+        return 0
+    result = await db.execute(
+        update(Reminder)
+        .filter(
+            Reminder.id.in_(reminder_ids),
+            Reminder.claimed_until == until
+        )
+        .values(claimed_until=None)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+@traced_crud
 async def update_reminder_time(
     db: AsyncSession,
     reminder_id: int,
-    remind_at: datetime
+    remind_at: int
 ) -> Reminder | None:
     """
-    Обновляет время напоминания и сбрасывает статус отправки.
+    Обновляет время напоминания и сбрасывает статус отправки
+    и захват.
 
     Args:
         db: Асинхронная сессия базы данных
         reminder_id: ID напоминания
-        remind_at: Новое время напоминания
+        remind_at: Новое время напоминания, UTC epoch
 
     Returns:
         Reminder | None: Обновленное напоминание или None если не найдено
     """
-    reminder = await get_reminder(db, reminder_id)
+    reminder = await db.get(Reminder, reminder_id, populate_existing=True)
     if reminder:
         reminder.remind_at = remind_at
         reminder.is_sent = False
+        reminder.claimed_until = None
         await db.commit()
         await db.refresh(reminder)
         return reminder
     return None
+
+
+@traced_crud
+async def snooze_reminder(
+    db: AsyncSession,
+    reminder_id: int,
+    tg_id: int,
+    remind_at: int
+) -> Row | None:
+    """
+    Переносит напоминание пользователя одним условным UPDATE.
+
+    Владелец проверяется в том же запросе, а нужные для планирования
+    поля возвращаются через RETURNING, без отдельного SELECT.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_id: ID напоминания
+        tg_id: ID пользователя в Telegram
+        remind_at: Новое время напоминания, UTC epoch
+
+    Returns:
+        Row | None: Строка (id, user_id, text, remind_at) или None,
+        если напоминание не найдено или принадлежит другому пользователю
+    """
+    owner_id = (
+        select(User.id).filter(User.tg_id == tg_id).scalar_subquery()
+    )
+    result = await db.execute(
+        update(Reminder)
+        .filter(Reminder.id == reminder_id, Reminder.user_id == owner_id)
+        .values(remind_at=remind_at, is_sent=False, claimed_until=None)
+        .returning(
+            Reminder.id,
+            Reminder.user_id,
+            Reminder.text,
+            Reminder.remind_at
+        )
+    )
+    row = result.one_or_none()
+    await db.commit()
+    return row
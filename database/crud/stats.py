@@ -0,0 +1,53 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.core.tracing import traced_crud
+from database.models import DueBucket, StatsCounter
+from database.stats import DUE_BUCKET_SECONDS
+
+
+@traced_crud
+async def get_counters(db: AsyncSession) -> dict[str, int]:
+    """
+    Получает все счетчики статистики.
+
+    Args:
+        db: Асинхронная сессия базы данных
+
+    Returns:
+        dict[str, int]: Значения счетчиков по имени
+    """
+    result = await db.execute(select(StatsCounter.name, StatsCounter.value))
+    return dict(result.all())
+
+
+@traced_crud
+async def get_due_buckets(
+    db: AsyncSession,
+    since: int,
+    until: int
+) -> list[tuple[int, int]]:
+    """
+    Получает число активных напоминаний по интервалам времени
+    срабатывания. Интервал, в который попадает `since`, включается.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        since: Начало периода, UTC epoch
+        until: Конец периода, UTC epoch
+
+    Returns:
+        list[tuple[int, int]]: (начало интервала, число напоминаний)
+    """
+    result = await db.execute(
+        select(DueBucket.bucket, DueBucket.pending)
+        .filter(
+            DueBucket.bucket >= since // DUE_BUCKET_SECONDS,
+            DueBucket.bucket < until // DUE_BUCKET_SECONDS
+        )
+        .order_by(DueBucket.bucket)
+    )
+    return [
+        (bucket * DUE_BUCKET_SECONDS, pending)
+        for bucket, pending in result.all()
+    ]
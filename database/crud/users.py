@@ -1,24 +1,38 @@
-from sqlalchemy import select
+from sqlalchemy import Row, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.models import User
+from bot.core.tracing import traced_crud
+from database import queries
+from database.models import Reminder, User
+from database.views import AdminUserItem
 
 
-async def get_user(db: AsyncSession, tg_id: int) -> User | None:
+@traced_crud
+async def get_user(db: AsyncSession, tg_id: int) -> Row | None:
     """
     Получает пользователя по ID Telegram.
 
+    Выполняется на каждое обновление бота и каждую доставку, поэтому
+    использует заранее собранный запрос из database/queries.py.
+
     Args:
         db: Асинхронная сессия базы данных
         tg_id: ID пользователя в Telegram
 
     Returns:
-        User | None: Объект пользователя или None если не найден
+        Row | None: Строка (id, tg_id, is_blocked, reason, timezone,
+        is_unreachable) или None если не найден
     """
+    return await queries.get_user(db, tg_id)
+
+
+async def _load_user(db: AsyncSession, tg_id: int) -> User | None:
+    """Загружает объект пользователя для изменения."""
     result = await db.execute(select(User).filter_by(tg_id=tg_id))
     return result.scalar_one_or_none()
 
 
+@traced_crud
 async def create_user(db: AsyncSession, tg_id: int) -> User:
     """
     Создает нового пользователя в базе данных.
@@ -37,6 +51,7 @@ async def create_user(db: AsyncSession, tg_id: int) -> User:
     return user
 
 
+@traced_crud
 async def block_user(db: AsyncSession, tg_id: int, reason: str) -> User | None:
     """
     Блокирует пользователя с указанием причины.
@@ -49,7 +64,7 @@ async def block_user(db: AsyncSession, tg_id: int, reason: str) -> User | None:
     Returns:
         User | None: Заблокированный пользователь или None если не найден
     """
-    user = await get_user(db, tg_id)
+    user = await _load_user(db, tg_id)
     if user:
         user.is_blocked = True
         user.reason = reason
@@ -57,6 +72,7 @@ async def block_user(db: AsyncSession, tg_id: int, reason: str) -> User | None:
     return user
 
 
+@traced_crud
 async def unblock_user(db: AsyncSession, tg_id: int) -> User | None:
     """
     Разблокирует пользователя.
@@ -68,7 +84,7 @@ async def unblock_user(db: AsyncSession, tg_id: int) -> User | None:
     Returns:
         User | None: Разблокированный пользователь или None если не найден
     """
-    user = await get_user(db, tg_id)
+    user = await _load_user(db, tg_id)
     if user:
         user.is_blocked = False
         user.reason = None
@@ -76,6 +92,7 @@ async def unblock_user(db: AsyncSession, tg_id: int) -> User | None:
     return user
 
 
+@traced_crud
 async def get_all_users(db: AsyncSession) -> list[User]:
     """
     Получает всех пользователей из базы данных.
@@ -88,3 +105,173 @@ async def get_all_users(db: AsyncSession) -> list[User]:
     """
     result = await db.execute(select(User))
     return result.scalars().all()
+
+
+@traced_crud
+async def list_users(db: AsyncSession) -> list[AdminUserItem]:
+    """
+    Получает всех пользователей с числом их напоминаний
+    для администратора.
+
+    Число напоминаний считается одним запросом с группировкой,
+    объекты ORM не создаются.
+
+    Args:
+        db: Асинхронная сессия базы данных
+
+    Returns:
+        List[AdminUserItem]: Список всех пользователей
+    """
+    counts = (
+        select(Reminder.user_id, func.count().label("reminders"))
+        .group_by(Reminder.user_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            User.tg_id,
+            User.is_blocked,
+            User.reason,
+            func.coalesce(counts.c.reminders, 0)
+        )
+        .outerjoin(counts, counts.c.user_id == User.id)
+        .order_by(User.id)
+    )
+    return [AdminUserItem._make(row) for row in result]
+
+
+@traced_crud
+async def get_or_create_users(
+    db: AsyncSession,
+    tg_ids: set[int]
+) -> dict[int, tuple[int, str | None]]:
+    """
+    Находит пользователей по ID Telegram и создает недостающих.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        tg_ids: ID пользователей в Telegram
+
+    Returns:
+        Dict[int, tuple[int, str | None]]: tg_id -> (users.id, timezone)
+    """
+    query = select(User.tg_id, User.id, User.timezone).filter(
+        User.tg_id.in_(tg_ids)
+    )
+    users = {
+        tg_id: (user_id, timezone)
+        for tg_id, user_id, timezone in await db.execute(query)
+    }
+    missing = tg_ids - users.keys()
+    if missing:
+        db.add_all(User(tg_id=tg_id) for tg_id in missing)
+        await db.commit()
+        for tg_id, user_id, timezone in await db.execute(query):
+            users[tg_id] = (user_id, timezone)
+    return users
+
+
+@traced_crud
+async def get_recipient_batch(
+    db: AsyncSession,
+    after_id: int,
+    limit: int
+) -> list[tuple[int, int]]:
+    """
+    Получает следующую пачку получателей рассылки.
+
+    Постраничная выборка по первичному ключу (keyset): каждая пачка
+    читает только свои строки, без OFFSET и без загрузки всех
+    пользователей в память. Заблокированные и недоступные
+    пропускаются.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        after_id: Последний обработанный users.id
+        limit: Размер пачки
+
+    Returns:
+        List[tuple[int, int]]: Пары (users.id, tg_id) по возрастанию id
+    """
+    result = await db.execute(
+        select(User.id, User.tg_id)
+        .filter(
+            User.id > after_id,
+            User.is_blocked.isnot(True),
+            User.is_unreachable == False
+        )
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return [tuple(row) for row in result]
+
+
+@traced_crud
+async def set_timezone(
+    db: AsyncSession,
+    tg_id: int,
+    timezone: str
+) -> User | None:
+    """
+    Устанавливает временную зону пользователя.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        tg_id: ID пользователя в Telegram
+        timezone: Имя временной зоны IANA
+
+    Returns:
+        User | None: Обновленный пользователь или None если не найден
+    """
+    user = await _load_user(db, tg_id)
+    if user:
+        user.timezone = timezone
+        await db.commit()
+    return user
+
+
+@traced_crud
+async def mark_unreachable(db: AsyncSession, tg_ids: list[int]) -> int:
+    """
+    Помечает пользователей недоступными (бот заблокирован, чат удален).
+
+    Args:
+        db: Асинхронная сессия базы данных
+        tg_ids: ID пользователей в Telegram
+
+    Returns:
+        int: Количество обновленных записей
+    """
+    if not tg_ids:
+        return 0
+    result = await db.execute(
+        update(User)
+        .filter(User.tg_id.in_(tg_ids), User.is_unreachable == False)
+        .values(is_unreachable=True)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+@traced_crud
+async def reactivate_user(db: AsyncSession, tg_id: int) -> bool:
+    """
+    Снимает отметку недоступности.
+
+    Условный UPDATE: при одновременных сообщениях только один
+    вызов вернет True и запустит перепланирование напоминаний.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        tg_id: ID пользователя в Telegram
+
+    Returns:
+        bool: True если пользователь был недоступен
+    """
+    result = await db.execute(
+        update(User)
+        .filter(User.tg_id == tg_id, User.is_unreachable == True)
+        .values(is_unreachable=False)
+    )
+    await db.commit()
+    return result.rowcount > 0
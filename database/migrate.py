@@ -0,0 +1,120 @@
+"""
+Разовое обновление базы SQLite первой версии до текущей схемы.
+
+В первой версии время напоминания хранилось как DATETIME (строка
+с местным временем DEFAULT_TIMEZONE), а у пользователей не было
+часового пояса и отметки недоступности; позже у напоминаний
+появился срок захвата доставкой. create_all не меняет существующие
+таблицы, поэтому такая база ломается на первом запросе.
+
+Скрипт в одной транзакции добавляет недостающие колонки, пересоздает
+таблицу напоминаний с remind_at в UTC epoch и индексами модели,
+а затем создает остальные таблицы, триггеры статистики
+и полнотекстовый индекс (init_db). Повторный запуск безопасен.
+
+Пример:
+    DATABASE_URL=sqlite:///reminders.db python -m database.migrate
+"""
+import asyncio
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from bot.core.utils.timezone import DEFAULT_TZ, to_timestamp
+from database.models import Reminder
+from database.session import engine, init_db
+
+
+# Колонки, добавленные после первой версии, по таблицам.
+NEW_COLUMNS = {
+    "users": {
+        "timezone": "ALTER TABLE users ADD COLUMN timezone VARCHAR",
+        "is_unreachable": (
+            "ALTER TABLE users "
+            "ADD COLUMN is_unreachable BOOLEAN NOT NULL DEFAULT 0"
+        ),
+    },
+    "reminders": {
+        "claimed_until": (
+            "ALTER TABLE reminders ADD COLUMN claimed_until INTEGER"
+        ),
+    },
+}
+
+
+async def _columns(conn: AsyncConnection, table: str) -> Dict[str, str]:
+    """Колонки таблицы и их объявленные типы; пусто, если таблицы нет."""
+    result = await conn.exec_driver_sql(f"PRAGMA table_info({table})")
+    return {row[1]: row[2].upper() for row in result}
+
+
+def _epoch(value) -> int:
+    """Переводит DATETIME первой версии (местное время) в UTC epoch."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    return to_timestamp(
+        datetime.fromisoformat(value).replace(tzinfo=DEFAULT_TZ)
+    )
+
+
+async def _convert_reminders(conn: AsyncConnection) -> int:
+    """
+    Пересоздает таблицу напоминаний с remind_at в UTC epoch.
+
+    Переносятся все колонки старой таблицы: колонки модели - в свои,
+    остальные добавляются в новую таблицу с прежним типом.
+
+    Returns:
+        int: Сколько напоминаний перенесено
+    """
+    await conn.exec_driver_sql(
+        "ALTER TABLE reminders RENAME TO reminders_v1"
+    )
+    source = await _columns(conn, "reminders_v1")
+    await conn.run_sync(Reminder.__table__.create)
+    target = await _columns(conn, "reminders")
+    for name, type_ in source.items():
+        if name not in target:
+            await conn.exec_driver_sql(
+                f'ALTER TABLE reminders ADD COLUMN "{name}" {type_}'
+            )
+    names = ", ".join(f'"{name}"' for name in source)
+    rows = (await conn.exec_driver_sql(
+        f"SELECT {names} FROM reminders_v1"
+    )).mappings().all()
+    if rows:
+        values = ", ".join(f":{name}" for name in source)
+        await conn.exec_driver_sql(
+            f"INSERT INTO reminders ({names}) VALUES ({values})",
+            [
+                dict(row, remind_at=_epoch(row["remind_at"]))
+                for row in rows
+            ]
+        )
+    await conn.exec_driver_sql("DROP TABLE reminders_v1")
+    return len(rows)
+
+
+async def migrate():
+    """Обновляет схему базы DATABASE_URL."""
+    async with engine.begin() as conn:
+        reminders = await _columns(conn, "reminders")
+        if reminders.get("remind_at") == "DATETIME":
+            count = await _convert_reminders(conn)
+            print(f"MIGRATE: Время {count} напоминаний переведено в UTC")
+        for table, ddls in NEW_COLUMNS.items():
+            columns = await _columns(conn, table)
+            if not columns:
+                continue
+            for name, ddl in ddls.items():
+                if name not in columns:
+                    await conn.exec_driver_sql(ddl)
+                    print(f"MIGRATE: Добавлена колонка {table}.{name}")
+    await init_db()
+    await engine.dispose()
+    print("MIGRATE: Схема обновлена")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from database.base import Base
@@ -11,17 +11,121 @@ class User(Base):
     tg_id = Column(Integer, unique=True)
     is_blocked = Column(Boolean, default=False)
     reason = Column(String)
+    timezone = Column(String, nullable=True)
+    # Бот заблокирован пользователем или чат удален: доставка
+    # не выполняется, пока пользователь снова не напишет боту.
+    is_unreachable = Column(Boolean, default=False, nullable=False)
 
     reminders = relationship("Reminder", back_populates="user")
 
 
 class Reminder(Base):
-    """Модель напоминания."""
+    """
+    Модель напоминания.
+
+    Время напоминания хранится как UTC epoch (секунды), перевод
+    во временную зону пользователя выполняется только при разборе
+    ввода и выводе.
+    """
     __tablename__ = "reminders"
+    __table_args__ = (
+        Index("ix_reminders_due", "is_sent", "remind_at"),
+        Index("ix_reminders_user_pending", "user_id", "is_sent", "remind_at"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     text = Column(String)
-    remind_at = Column(DateTime)
+    remind_at = Column(Integer, nullable=False)
     is_sent = Column(Boolean, default=False)
+    recurrence = Column(String, nullable=True)
+    # Срок захвата доставкой, UTC epoch: до него напоминание
+    # отправляет другой воркер. Отметка снимается после отправки
+    # или ошибки; истекший захват (воркер упал) не действует.
+    claimed_until = Column(Integer, nullable=True)
 
     user = relationship("User", back_populates="reminders")
+
+
+class Broadcast(Base):
+    """
+    Модель рассылки сообщения всем пользователям.
+
+    Хранит курсор (последний обработанный users.id) и счетчики,
+    поэтому после сбоя рассылка продолжается с места остановки.
+    """
+    __tablename__ = "broadcasts"
+    id = Column(Integer, primary_key=True)
+    text = Column(String, nullable=False)
+    admin_chat_id = Column(Integer, nullable=False)
+    status_message_id = Column(Integer, nullable=True)
+    cursor = Column(Integer, default=0, nullable=False)
+    sent = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    started_at = Column(Integer, nullable=False)
+    finished_at = Column(Integer, nullable=True)
+
+
+class StatsCounter(Base):
+    """
+    Счетчик для статистики администратора.
+
+    Значения поддерживаются триггерами базы данных (database/stats.py)
+    при каждой вставке, изменении и удалении напоминаний и пользователей.
+    """
+    __tablename__ = "stats_counters"
+    name = Column(String, primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
+
+
+class DueBucket(Base):
+    """
+    Число активных напоминаний с временем срабатывания в интервале
+    [bucket * DUE_BUCKET_SECONDS, (bucket + 1) * DUE_BUCKET_SECONDS).
+
+    Поддерживается триггерами вместе со StatsCounter.
+    """
+    __tablename__ = "reminder_due_buckets"
+    bucket = Column(Integer, primary_key=True)
+    pending = Column(Integer, default=0, nullable=False)
+
+
+class DeadLetter(Base):
+    """
+    Напоминание, доставить которое не удалось: постоянная ошибка
+    Bot API или исчерпаны повторы.
+
+    Напоминание остается активным, но не отправляется, пока
+    администратор не запустит повтор (/dead_letters_replay).
+    """
+    __tablename__ = "dead_letters"
+    id = Column(Integer, primary_key=True)
+    reminder_id = Column(Integer, ForeignKey("reminders.id"), unique=True)
+    tg_id = Column(Integer, nullable=False)
+    error = Column(String, nullable=False)
+    attempts = Column(Integer, default=1, nullable=False)
+    failed_at = Column(Integer, nullable=False)
+
+
+class DeliveryLog(Base):
+    """
+    Запись журнала доставок: попытка отправить напоминание.
+
+    Журнал только дополняется. Записи копятся в памяти воркера
+    и вставляются пачками (worker/delivery_log.py), поэтому ID
+    напоминания не ссылается на таблицу напоминаний: напоминание
+    может быть удалено раньше, чем запись попадет в базу.
+    """
+    __tablename__ = "delivery_log"
+    __table_args__ = (
+        Index("ix_delivery_log_chat", "chat_id", "id"),
+        Index("ix_delivery_log_reminder", "reminder_id"),
+    )
+    id = Column(Integer, primary_key=True)
+    reminder_id = Column(Integer, nullable=False)
+    chat_id = Column(Integer, nullable=False)
+    scheduled_at = Column(Integer, nullable=False)
+    sent_at = Column(Integer, nullable=False)
+    # Опоздание отправки относительно scheduled_at, миллисекунды.
+    latency_ms = Column(Integer, nullable=False)
+    # "sent", "unreachable" или "error".
+    outcome = Column(String, nullable=False)
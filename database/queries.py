@@ -0,0 +1,136 @@
+from typing import Optional
+
+from sqlalchemy import Row, bindparam, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Reminder, User
+
+
+# Запросы горячего пути: проверка пользователя на каждое обновление
+# бота и каждую доставку, список напоминаний, чтение и захват
+# напоминания при доставке.
+#
+# Запросы собраны один раз при импорте по колонкам таблиц (Core),
+# а значения передаются параметрами. Поэтому вызов не строит запрос
+# заново, ключ кэша запроса вычисляется один раз на объект, а
+# скомпилированный SQL берется из кэша движка. Запросы по колонкам
+# таблиц не проходят подготовку ORM и возвращают строки, а не
+# объекты в identity map сессии. Изменять такие строки нельзя:
+# функции CRUD, которые меняют запись, загружают объект ORM сами,
+# с populate_existing: захват через Core не обновляет объекты,
+# уже загруженные в сессию.
+
+users = User.__table__
+reminders = Reminder.__table__
+
+USER_BY_TG_ID = select(
+    users.c.id,
+    users.c.tg_id,
+    users.c.is_blocked,
+    users.c.reason,
+    users.c.timezone,
+    users.c.is_unreachable
+).where(users.c.tg_id == bindparam("tg_id"))
+
+REMINDER_BY_ID = select(
+    reminders.c.id,
+    reminders.c.user_id,
+    reminders.c.text,
+    reminders.c.remind_at,
+    reminders.c.is_sent,
+    reminders.c.recurrence,
+    reminders.c.claimed_until
+).where(reminders.c.id == bindparam("reminder_id"))
+
+PENDING_REMINDERS = select(
+    reminders.c.id,
+    reminders.c.text,
+    reminders.c.remind_at,
+    reminders.c.recurrence
+).where(
+    reminders.c.user_id == bindparam("user_id"),
+    reminders.c.is_sent == False
+).order_by(reminders.c.remind_at)
+
+CLAIM_REMINDERS = update(reminders).where(
+    reminders.c.id.in_(bindparam("reminder_ids", expanding=True)),
+    reminders.c.is_sent == False,
+    or_(
+        reminders.c.claimed_until.is_(None),
+        reminders.c.claimed_until <= bindparam("now")
+    )
+).values(claimed_until=bindparam("until")).returning(reminders.c.id)
+
+
+async def get_user(db: AsyncSession, tg_id: int) -> Optional[Row]:
+    """
+    Получает пользователя и его статус по ID Telegram.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        tg_id: ID пользователя в Telegram
+
+    Returns:
+        Optional[Row]: Строка (id, tg_id, is_blocked, reason, timezone,
+        is_unreachable) или None, если пользователь не найден
+    """
+    result = await db.execute(USER_BY_TG_ID, {"tg_id": tg_id})
+    return result.first()
+
+
+async def get_reminder(db: AsyncSession, reminder_id: int) -> Optional[Row]:
+    """
+    Получает напоминание по ID.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_id: ID напоминания
+
+    Returns:
+        Optional[Row]: Строка (id, user_id, text, remind_at, is_sent,
+        recurrence, claimed_until) или None, если напоминание
+        не найдено
+    """
+    result = await db.execute(REMINDER_BY_ID, {"reminder_id": reminder_id})
+    return result.first()
+
+
+async def get_pending_reminders(db: AsyncSession, user_id: int) -> list[Row]:
+    """
+    Получает активные напоминания пользователя, самые ранние первыми.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        user_id: ID пользователя в базе данных
+
+    Returns:
+        List[Row]: Строки (id, text, remind_at, recurrence)
+    """
+    result = await db.execute(PENDING_REMINDERS, {"user_id": user_id})
+    return result.all()
+
+
+async def claim_reminders(
+    db: AsyncSession,
+    reminder_ids: list[int],
+    now: int,
+    until: int
+) -> list[int]:
+    """
+    Захватывает неотправленные напоминания без действующего захвата
+    до времени until без фиксации транзакции.
+
+    Args:
+        db: Асинхронная сессия базы данных
+        reminder_ids: ID напоминаний
+        now: Текущее время, UTC epoch
+        until: Срок захвата, UTC epoch
+
+    Returns:
+        List[int]: ID захваченных напоминаний
+    """
+    result = await db.execute(
+        CLAIM_REMINDERS,
+        {"reminder_ids": reminder_ids, "now": now, "until": until}
+    )
+    return result.scalars().all()
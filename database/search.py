@@ -0,0 +1,116 @@
+import re
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Полнотекстовый индекс активных напоминаний. Таблица без содержимого
+# (content=''): хранится только индекс, текст читается из reminders.
+# Колонка owner содержит токен владельца u<user_id>, поэтому поиск
+# по пользователю - пересечение списков индекса, а не фильтр после
+# поиска по всей таблице. Индексы префиксов длиной 3-6 делают поиск
+# по началу слова таким же быстрым, как по слову целиком.
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE reminders_fts USING fts5("
+    "text, owner, content='', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='3 4 5 6')"
+)
+
+_ADD = (
+    "INSERT INTO reminders_fts (rowid, text, owner) "
+    "SELECT NEW.id, NEW.text, 'u' || NEW.user_id WHERE NEW.is_sent = 0"
+)
+_REMOVE = (
+    "INSERT INTO reminders_fts (reminders_fts, rowid, text, owner) "
+    "SELECT 'delete', OLD.id, OLD.text, 'u' || OLD.user_id "
+    "WHERE OLD.is_sent = 0"
+)
+
+TRIGGERS = {
+    "search_reminders_insert": (
+        "CREATE TRIGGER search_reminders_insert AFTER INSERT ON reminders "
+        f"BEGIN {_ADD}; END"
+    ),
+    "search_reminders_delete": (
+        "CREATE TRIGGER search_reminders_delete AFTER DELETE ON reminders "
+        f"BEGIN {_REMOVE}; END"
+    ),
+    "search_reminders_update": (
+        "CREATE TRIGGER search_reminders_update "
+        "AFTER UPDATE OF is_sent, text, user_id ON reminders "
+        "WHEN OLD.is_sent IS NOT NEW.is_sent OR OLD.text IS NOT NEW.text "
+        "OR OLD.user_id IS NOT NEW.user_id "
+        f"BEGIN {_REMOVE}; {_ADD}; END"
+    ),
+}
+
+REBUILD = (
+    "INSERT INTO reminders_fts (rowid, text, owner) "
+    "SELECT id, text, 'u' || user_id FROM reminders WHERE is_sent = 0"
+)
+
+# Ранжирование BM25 только по тексту: токен владельца есть в каждой
+# строке пользователя и на порядок не влияет.
+RANK = "bm25(reminders_fts, 1.0, 0.0)"
+
+MAX_QUERY_WORDS = 8
+MIN_PREFIX = 3
+MAX_PREFIX = 6
+
+
+def build_match(user_id: int, phrase: str) -> Optional[str]:
+    """
+    Составляет выражение MATCH для поиска по напоминаниям пользователя.
+
+    Из фразы берутся только слова (операторы FTS5 в запрос не попадают),
+    все они должны встретиться. Слова ищутся по первым MAX_PREFIX
+    буквам: так находятся другие формы слова («встреча» - «встречу»),
+    а запрос попадает в индекс префиксов. Короткие слова ищутся целиком,
+    однобуквенные (предлоги) пропускаются.
+
+    Args:
+        user_id: ID пользователя в базе
+        phrase: Запрос пользователя
+
+    Returns:
+        Optional[str]: Выражение MATCH или None, если слов нет
+    """
+    words = [
+        word for word in re.findall(r"\w+", phrase.lower())
+        if len(word) > 1
+    ][:MAX_QUERY_WORDS]
+    if not words:
+        return None
+    terms = " ".join(
+        f'"{word[:MAX_PREFIX]}"*' if len(word) >= MIN_PREFIX
+        else f'"{word}"'
+        for word in words
+    )
+    return f"owner:u{user_id} AND text:({terms})"
+
+
+async def install_search(conn: AsyncConnection):
+    """
+    Создает полнотекстовый индекс FTS5 и триггеры, которые
+    поддерживают его при изменении напоминаний.
+
+    Если индекса или части триггеров нет, все пересоздается,
+    а индекс один раз заполняется активными напоминаниями.
+
+    Args:
+        conn: Соединение внутри транзакции
+    """
+    installed = set((await conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE "
+        "(type = 'trigger' AND name LIKE 'search_%') "
+        "OR (type = 'table' AND name = 'reminders_fts')"
+    )).scalars())
+    if installed == set(TRIGGERS) | {"reminders_fts"}:
+        return
+    for name in installed - {"reminders_fts"}:
+        await conn.exec_driver_sql(f"DROP TRIGGER {name}")
+    await conn.exec_driver_sql("DROP TABLE IF EXISTS reminders_fts")
+    await conn.exec_driver_sql(CREATE_TABLE)
+    for ddl in TRIGGERS.values():
+        await conn.exec_driver_sql(ddl)
+    await conn.exec_driver_sql(REBUILD)
@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
+    AsyncEngine,
     AsyncSession
 )
 from bot.core.config import settings
+from bot.core.tracing import instrument_engine
 from database.base import Base
+from database.search import install_search
+from database.stats import install_stats
 
 
 async_database_url = settings.DATABASE_URL.replace(
@@ -12,11 +16,31 @@ async_database_url = settings.DATABASE_URL.replace(
     "sqlite+aiosqlite://"
 )
 
-engine = create_async_engine(
-    async_database_url,
-    echo=False,
-    connect_args={"check_same_thread": False}
-)
+
+def create_engine(**kwargs) -> AsyncEngine:
+    """
+    Создает движок базы данных с подключенной трассировкой.
+
+    Пул соединений движка привязан к циклу событий, поэтому потокам
+    воркера Dramatiq, у каждого из которых свой цикл, нужны свои движки.
+
+    Args:
+        **kwargs: Дополнительные параметры create_async_engine
+
+    Returns:
+        AsyncEngine: Новый движок
+    """
+    new_engine = create_async_engine(
+        async_database_url,
+        echo=False,
+        connect_args={"check_same_thread": False},
+        **kwargs
+    )
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
+engine = create_engine()
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -26,10 +50,13 @@ AsyncSessionLocal = async_sessionmaker(
 
 async def init_db():
     """
-    Асинхронно инициализирует базу данных.
+    Асинхронно инициализирует базу данных: создает таблицы,
+    триггеры счетчиков статистики и полнотекстовый индекс.
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await install_stats(conn)
+        await install_search(conn)
 
 
 async def get_async_session() -> AsyncSession:
@@ -0,0 +1,143 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+# Ширина интервала гистограммы времени срабатывания, секунды.
+DUE_BUCKET_SECONDS = 300
+
+COUNTERS = (
+    "reminders_pending",
+    "reminders_recurring",
+    "reminders_sent",
+    "users_total",
+    "users_blocked",
+    "users_unreachable",
+)
+
+
+def _reminder_changes(row: str, sign: str) -> List[str]:
+    """
+    Изменения счетчиков при появлении (sign="+") или исчезновении
+    (sign="-") строки напоминания NEW или OLD.
+    """
+    return [
+        f"UPDATE stats_counters SET value = value {sign} 1 "
+        f"WHERE name = CASE WHEN {row}.is_sent = 0 THEN 'reminders_pending' "
+        f"WHEN {row}.is_sent = 1 THEN 'reminders_sent' END",
+        f"UPDATE stats_counters SET value = value {sign} 1 "
+        f"WHERE name = 'reminders_recurring' "
+        f"AND {row}.is_sent = 0 AND {row}.recurrence IS NOT NULL",
+        f"INSERT INTO reminder_due_buckets (bucket, pending) "
+        f"SELECT {row}.remind_at / {DUE_BUCKET_SECONDS}, {sign}1 "
+        f"WHERE {row}.is_sent = 0 "
+        f"ON CONFLICT (bucket) DO UPDATE SET pending = pending {sign} 1",
+        f"DELETE FROM reminder_due_buckets "
+        f"WHERE bucket = {row}.remind_at / {DUE_BUCKET_SECONDS} "
+        f"AND pending <= 0",
+    ]
+
+
+def _user_changes(row: str, sign: str) -> List[str]:
+    return [
+        f"UPDATE stats_counters SET value = value {sign} 1 "
+        f"WHERE name = 'users_total'",
+        f"UPDATE stats_counters SET value = value {sign} 1 "
+        f"WHERE name = 'users_blocked' AND {row}.is_blocked = 1",
+        f"UPDATE stats_counters SET value = value {sign} 1 "
+        f"WHERE name = 'users_unreachable' AND {row}.is_unreachable = 1",
+    ]
+
+
+def _trigger(name: str, event: str, when: str, body: List[str]) -> str:
+    statements = "".join(f"    {statement};\n" for statement in body)
+    return (
+        f"CREATE TRIGGER {name} {event}\n"
+        f"{f'WHEN {when}' if when else ''}\n"
+        f"BEGIN\n{statements}END"
+    )
+
+
+TRIGGERS = {
+    "stats_reminders_insert": _trigger(
+        "stats_reminders_insert", "AFTER INSERT ON reminders", "",
+        _reminder_changes("NEW", "+")
+    ),
+    "stats_reminders_delete": _trigger(
+        "stats_reminders_delete", "AFTER DELETE ON reminders", "",
+        _reminder_changes("OLD", "-")
+    ),
+    "stats_reminders_update": _trigger(
+        "stats_reminders_update",
+        "AFTER UPDATE OF is_sent, remind_at, recurrence ON reminders",
+        "OLD.is_sent IS NOT NEW.is_sent "
+        "OR OLD.remind_at IS NOT NEW.remind_at "
+        "OR OLD.recurrence IS NOT NEW.recurrence",
+        _reminder_changes("OLD", "-") + _reminder_changes("NEW", "+")
+    ),
+    "stats_users_insert": _trigger(
+        "stats_users_insert", "AFTER INSERT ON users", "",
+        _user_changes("NEW", "+")
+    ),
+    "stats_users_delete": _trigger(
+        "stats_users_delete", "AFTER DELETE ON users", "",
+        _user_changes("OLD", "-")
+    ),
+    "stats_users_update": _trigger(
+        "stats_users_update",
+        "AFTER UPDATE OF is_blocked, is_unreachable ON users",
+        "OLD.is_blocked IS NOT NEW.is_blocked "
+        "OR OLD.is_unreachable IS NOT NEW.is_unreachable",
+        _user_changes("OLD", "-") + _user_changes("NEW", "+")
+    ),
+}
+
+REBUILD = [
+    "DELETE FROM stats_counters",
+    "DELETE FROM reminder_due_buckets",
+    "INSERT INTO stats_counters (name, value) VALUES "
+    + ", ".join(f"('{name}', 0)" for name in COUNTERS),
+    "UPDATE stats_counters SET value = (SELECT count(*) FROM reminders "
+    "WHERE is_sent = 0) WHERE name = 'reminders_pending'",
+    "UPDATE stats_counters SET value = (SELECT count(*) FROM reminders "
+    "WHERE is_sent = 0 AND recurrence IS NOT NULL) "
+    "WHERE name = 'reminders_recurring'",
+    "UPDATE stats_counters SET value = (SELECT count(*) FROM reminders "
+    "WHERE is_sent = 1) WHERE name = 'reminders_sent'",
+    "UPDATE stats_counters SET value = (SELECT count(*) FROM users) "
+    "WHERE name = 'users_total'",
+    "UPDATE stats_counters SET value = (SELECT count(*) FROM users "
+    "WHERE is_blocked = 1) WHERE name = 'users_blocked'",
+    "UPDATE stats_counters SET value = (SELECT count(*) FROM users "
+    "WHERE is_unreachable = 1) WHERE name = 'users_unreachable'",
+    f"INSERT INTO reminder_due_buckets (bucket, pending) "
+    f"SELECT remind_at / {DUE_BUCKET_SECONDS}, count(*) FROM reminders "
+    f"WHERE is_sent = 0 GROUP BY remind_at / {DUE_BUCKET_SECONDS}",
+]
+
+
+async def install_stats(conn: AsyncConnection):
+    """
+    Создает триггеры, поддерживающие счетчики статистики.
+
+    Счетчики меняются в той же транзакции, что и данные, поэтому
+    их не нужно обновлять из кода, а /stats не проходит по таблицам.
+    Если набор триггеров неполный (новая или старая база), они
+    пересоздаются, а счетчики один раз пересчитываются по таблицам.
+    Триггеры написаны для SQLite.
+
+    Args:
+        conn: Соединение внутри транзакции
+    """
+    installed = set((await conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'trigger' AND name LIKE 'stats_%'"
+    )).scalars())
+    if installed == set(TRIGGERS):
+        return
+    for name in installed:
+        await conn.exec_driver_sql(f"DROP TRIGGER {name}")
+    for ddl in TRIGGERS.values():
+        await conn.exec_driver_sql(ddl)
+    for statement in REBUILD:
+        await conn.exec_driver_sql(statement)
@@ -0,0 +1,53 @@
+from typing import NamedTuple, Optional
+
+
+# Строки только для чтения для списков и админских выборок. В отличие
+# от объектов ORM они не попадают в identity map сессии, не хранят
+# состояние для отслеживания изменений и содержат только нужные
+# колонки; связанные данные (tg_id владельца, число напоминаний)
+# приходят тем же запросом, без ленивой загрузки.
+
+
+class ReminderItem(NamedTuple):
+    """Активное напоминание в списке пользователя."""
+    id: int
+    text: str
+    remind_at: int
+    recurrence: Optional[str]
+
+
+class AdminReminderItem(NamedTuple):
+    """Напоминание в списке администратора."""
+    id: int
+    tg_id: int
+    text: str
+    remind_at: int
+    is_sent: bool
+
+
+class AdminUserItem(NamedTuple):
+    """Пользователь в списке администратора."""
+    tg_id: int
+    is_blocked: bool
+    reason: Optional[str]
+    reminders: int
+
+
+class DeadLetterItem(NamedTuple):
+    """Недоставленное напоминание в списке администратора."""
+    reminder_id: int
+    tg_id: int
+    text: Optional[str]
+    error: str
+    attempts: int
+    failed_at: int
+
+
+class DeliveryLogItem(NamedTuple):
+    """Запись журнала доставок для администратора."""
+    reminder_id: int
+    chat_id: int
+    scheduled_at: int
+    sent_at: int
+    latency_ms: int
+    outcome: str
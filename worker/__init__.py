@@ -1,6 +0,0 @@
-import dramatiq
-from dramatiq.brokers.redis import RedisBroker
-from bot.core.config import settings
-
-redis_broker = RedisBroker(url=settings.REDIS_URL)
-dramatiq.set_broker(redis_broker)
@@ -1,10 +1,10 @@
 import dramatiq
 from dramatiq.brokers.redis import RedisBroker
 
-from bot.core.config import settings
+from bot.core.redis import get_redis
 
 
-redis_broker = RedisBroker(url=settings.REDIS_URL)
-dramatiq.set_broker(redis_broker)
-
-broker = redis_broker
+# Единственный брокер процесса: его импортируют и бот (постановка задач),
+# и воркер (модуль worker.tasks). Соединения берутся из общего пула.
+broker = RedisBroker(client=get_redis())
+dramatiq.set_broker(broker)
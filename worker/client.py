@@ -0,0 +1,129 @@
+import json
+from typing import Any, List, Optional
+
+import aiohttp
+
+from bot.keyboards.buttons import Button
+
+
+DEFAULT_API_URL = "https://api.telegram.org"
+
+
+class TelegramError(Exception):
+    """Ошибка, которую вернул Bot API."""
+
+    def __init__(
+        self,
+        code: int,
+        description: str,
+        retry_after: Optional[int] = None
+    ):
+        super().__init__(f"{code}: {description}")
+        self.code = code
+        self.description = description
+        self.retry_after = retry_after
+
+    @property
+    def chat_unavailable(self) -> bool:
+        """Пользователь заблокировал бота или чат не существует."""
+        return self.code == 403 or (
+            self.code == 400 and "chat not found" in self.description.lower()
+        )
+
+    @property
+    def retryable(self) -> bool:
+        """Временная ошибка: превышен лимит (429) или сбой сервера (5xx)."""
+        return self.code == 429 or self.code >= 500
+
+
+class TelegramClient:
+    """
+    Тонкий клиент Bot API для воркера.
+
+    Воркеру нужен только sendMessage, поэтому вместо aiogram
+    (Bot, Dispatcher и модели pydantic) используется прямой запрос
+    через aiohttp. HTTP-сессия создается при первом вызове
+    и привязана к циклу событий, в котором это произошло.
+    """
+
+    def __init__(self, token: str, api_url: Optional[str] = None):
+        api_url = (api_url or DEFAULT_API_URL).rstrip("/")
+        self.base_url = f"{api_url}/bot{token}"
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def call(self, method: str, **params: Any) -> Any:
+        """
+        Вызывает метод Bot API.
+
+        Args:
+            method: Имя метода
+            **params: Параметры; словари и списки передаются как JSON
+
+        Returns:
+            Any: Поле result ответа
+
+        Raises:
+            TelegramError: Если Bot API вернул ok=false
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
+        data = {
+            key: json.dumps(value) if isinstance(value, (dict, list))
+            else str(value)
+            for key, value in params.items()
+            if value is not None
+        }
+        async with self._session.post(
+            f"{self.base_url}/{method}", data=data
+        ) as response:
+            try:
+                payload = await response.json(content_type=None)
+            except ValueError:
+                # Прокси или балансировщик ответил не JSON (502, 504).
+                payload = {"description": f"HTTP {response.status}"}
+        if not payload.get("ok"):
+            raise TelegramError(
+                payload.get("error_code", response.status),
+                payload.get("description", ""),
+                payload.get("parameters", {}).get("retry_after")
+            )
+        return payload["result"]
+
+    async def send_message(
+        self,
+        chat_id: int,
+        text: str,
+        buttons: Optional[List[List[Button]]] = None
+    ) -> dict:
+        """
+        Отправляет сообщение с необязательной инлайн-клавиатурой.
+
+        Args:
+            chat_id: ID чата
+            text: Текст сообщения
+            buttons: Ряды кнопок (текст, callback_data)
+
+        Returns:
+            dict: Отправленное сообщение
+        """
+        reply_markup = None
+        if buttons:
+            reply_markup = {"inline_keyboard": [
+                [{"text": label, "callback_data": data} for label, data in row]
+                for row in buttons
+            ]}
+        return await self.call(
+            "sendMessage",
+            chat_id=chat_id,
+            text=text,
+            reply_markup=reply_markup
+        )
+
+    async def close(self):
+        """Закрывает HTTP-сессию."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
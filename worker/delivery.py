@@ -0,0 +1,219 @@
+from typing import Optional
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import (
+    DELIVERIES_KEY,
+    DELIVERIES_TTL_SECONDS,
+    QUOTA_PENDING_KEY,
+    UNREACHABLE_USERS_KEY,
+    get_redis
+)
+from bot.core.tracing import tracer
+from bot.core.utils.parsers import next_occurrence
+from bot.core.utils.timezone import (
+    from_timestamp,
+    get_timezone,
+    to_timestamp
+)
+from bot.keyboards.buttons import coalesced_buttons, reminder_buttons
+from database.crud.reminders import (
+    claim_reminders,
+    complete_reminders,
+    get_reminder,
+    get_user_due_reminders,
+    release_reminders,
+    update_reminder_time
+)
+from database.crud.users import get_user, mark_unreachable
+from worker.client import TelegramError
+from worker.delivery_log import delivery_log
+from worker.retries import ReminderClaimed
+from worker.runtime import get_client, get_sessions
+from worker.scheduler import get_scheduler
+
+
+# Допуск на неточность таймера очереди: сообщение, пришедшее раньше
+# времени напоминания больше чем на это значение, считается устаревшим.
+# Допуск задан в реальных секундах и растет с ускорением часов.
+STALE_TOLERANCE_SECONDS = 5
+
+
+async def _reschedule(db, reminder, user, user_id: int) -> bool:
+    """
+    Планирует следующее срабатывание повторяющегося напоминания.
+
+    Returns:
+        bool: False, если срабатываний больше нет: тогда напоминание
+        помечается отправленным, как разовое
+    """
+    tz = get_timezone(user.timezone)
+    next_at = next_occurrence(
+        reminder.recurrence,
+        max(from_timestamp(reminder.remind_at, tz), clock.now(tz))
+    )
+    if not next_at:
+        return False
+
+    reminder = await update_reminder_time(
+        db, reminder.id, to_timestamp(next_at)
+    )
+    if reminder is None:
+        return True
+    with tracer.span("scheduler.schedule", reminder_id=reminder.id):
+        get_scheduler().schedule([(reminder, user_id)])
+    return True
+
+
+async def deliver(reminder_id: int, user_id: int, text: str):
+    """
+    Отправляет напоминание пользователю.
+
+    Общая часть задачи send_reminder и диспетчера по шардам: проверяет
+    пользователя и напоминание, объединяет напоминания в окне,
+    захватывает их на DELIVERY_CLAIM_SECONDS и отправляет сообщение.
+    После отправки напоминания помечаются отправленными, а если
+    отправка не удалась, захват снимается. Поэтому повторная доставка
+    отправленного напоминания ничего не отправляет, а параллельная
+    ждет конца чужого захвата (ReminderClaimed): если воркер с захватом
+    убит посреди отправки, напоминание отправится после истечения
+    захвата. Выполняется в цикле событий текущего потока воркера.
+
+    Args:
+        reminder_id: ID напоминания в базе данных
+        user_id: ID пользователя в Telegram
+        text: Текст напоминания для отправки
+
+    Raises:
+        ReminderClaimed: Напоминание захвачено другой доставкой
+        Exception: Ошибки базы данных и Bot API, кроме недоступного
+            чата (пользователь тогда помечается недоступным)
+    """
+    async with get_sessions()() as db:
+        user = await get_user(db, user_id)
+        if user.is_blocked or user.is_unreachable:
+            return
+
+        reminder = await get_reminder(db, reminder_id)
+        if not reminder or reminder.is_sent:
+            return
+
+        early = reminder.remind_at - clock.time()
+        if early > STALE_TOLERANCE_SECONDS * clock.speed:
+            # Напоминание перенесено на более позднее время,
+            # для него уже запланировано отдельное сообщение.
+            return
+
+        reminders = [reminder]
+        if settings.COALESCE_WINDOW_SECONDS:
+            due = await get_user_due_reminders(
+                db,
+                reminder.user_id,
+                reminder.remind_at + settings.COALESCE_WINDOW_SECONDS,
+                settings.COALESCE_MAX_ITEMS
+            )
+            reminders += [r for r in due if r.id != reminder_id]
+            reminders = reminders[:settings.COALESCE_MAX_ITEMS]
+
+        now = int(clock.time())
+        until = now + int(settings.DELIVERY_CLAIM_SECONDS * clock.speed)
+        claimed = set(await claim_reminders(
+            db, [r.id for r in reminders], now, until
+        ))
+        if reminder_id not in claimed:
+            # Объединенные напоминания отправятся своей доставкой.
+            await release_reminders(db, list(claimed), until)
+            current = await get_reminder(db, reminder_id)
+            if (
+                current and not current.is_sent
+                and current.claimed_until and current.claimed_until > now
+            ):
+                raise ReminderClaimed(
+                    reminder_id, clock.delay(current.claimed_until)
+                )
+            return
+        reminders = [r for r in reminders if r.id in claimed]
+
+        if len(reminders) == 1:
+            single = reminders[0]
+            message = "🔔 Напоминание: " + (
+                text if single is reminder else single.text
+            )
+            buttons = reminder_buttons(single.id)
+        else:
+            message = "🔔 Напоминания:\n\n" + "\n".join(
+                f"{number}. {r.text}"
+                for number, r in enumerate(reminders, 1)
+            ) + "\n\n⏰ Отложить пункт:"
+            buttons = coalesced_buttons([r.id for r in reminders])
+
+        try:
+            with tracer.span(
+                "telegram.send_message", reminders=len(reminders)
+            ):
+                await get_client().send_message(user_id, message, buttons)
+        except Exception as e:
+            await release_reminders(db, [r.id for r in reminders], until)
+            unavailable = isinstance(e, TelegramError) and e.chat_unavailable
+            _log_deliveries(
+                reminders, user_id, "unreachable" if unavailable else "error"
+            )
+            if not unavailable:
+                raise
+            await mark_unreachable(db, [user_id])
+            remember_unreachable([user_id])
+            return
+
+        # Следующее срабатывание планируется сразу после отправки,
+        # до пометки остальных: перенос сам снимает захват, и сбой
+        # после него не теряет повторяющееся напоминание.
+        rescheduled = set()
+        for r in reminders:
+            if r.recurrence and await _reschedule(db, r, user, user_id):
+                rescheduled.add(r.id)
+        completed = [r.id for r in reminders if r.id not in rescheduled]
+        await complete_reminders(db, completed, until)
+        _log_deliveries(reminders, user_id, "sent")
+        _count_deliveries(len(reminders), user_id if completed else None)
+
+
+def _log_deliveries(reminders: list, user_id: int, outcome: str):
+    """
+    Добавляет попытку доставки напоминаний в журнал доставок.
+    Ошибка журнала не прерывает доставку.
+    """
+    try:
+        for r in reminders:
+            delivery_log.append(r.id, user_id, r.remind_at, outcome)
+    except Exception as e:
+        print(f"DELIVERY: Ошибка журнала доставок: {e!r}")
+
+
+def _count_deliveries(count: int, released_tg_id: Optional[int] = None):
+    """
+    Увеличивает счетчик доставок текущей минуты для /stats и сбрасывает
+    кэш квоты активных напоминаний пользователя, у которого их стало
+    меньше (released_tg_id). Оба необязательны: ошибка Redis
+    не прерывает доставку.
+    """
+    key = DELIVERIES_KEY.format(minute=int(clock.time()) // 60)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.incrby(key, count)
+        pipe.expire(key, DELIVERIES_TTL_SECONDS)
+        if released_tg_id is not None:
+            pipe.delete(QUOTA_PENDING_KEY.format(tg_id=released_tg_id))
+        pipe.execute()
+    except Exception as e:
+        print(f"DELIVERY: Ошибка счетчика доставок: {e!r}")
+
+
+def remember_unreachable(tg_ids: list):
+    """Добавляет недоступных пользователей в множество Redis."""
+    if tg_ids:
+        get_redis().sadd(UNREACHABLE_USERS_KEY, *tg_ids)
+
+
+def is_unreachable(tg_id: int) -> bool:
+    """Пользователь недоступен (проверка множества Redis без базы)."""
+    return bool(get_redis().sismember(UNREACHABLE_USERS_KEY, tg_id))
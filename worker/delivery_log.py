@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+from typing import List, Optional
+
+from dramatiq import Middleware
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from database.crud.delivery_log import add_delivery_log
+from worker.runtime import (
+    close,
+    get_sessions,
+    run,
+    shutdown_remaining
+)
+
+
+class DeliveryLogBuffer:
+    """
+    Журнал доставок с отложенной записью.
+
+    Доставка только добавляет запись в очередь в памяти, а фоновый
+    поток вставляет записи пачками: как только накопилось
+    DELIVERY_LOG_BATCH_SIZE записей или прошло
+    DELIVERY_LOG_FLUSH_SECONDS с начала пачки. Поэтому на отправку
+    приходится не отдельная запись в базу, а доля одной вставки.
+
+    Записи, которые не успели попасть в базу до аварийного завершения
+    процесса, теряются; при плавной остановке close() выгружает все.
+    Если база отстает так, что очередь заполнилась, новые записи
+    отбрасываются и учитываются в dropped.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None
+    ):
+        """
+        Args:
+            batch_size: Записей в одной вставке; по умолчанию
+                DELIVERY_LOG_BATCH_SIZE
+            interval: Наибольшее время накопления пачки, секунды;
+                по умолчанию DELIVERY_LOG_FLUSH_SECONDS
+        """
+        self.batch_size = batch_size or settings.DELIVERY_LOG_BATCH_SIZE
+        self.interval = interval or settings.DELIVERY_LOG_FLUSH_SECONDS
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=self.batch_size * 20)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def append(
+        self,
+        reminder_id: int,
+        chat_id: int,
+        scheduled_at: int,
+        outcome: str
+    ):
+        """
+        Добавляет запись о попытке доставки (из любого потока).
+
+        Args:
+            reminder_id: ID напоминания в базе данных
+            chat_id: ID пользователя в Telegram
+            scheduled_at: Время напоминания, UTC epoch
+            outcome: Результат: "sent", "unreachable" или "error"
+        """
+        now = clock.time()
+        entry = {
+            "reminder_id": reminder_id,
+            "chat_id": chat_id,
+            "scheduled_at": scheduled_at,
+            "sent_at": int(now),
+            "latency_ms": max(0, round((now - scheduled_at) * 1000)),
+            "outcome": outcome
+        }
+        self._start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        # Поток запускается при первой записи: процесс бота тоже
+        # импортирует модуль, но ничего не доставляет.
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="delivery-log", daemon=True
+                )
+                self._thread.start()
+
+    def _take(self) -> List[dict]:
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if self._stop.is_set() or timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    async def _write(self, batch: List[dict]):
+        async with get_sessions()() as db:
+            await add_delivery_log(db, batch)
+
+    def _run(self):
+        try:
+            while True:
+                batch = self._take()
+                if batch:
+                    try:
+                        run(self._write(batch))
+                        self.written += len(batch)
+                        self.batches += 1
+                    except Exception as e:
+                        print(f"DELIVERY_LOG: Ошибка записи: {e!r}")
+                elif self._stop.is_set():
+                    break
+        finally:
+            close()
+
+    def close(self, timeout: float):
+        """
+        Выгружает накопленные записи и останавливает фоновый поток.
+
+        Args:
+            timeout: Предельное время ожидания, секунды
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+delivery_log = DeliveryLogBuffer()
+
+
+class DeliveryLogMiddleware(Middleware):
+    """
+    Выгружает журнал доставок после остановки рабочих потоков
+    и диспетчера, когда новых записей уже не будет, в пределах
+    общего срока остановки. Добавляется после DispatcherMiddleware,
+    чтобы диспетчер успел завершить свои отправки.
+    """
+
+    def after_worker_shutdown(self, broker, worker):
+        delivery_log.close(shutdown_remaining())
@@ -0,0 +1,217 @@
+import asyncio
+import threading
+from typing import Optional
+
+from dramatiq import Middleware
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import DELIVERY_ATTEMPTS_KEY, get_redis
+from bot.core.tracing import tracer
+from worker.delivery import deliver
+from worker.retries import dead_letter, retry_delay
+from worker.runtime import close, run, shutdown_remaining
+from worker.scheduler import Scheduler, get_scheduler
+from worker.shards import ShardLeases
+
+
+class Dispatcher:
+    """
+    Диспетчер напоминаний узла воркера для планировщиков с polled=True
+    (SCHEDULER_BACKEND=database или redis).
+
+    Узел арендует часть шардов (ShardLeases) и раз в
+    DISPATCH_INTERVAL_SECONDS выбирает у планировщика наступившие
+    напоминания только своих шардов, отправляя их параллельно,
+    не больше DISPATCH_CONCURRENCY сразу. Пока в шардах есть
+    отставание, пачки выбираются без паузы. Шарды перебалансируются
+    только между пачками, поэтому узел не отдает шард посреди
+    отправки; во время долгой пачки аренда продлевается отдельной
+    задачей.
+
+    Напоминание, отправка которого не удалась из-за временной ошибки,
+    возвращается планировщику через задержку retry_delay(); число
+    попыток хранится в Redis, поэтому повтор может выполнить любой
+    узел. После постоянной ошибки или исчерпания повторов
+    напоминание записывается в недоставленные.
+
+    После stop() новые пачки не выбираются: начатые отправки
+    завершаются, а еще не начатые сразу возвращаются планировщику,
+    чтобы их забрали другие узлы.
+    """
+
+    def __init__(
+        self,
+        scheduler: Optional[Scheduler] = None,
+        leases: Optional[ShardLeases] = None
+    ):
+        """
+        Args:
+            scheduler: Источник наступивших напоминаний; по умолчанию -
+                планировщик процесса
+            leases: Аренда шардов; по умолчанию - из настроек
+        """
+        self.scheduler = scheduler or get_scheduler()
+        self.client = get_redis()
+        self.leases = leases or ShardLeases(
+            self.client,
+            settings.DISPATCH_SHARDS,
+            settings.DISPATCH_LEASE_SECONDS
+        )
+        self.delivered = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _send(self, row) -> Optional[float]:
+        """
+        Отправляет одно напоминание.
+
+        Returns:
+            Optional[float]: None, если напоминание обработано, иначе
+            через сколько реальных секунд вернуть его планировщику
+            (0 - отправка не начата из-за остановки)
+        """
+        async with self._semaphore:
+            if self._stop.is_set():
+                return 0.0
+            try:
+                with tracer.span(
+                    "worker.dispatch_reminder", reminder_id=row.id
+                ):
+                    await deliver(row.id, row.tg_id, row.text)
+                self.delivered += 1
+                return None
+            except Exception as e:
+                error = e
+            attempt = self.client.hincrby(DELIVERY_ATTEMPTS_KEY, row.id) - 1
+            delay = retry_delay(error, attempt)
+            if delay is not None:
+                print(
+                    f"DISPATCHER: Ошибка отправки {row.id}, повтор "
+                    f"через {delay:.1f} с: {error!r}"
+                )
+                return delay
+            try:
+                await dead_letter(row.id, row.tg_id, error, attempt + 1)
+            except Exception as e:
+                print(f"DISPATCHER: Ошибка записи {row.id}: {e!r}")
+                return settings.DELIVERY_RETRY_MAX_SECONDS
+            return None
+
+    async def dispatch_once(self) -> int:
+        """
+        Перебалансирует шарды и отправляет одну пачку наступивших
+        напоминаний.
+
+        Returns:
+            int: Сколько напоминаний выбрано
+        """
+        shards = self.leases.rebalance()
+        if not shards:
+            return 0
+
+        now = clock.time()
+        rows = await self.scheduler.claim_due(
+            shards, now, settings.DISPATCH_BATCH_SIZE
+        )
+        batch, later = rows, []
+        if settings.COALESCE_WINDOW_SECONDS:
+            # Остальные напоминания пользователя отправятся вместе
+            # с первым в одном сообщении или в следующей пачке.
+            first = {}
+            for row in rows:
+                first.setdefault(row.user_id, row)
+            batch = list(first.values())
+            later = [row for row in rows if first[row.user_id] is not row]
+        self.scheduler.release(later, now)
+
+        delays = await asyncio.gather(*(self._send(row) for row in batch))
+        done = [row for row, delay in zip(batch, delays) if delay is None]
+        self.scheduler.ack(done)
+        if done:
+            self.client.hdel(DELIVERY_ATTEMPTS_KEY, *(row.id for row in done))
+        now = clock.time()
+        self.scheduler.release(
+            [row for row, delay in zip(batch, delays) if delay == 0], now
+        )
+        for row, delay in zip(batch, delays):
+            if delay:
+                self.scheduler.release([row], now + delay * clock.speed)
+        return len(rows)
+
+    async def _renew_loop(self):
+        while True:
+            await asyncio.sleep(settings.DISPATCH_LEASE_SECONDS / 3)
+            try:
+                self.leases.renew()
+            except Exception as e:
+                print(f"DISPATCHER: Ошибка продления аренды: {e!r}")
+
+    async def serve(self):
+        """Работает до вызова stop(), затем отдает шарды."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(settings.DISPATCH_CONCURRENCY)
+        renew = asyncio.create_task(self._renew_loop())
+        try:
+            while not self._stop.is_set():
+                try:
+                    selected = await self.dispatch_once()
+                except Exception as e:
+                    print(f"DISPATCHER: Ошибка опроса: {e!r}")
+                    selected = 0
+                if selected < settings.DISPATCH_BATCH_SIZE:
+                    try:
+                        await asyncio.wait_for(
+                            self._stop.wait(),
+                            settings.DISPATCH_INTERVAL_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            renew.cancel()
+            self.leases.release_all()
+
+    def stop(self):
+        """Просит диспетчер остановиться (из любого потока)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+
+class DispatcherMiddleware(Middleware):
+    """
+    Запускает диспетчер в отдельном потоке процесса воркера, если
+    планировщик не ставит задачи в очередь (polled=True).
+    Каждый процесс воркера - отдельный узел со своей долей шардов;
+    при остановке процесса его шарды сразу освобождаются.
+    """
+
+    def __init__(self):
+        self.dispatcher: Optional[Dispatcher] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def after_worker_boot(self, broker, worker):
+        if not get_scheduler().polled:
+            return
+        self.dispatcher = Dispatcher()
+        self._thread = threading.Thread(
+            target=self._run, name="dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        try:
+            run(self.dispatcher.serve())
+        finally:
+            close()
+
+    def before_worker_shutdown(self, broker, worker):
+        # Поток останавливается вместе с рабочими потоками Dramatiq,
+        # а ждет его after_worker_shutdown в пределах общего срока.
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+
+    def after_worker_shutdown(self, broker, worker):
+        if self.dispatcher is not None:
+            self._thread.join(shutdown_remaining())
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict
+
+from dramatiq import Middleware
+
+from bot.core.config import settings
+from bot.core.health import HealthMonitor
+from bot.core.redis import get_async_redis
+from worker.runtime import get_sessions
+
+
+class HealthMiddleware(Middleware):
+    """
+    Проверки состояния процесса воркера.
+
+    Запоминает время начала выполняемых сообщений: задача, которая
+    выполняется дольше HEALTH_MAX_TASK_SECONDS, означает зависший
+    воркер, а пустой список при пустой очереди - простаивающий.
+    HTTP-сервер проверок работает в отдельном потоке со своим циклом
+    событий. Порт один на контейнер, поэтому при нескольких процессах
+    воркера сервер поднимает тот, кто первым его занял.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[str, float] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Число выполняемых сообщений и время самого долгого из них."""
+        with self._lock:
+            started = list(self._started.values())
+        oldest = time.monotonic() - min(started) if started else 0.0
+        return {
+            "in_progress": len(started),
+            "oldest_in_progress_seconds": round(oldest, 1),
+            "stuck": oldest > settings.HEALTH_MAX_TASK_SECONDS,
+        }
+
+    def before_process_message(self, broker, message):
+        with self._lock:
+            self._started[message.message_id] = time.monotonic()
+
+    def after_process_message(
+        self, broker, message, *, result=None, exception=None
+    ):
+        with self._lock:
+            self._started.pop(message.message_id, None)
+
+    def after_skip_message(self, broker, message):
+        with self._lock:
+            self._started.pop(message.message_id, None)
+
+    def after_worker_boot(self, broker, worker):
+        if settings.WORKER_HEALTH_PORT:
+            threading.Thread(
+                target=asyncio.run,
+                args=(self._serve(),),
+                name="health",
+                daemon=True
+            ).start()
+
+    async def _serve(self):
+        # Асинхронный клиент Redis в процессе воркера использует только
+        # этот поток, а get_sessions() создает движок для его цикла.
+        monitor = HealthMonitor(
+            "worker", get_sessions, get_async_redis, self.stats
+        )
+        try:
+            await monitor.start(
+                settings.HEALTH_HOST, settings.WORKER_HEALTH_PORT
+            )
+        except OSError:
+            return
+        await asyncio.Event().wait()
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import socket
+import threading
+from typing import Optional
+
+from dramatiq import Middleware
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import (
+    SCHEDULE_PROMOTER_KEY,
+    SCHEDULE_WATERMARK_KEY,
+    get_redis
+)
+from bot.core.tracing import tracer
+from database.crud.reminders import get_upcoming_reminders
+from worker.runtime import close, get_sessions, run, shutdown_remaining
+from worker.scheduler import Scheduler, get_scheduler
+
+
+class Promoter:
+    """
+    Продвижение напоминаний в горизонт планирования
+    (SCHEDULE_HORIZON_SECONDS).
+
+    Планировщик хранит только ближайшие напоминания, поэтому его
+    память ограничена нагрузкой следующих часов, а не всеми
+    активными напоминаниями. Раз в SCHEDULE_PROMOTE_INTERVAL_SECONDS
+    один из узлов выбирает из базы напоминания, вошедшие в окно
+    с прошлого продвижения (от отметки в Redis до нового горизонта),
+    и пачками передает их планировщику.
+
+    Повторная передача безопасна: отправка заново проверяет
+    напоминание в базе, поэтому после сбоя посреди продвижения
+    окно просто проходится еще раз.
+    """
+
+    def __init__(self, scheduler: Optional[Scheduler] = None):
+        """
+        Args:
+            scheduler: Планировщик; по умолчанию - планировщик процесса
+        """
+        self.scheduler = scheduler or get_scheduler()
+        self.client = get_redis()
+        self.node = f"{socket.gethostname()}:{os.getpid()}"
+        self.promoted = 0
+        self._stop: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def promote_once(self) -> int:
+        """
+        Передает планировщику напоминания, вошедшие в горизонт.
+
+        Новый горизонт вычисляется до чтения базы: напоминание,
+        созданное во время продвижения, либо видно запросу, либо
+        наступает позже нового горизонта и попадет в следующее окно.
+
+        Returns:
+            int: Сколько напоминаний запланировано
+        """
+        horizon = self.scheduler.horizon()
+        if horizon is None:
+            return 0
+        horizon = int(horizon)
+        watermark = self.client.get(SCHEDULE_WATERMARK_KEY)
+        after_at = int(watermark) if watermark else int(clock.time())
+        if horizon <= after_at:
+            return 0
+
+        count = 0
+        after_id = None
+        with tracer.span("scheduler.promote") as span:
+            async with get_sessions()() as db:
+                while True:
+                    rows = await get_upcoming_reminders(
+                        db,
+                        after_at,
+                        after_id,
+                        horizon,
+                        settings.SCHEDULE_PROMOTE_BATCH_SIZE
+                    )
+                    count += self.scheduler.schedule(
+                        (row, row.tg_id) for row in rows
+                    )
+                    if len(rows) < settings.SCHEDULE_PROMOTE_BATCH_SIZE:
+                        break
+                    after_at, after_id = rows[-1].remind_at, rows[-1].id
+            self.client.set(SCHEDULE_WATERMARK_KEY, horizon)
+            span.set_attribute("count", count)
+        self.promoted += count
+        return count
+
+    def _acquire(self) -> bool:
+        # Блокировка живет один период: продвигает первый узел,
+        # который успел ее взять, остальные пропускают этот период.
+        return bool(self.client.set(
+            SCHEDULE_PROMOTER_KEY,
+            self.node,
+            nx=True,
+            px=int(settings.SCHEDULE_PROMOTE_INTERVAL_SECONDS * 1000)
+        ))
+
+    async def serve(self):
+        """Работает до вызова stop()."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        while not self._stop.is_set():
+            try:
+                if self._acquire():
+                    await self.promote_once()
+            except Exception as e:
+                print(f"PROMOTER: Ошибка продвижения: {e!r}")
+            try:
+                await asyncio.wait_for(
+                    self._stop.wait(),
+                    settings.SCHEDULE_PROMOTE_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        """Просит продвижение остановиться (из любого потока)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+
+class PromoterMiddleware(Middleware):
+    """
+    Запускает продвижение в отдельном потоке процесса воркера,
+    если задан горизонт планирования.
+    """
+
+    def __init__(self):
+        self.promoter: Optional[Promoter] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def after_worker_boot(self, broker, worker):
+        if get_scheduler().horizon() is None:
+            return
+        self.promoter = Promoter()
+        self._thread = threading.Thread(
+            target=self._run, name="promoter", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        try:
+            run(self.promoter.serve())
+        finally:
+            close()
+
+    def before_worker_shutdown(self, broker, worker):
+        # Поток останавливается вместе с рабочими потоками Dramatiq,
+        # а ждет его after_worker_shutdown в пределах общего срока.
+        if self.promoter is not None:
+            self.promoter.stop()
+
+    def after_worker_shutdown(self, broker, worker):
+        if self.promoter is not None:
+            self._thread.join(shutdown_remaining())
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Optional
+
+from bot.core.redis import get_redis
+
+
+# Резервирование токена (GCRA). KEYS[1] - теоретическое время
+# следующего свободного токена, мкс по часам сервера Redis.
+# ARGV: интервал между токенами и допустимый всплеск, мкс.
+# Ответ - сколько микросекунд ждать до зарезервированного токена.
+RESERVE_SCRIPT = """
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local interval = tonumber(ARGV[1])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local wait = tat - now - tonumber(ARGV[2])
+local next_tat = tat + interval
+redis.call('SET', KEYS[1], string.format('%.0f', next_tat),
+    'PX', math.ceil((next_tat - now) / 1000) + 1)
+if wait < 0 then
+    return 0
+end
+return wait
+"""
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты «ведро токенов», общий для всех процессов.
+
+    Состояние ведра хранится в Redis и меняется одним Lua-скриптом
+    по часам сервера Redis, поэтому все потоки, процессы и контейнеры
+    воркера делят один предел, а не получают его каждый. Вызывающий
+    резервирует токен и ждет, пока он накопится, уже вне Redis.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        rate: float,
+        capacity: Optional[float] = None
+    ):
+        """
+        Args:
+            key: Ключ Redis с состоянием ведра
+            rate: Токенов в секунду
+            capacity: Размер ведра (допустимый всплеск), по умолчанию 1
+        """
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity or 1.0
+        self._reserve = get_redis().register_script(RESERVE_SCRIPT)
+
+    def reserve(self) -> float:
+        """
+        Резервирует один токен.
+
+        Returns:
+            float: Сколько секунд ждать до его появления
+        """
+        interval = 1_000_000 / self.rate
+        wait = self._reserve(
+            keys=[self.key],
+            args=[interval, (self.capacity - 1) * interval]
+        )
+        return int(wait) / 1_000_000
+
+    async def acquire(self):
+        """Ждет свободный токен."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
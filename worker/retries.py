@@ -0,0 +1,111 @@
+import asyncio
+import random
+from typing import Optional
+
+import aiohttp
+from sqlalchemy.exc import OperationalError
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from database.crud.dead_letters import add_dead_letter
+from worker.client import TelegramError
+from worker.runtime import get_sessions
+
+
+# Временные ошибки, кроме ответов Bot API: сеть, таймаут запроса
+# и занятая база SQLite ("database is locked").
+TRANSIENT_ERRORS = (
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    ConnectionError,
+    OperationalError,
+)
+
+
+class ReminderClaimed(Exception):
+    """
+    Напоминание захвачено другой доставкой, которая еще не завершена.
+
+    Если та доставка прервалась (воркер убит), захват истечет,
+    поэтому доставка повторяется после его срока, а не пропускается.
+    """
+
+    def __init__(self, reminder_id: int, retry_after: float):
+        """
+        Args:
+            reminder_id: ID напоминания в базе данных
+            retry_after: Реальных секунд до истечения захвата
+        """
+        super().__init__(
+            f"Напоминание {reminder_id} захвачено другой доставкой"
+        )
+        self.retry_after = retry_after
+
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Задержка перед повтором доставки после ошибки.
+
+    Повторяются только временные ошибки: сеть, 5xx и 429. На 429
+    ждется retry_after из ответа, остальные повторы ждут
+    экспоненциально растущее время, ограниченное
+    DELIVERY_RETRY_MAX_SECONDS, со случайным разбросом в половину
+    задержки, чтобы повторы после общего сбоя не пришли одновременно.
+    Ошибки запроса (400, 403 и прочие 4xx) и ошибки кода
+    не повторяются. Захваченное другой доставкой напоминание
+    проверяется снова после срока захвата, без учета числа попыток.
+
+    Args:
+        error: Ошибка доставки
+        attempt: Номер неудачной попытки, начиная с 0
+
+    Returns:
+        Optional[float]: Задержка в реальных секундах или None, если
+        повторять не нужно (постоянная ошибка или повторы исчерпаны)
+    """
+    if isinstance(error, ReminderClaimed):
+        return error.retry_after + random.uniform(0, 1)
+    if attempt >= settings.DELIVERY_MAX_RETRIES:
+        return None
+    if isinstance(error, TelegramError):
+        if not error.retryable:
+            return None
+        if error.code == 429:
+            return (error.retry_after or 1) + random.uniform(0, 1)
+    elif not isinstance(error, TRANSIENT_ERRORS):
+        return None
+    delay = min(
+        settings.DELIVERY_RETRY_MAX_SECONDS,
+        settings.DELIVERY_RETRY_BASE_SECONDS * 2 ** attempt
+    )
+    return random.uniform(delay / 2, delay)
+
+
+async def dead_letter(
+    reminder_id: int,
+    user_id: int,
+    error: Exception,
+    attempts: int
+):
+    """
+    Записывает напоминание в недоставленные.
+
+    Args:
+        reminder_id: ID напоминания в базе данных
+        user_id: ID пользователя в Telegram
+        error: Последняя ошибка доставки
+        attempts: Сколько попыток сделано
+    """
+    print(
+        f"DELIVERY: Напоминание {reminder_id} не доставлено "
+        f"после {attempts} попыток: {error!r}"
+    )
+    async with get_sessions()() as db:
+        await add_dead_letter(
+            db,
+            reminder_id,
+            user_id,
+            repr(error)[:500],
+            attempts,
+            int(clock.time())
+        )
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from typing import Awaitable, Optional, TypeVar
+
+from dramatiq import Middleware
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.core.config import settings
+from bot.core.tracing import tracer
+from database.session import create_engine
+from worker.client import TelegramClient
+
+
+T = TypeVar("T")
+
+# Состояние рабочего потока Dramatiq: цикл событий, клиент Bot API
+# и движок базы данных. Сессия aiohttp и пул соединений SQLAlchemy
+# привязаны к циклу, в котором созданы, поэтому у каждого потока свои.
+_local = threading.local()
+
+# Срок плавной остановки процесса по часам time.monotonic().
+_shutdown_deadline: Optional[float] = None
+_shutdown_lock = threading.Lock()
+
+
+def run(coro: Awaitable[T]) -> T:
+    """
+    Выполняет корутину в долгоживущем цикле событий текущего потока.
+
+    В отличие от asyncio.run, цикл не закрывается после задачи,
+    и соединения переиспользуются между сообщениями.
+    """
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+def get_client() -> TelegramClient:
+    """Возвращает клиент Bot API текущего потока."""
+    client = getattr(_local, "client", None)
+    if client is None:
+        client = _local.client = TelegramClient(
+            settings.BOT_TOKEN,
+            settings.TELEGRAM_API_URL
+        )
+    return client
+
+
+def get_sessions() -> async_sessionmaker:
+    """Возвращает фабрику сессий базы данных текущего потока."""
+    sessions = getattr(_local, "sessions", None)
+    if sessions is None:
+        _local.engine = create_engine()
+        sessions = _local.sessions = async_sessionmaker(
+            _local.engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return sessions
+
+
+async def _close_resources():
+    client = getattr(_local, "client", None)
+    if client is not None:
+        await client.close()
+    engine = getattr(_local, "engine", None)
+    if engine is not None:
+        await engine.dispose()
+
+
+def close():
+    """Закрывает клиент, движок и цикл событий текущего потока."""
+    loop = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        return
+    loop.run_until_complete(_close_resources())
+    loop.close()
+    _local.__dict__.clear()
+
+
+def shutdown_remaining() -> float:
+    """
+    Сколько секунд осталось до конца плавной остановки.
+
+    Срок SHUTDOWN_TIMEOUT_SECONDS отсчитывается от первого вызова
+    (начала остановки) и общий для всех этапов: диспетчера,
+    продвижения и выгрузки журнала доставок. Поэтому остановка
+    целиком укладывается в этот срок, а не в сумму ожиданий этапов.
+    """
+    global _shutdown_deadline
+    with _shutdown_lock:
+        if _shutdown_deadline is None:
+            _shutdown_deadline = (
+                time.monotonic() + settings.SHUTDOWN_TIMEOUT_SECONDS
+            )
+        return max(0.0, _shutdown_deadline - time.monotonic())
+
+
+class ThreadCleanupMiddleware(Middleware):
+    """
+    Освобождает ресурсы потока при остановке рабочего потока Dramatiq
+    и выгружает накопленные участки трасс после остановки воркера.
+    Начало остановки воркера запускает отсчет общего срока
+    (shutdown_remaining).
+    """
+
+    def before_worker_shutdown(self, broker, worker):
+        shutdown_remaining()
+
+    def before_worker_thread_shutdown(self, broker, thread):
+        close()
+
+    def after_worker_shutdown(self, broker, worker):
+        tracer.flush()
@@ -0,0 +1,360 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from dramatiq import Message
+from sqlalchemy import Row
+
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import (
+    SCHEDULE_CLAIMED_KEY,
+    SCHEDULE_DUE_KEY,
+    get_redis
+)
+from database.crud.reminders import (
+    get_dispatch_rows,
+    get_shard_due_reminders
+)
+from worker.broker import broker
+from worker.runtime import get_sessions
+from worker.shards import shard_of
+
+
+# Пары (напоминание с полями id, user_id, text, remind_at;
+# ID пользователя в Telegram).
+Scheduled = Iterable[Tuple[Row, int]]
+
+# Выбор наступивших напоминаний шардов одним атомарным вызовом.
+# KEYS - пары (очередь шарда, захваченные шарда), ARGV - текущее
+# виртуальное время, предел пачки и срок захвата в мс. Выбранные
+# ID переносятся в захваченные со сроком по часам сервера Redis;
+# захваты, не подтвержденные до срока (узел упал посреди отправки),
+# сначала возвращаются в очередь шарда.
+CLAIM_SCRIPT = """
+local t = redis.call('time')
+local real = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local limit = tonumber(ARGV[2])
+local out = {}
+for i = 1, #KEYS, 2 do
+    local due, claimed = KEYS[i], KEYS[i + 1]
+    local expired = redis.call(
+        'zrangebyscore', claimed, '-inf', real, 'LIMIT', 0, 1000)
+    for _, id in ipairs(expired) do
+        redis.call('zadd', due, 'NX', ARGV[1], id)
+        redis.call('zrem', claimed, id)
+    end
+    if #out < limit then
+        local ids = redis.call(
+            'zrangebyscore', due, '-inf', ARGV[1], 'LIMIT', 0, limit - #out)
+        for _, id in ipairs(ids) do
+            redis.call('zrem', due, id)
+            redis.call('zadd', claimed, real + tonumber(ARGV[3]), id)
+            out[#out + 1] = id
+        end
+    end
+end
+return out
+"""
+
+
+class Scheduler:
+    """
+    Планировщик напоминаний: как напоминание попадает к воркеру.
+
+    Сервисы бота и воркер вызывают только schedule() и cancel().
+    Планировщики с polled=True не ставят задач в очередь: наступившие
+    напоминания выбирает диспетчер воркера (worker/dispatcher.py)
+    через claim_due(), подтверждает ack() и возвращает release().
+
+    При SCHEDULE_HORIZON_SECONDS планировщик хранит только напоминания,
+    наступающие в пределах горизонта; более поздние остаются в базе,
+    и их ставит продвижение (worker/promoter.py), когда они входят
+    в окно.
+    """
+
+    polled = False
+
+    def horizon(self) -> Optional[float]:
+        """
+        Крайнее время напоминаний, которые принимает планировщик.
+
+        Горизонт задан в реальных секундах и растет с ускорением часов.
+
+        Returns:
+            Optional[float]: UTC epoch или None, если горизонта нет
+        """
+        if not settings.SCHEDULE_HORIZON_SECONDS:
+            return None
+        return clock.time() + settings.SCHEDULE_HORIZON_SECONDS * clock.speed
+
+    def schedule(self, reminders: Scheduled) -> int:
+        """
+        Планирует отправку напоминаний в их remind_at.
+
+        Повторный вызов для того же напоминания переносит его.
+        Напоминания за горизонтом не планируются, а перенесенные
+        за горизонт снимаются с планировщика.
+
+        Returns:
+            int: Сколько напоминаний запланировано
+        """
+        horizon = self.horizon()
+        if horizon is None:
+            return self._enqueue(reminders)
+        within, beyond = [], []
+        for reminder, tg_id in reminders:
+            if reminder.remind_at <= horizon:
+                within.append((reminder, tg_id))
+            else:
+                beyond.append(reminder)
+        self._drop(beyond)
+        return self._enqueue(within)
+
+    def _enqueue(self, reminders: Scheduled) -> int:
+        raise NotImplementedError
+
+    def _drop(self, reminders: List[Row]):
+        """Снимает напоминания, перенесенные за горизонт."""
+
+    def cancel(self, reminder_id: int, user_id: int):
+        """Отменяет отправку удаленного напоминания."""
+
+    async def claim_due(
+        self,
+        shards: Set[int],
+        now: float,
+        limit: int
+    ) -> List[Row]:
+        """
+        Выбирает наступившие напоминания шардов.
+
+        Returns:
+            List[Row]: Строки (id, user_id, tg_id, text)
+        """
+        raise NotImplementedError
+
+    def ack(self, rows: List[Row]):
+        """Подтверждает обработку выбранных напоминаний."""
+
+    def release(self, rows: List[Row], at: float):
+        """Возвращает выбранные напоминания к отправке в момент at."""
+
+
+class DramatiqScheduler(Scheduler):
+    """
+    Отложенные сообщения Dramatiq, по одному на срабатывание.
+
+    Перенос ставит еще одно сообщение, отмены нет: устаревшие
+    сообщения отбрасывает проверка в задаче.
+    """
+
+    def _enqueue(self, reminders: Scheduled) -> int:
+        # Сообщение собирается без объекта задачи: бот ставит задачи
+        # воркера, не импортируя worker.tasks.
+        count = 0
+        for reminder, tg_id in reminders:
+            broker.enqueue(
+                Message(
+                    queue_name="default",
+                    actor_name="send_reminder",
+                    args=(reminder.id, tg_id, reminder.text),
+                    kwargs={},
+                    options={}
+                ),
+                delay=clock.delay(reminder.remind_at) * 1000
+            )
+            count += 1
+        return count
+
+
+class DatabaseScheduler(Scheduler):
+    """
+    Источник - сама база: диспетчер выбирает наступившие напоминания
+    своих шардов по индексу (is_sent, remind_at).
+
+    Возвращенные позже срока напоминания узел исключает из выборки,
+    пока срок не наступит.
+    """
+
+    polled = True
+
+    def __init__(self):
+        self._retry_at: Dict[int, float] = {}
+
+    def horizon(self) -> Optional[float]:
+        return None
+
+    def _enqueue(self, reminders: Scheduled) -> int:
+        return sum(1 for _ in reminders)
+
+    async def claim_due(
+        self,
+        shards: Set[int],
+        now: float,
+        limit: int
+    ) -> List[Row]:
+        self._retry_at = {
+            reminder_id: at for reminder_id, at in self._retry_at.items()
+            if at > now
+        }
+        async with get_sessions()() as db:
+            return await get_shard_due_reminders(
+                db,
+                int(now),
+                sorted(shards),
+                settings.DISPATCH_SHARDS,
+                limit,
+                list(self._retry_at)
+            )
+
+    def release(self, rows: List[Row], at: float):
+        if at > clock.time():
+            for row in rows:
+                self._retry_at[row.id] = at
+
+
+class RedisScheduler(Scheduler):
+    """
+    Индекс таймеров в Redis: ZSET reminder_id -> remind_at на шард.
+
+    Перенос - ZADD, отмена - ZREM, оба O(log n); размер очереди
+    и ближайшие срабатывания видны обычными командами ZSET.
+    Диспетчеры узлов выбирают наступившие ID скриптом CLAIM_SCRIPT
+    и после обработки снимают захват; захват узла, упавшего
+    до подтверждения, истекает через SCHEDULE_CLAIM_SECONDS,
+    и напоминание возвращается в очередь. Если напоминание еще
+    захвачено доставкой в базе (claimed_until), оно откладывается
+    до конца того захвата, а не отбрасывается: истекший захват
+    в базе означает, что отправка не состоялась.
+    """
+
+    polled = True
+
+    def __init__(self):
+        self.client = get_redis()
+        self._claim = self.client.register_script(CLAIM_SCRIPT)
+        self._turn = 0
+
+    @staticmethod
+    def _shard(user_id: int) -> int:
+        return shard_of(user_id, settings.DISPATCH_SHARDS)
+
+    def _enqueue(self, reminders: Scheduled) -> int:
+        count = 0
+        pipe = self.client.pipeline(transaction=False)
+        for reminder, _ in reminders:
+            pipe.zadd(
+                SCHEDULE_DUE_KEY.format(shard=self._shard(reminder.user_id)),
+                {reminder.id: reminder.remind_at}
+            )
+            count += 1
+        if count:
+            pipe.execute()
+        return count
+
+    def cancel(self, reminder_id: int, user_id: int):
+        self.client.zrem(
+            SCHEDULE_DUE_KEY.format(shard=self._shard(user_id)), reminder_id
+        )
+
+    def _drop(self, reminders: List[Row]):
+        if not reminders:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for reminder in reminders:
+            pipe.zrem(
+                SCHEDULE_DUE_KEY.format(shard=self._shard(reminder.user_id)),
+                reminder.id
+            )
+        pipe.execute()
+
+    async def claim_due(
+        self,
+        shards: Set[int],
+        now: float,
+        limit: int
+    ) -> List[Row]:
+        # Первым опрашивается каждый раз следующий шард, чтобы
+        # отставание одних шардов не задерживало другие.
+        ordered = sorted(shards)
+        self._turn = (self._turn + 1) % len(ordered)
+        keys = []
+        for shard in ordered[self._turn:] + ordered[:self._turn]:
+            keys += [
+                SCHEDULE_DUE_KEY.format(shard=shard),
+                SCHEDULE_CLAIMED_KEY.format(shard=shard),
+            ]
+        ids = [
+            int(reminder_id) for reminder_id in self._claim(
+                keys=keys,
+                args=[
+                    int(now),
+                    limit,
+                    int(settings.SCHEDULE_CLAIM_SECONDS * 1000)
+                ]
+            )
+        ]
+        if not ids:
+            return []
+        async with get_sessions()() as db:
+            rows = await get_dispatch_rows(db, ids)
+        # Удаленные, отправленные и недоступные отправлять не нужно:
+        # их захват снимается сразу.
+        found = {row.id for row in rows}
+        missing = [i for i in ids if i not in found]
+        if missing:
+            pipe = self.client.pipeline(transaction=False)
+            for shard in shards:
+                pipe.zrem(SCHEDULE_CLAIMED_KEY.format(shard=shard), *missing)
+            pipe.execute()
+        # Напоминание с действующим захватом доставкой еще отправляет
+        # другой узел: оно возвращается в очередь к сроку захвата.
+        ready = []
+        for row in rows:
+            if row.claimed_until and row.claimed_until > now:
+                self.release([row], row.claimed_until)
+            else:
+                ready.append(row)
+        return ready
+
+    def ack(self, rows: List[Row]):
+        if not rows:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for row in rows:
+            pipe.zrem(
+                SCHEDULE_CLAIMED_KEY.format(shard=self._shard(row.user_id)),
+                row.id
+            )
+        pipe.execute()
+
+    def release(self, rows: List[Row], at: float):
+        if not rows:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for row in rows:
+            shard = self._shard(row.user_id)
+            pipe.zadd(
+                SCHEDULE_DUE_KEY.format(shard=shard), {row.id: int(at)},
+                nx=True
+            )
+            pipe.zrem(SCHEDULE_CLAIMED_KEY.format(shard=shard), row.id)
+        pipe.execute()
+
+
+SCHEDULERS: Dict[str, Type[Scheduler]] = {
+    "dramatiq": DramatiqScheduler,
+    "database": DatabaseScheduler,
+    "redis": RedisScheduler,
+}
+
+
+@lru_cache(maxsize=None)
+def get_scheduler() -> Scheduler:
+    """
+    Возвращает планировщик процесса по SCHEDULER_BACKEND.
+
+    Returns:
+        Scheduler: Общий для потоков экземпляр
+    """
+    return SCHEDULERS[settings.SCHEDULER_BACKEND]()
@@ -0,0 +1,189 @@
+import os
+import socket
+import time
+import uuid
+import zlib
+from typing import Dict, Optional, Set
+
+import redis
+
+from bot.core.redis import DISPATCH_NODES_KEY, SHARD_LEASE_KEY
+
+
+# Сигнал узла: отметка в множестве живых узлов по часам сервера Redis
+# и удаление узлов, от которых не было сигнала дольше срока аренды.
+# Возвращает число живых узлов.
+HEARTBEAT_SCRIPT = """
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+redis.call('zadd', KEYS[1], now, ARGV[1])
+redis.call('zremrangebyscore', KEYS[1], '-inf', now - tonumber(ARGV[2]))
+return redis.call('zcard', KEYS[1])
+"""
+
+# Продление и освобождение аренды только ее владельцем.
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def shard_of(user_id: int, shard_count: int) -> int:
+    """Номер шарда пользователя по его ID в базе."""
+    return user_id % shard_count
+
+
+class ShardLeases:
+    """
+    Аренда шардов диспетчера узлом воркера через Redis.
+
+    Каждый шард принадлежит не более чем одному узлу: ключ аренды
+    создается SET NX PX и продлевается только владельцем. Узел держит
+    не больше своей доли - округленного вверх числа шардов на живой
+    узел. Когда узел появляется, остальные отдают лишние шарды
+    при следующей перебалансировке; когда узел пропадает, его аренды
+    истекают и шарды разбирают оставшиеся узлы.
+
+    Методы синхронные и выполняются в потоке диспетчера; время аренды
+    считается по монотонным часам с запасом на задержку до Redis.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        shard_count: int,
+        lease_seconds: float,
+        node: Optional[str] = None
+    ):
+        """
+        Args:
+            client: Синхронный клиент Redis
+            shard_count: Общее число шардов
+            lease_seconds: Срок аренды
+            node: ID узла; по умолчанию - имя хоста, PID и случайный
+                суффикс
+        """
+        self.client = client
+        self.shard_count = shard_count
+        self.lease_ms = int(lease_seconds * 1000)
+        self.node = node or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        # Узлы начинают перебирать свободные шарды с разных мест,
+        # чтобы реже соперничать за один и тот же ключ.
+        offset = zlib.crc32(self.node.encode()) % shard_count
+        self._order = [
+            (offset + i) % shard_count for i in range(shard_count)
+        ]
+        self._expires: Dict[int, float] = {}
+        self._heartbeat = client.register_script(HEARTBEAT_SCRIPT)
+        self._renew = client.register_script(RENEW_SCRIPT)
+        self._release = client.register_script(RELEASE_SCRIPT)
+
+    @staticmethod
+    def _key(shard: int) -> str:
+        return SHARD_LEASE_KEY.format(shard=shard)
+
+    def owned(self) -> Set[int]:
+        """
+        Шарды, аренда которых действует еще хотя бы треть срока.
+
+        Returns:
+            Set[int]: Номера шардов
+        """
+        deadline = time.monotonic() + self.lease_ms / 3000
+        return {
+            shard for shard, expires in self._expires.items()
+            if expires > deadline
+        }
+
+    def renew(self) -> int:
+        """
+        Отправляет сигнал узла и продлевает аренду своих шардов.
+
+        Шарды, аренду которых узел потерял (истекла и занята другим),
+        перестают считаться своими.
+
+        Returns:
+            int: Число живых узлов
+        """
+        started = time.monotonic()
+        nodes = self._heartbeat(
+            keys=[DISPATCH_NODES_KEY], args=[self.node, self.lease_ms]
+        )
+        shards = list(self._expires)
+        if shards:
+            pipe = self.client.pipeline(transaction=False)
+            for shard in shards:
+                self._renew(
+                    keys=[self._key(shard)],
+                    args=[self.node, self.lease_ms],
+                    client=pipe
+                )
+            for shard, renewed in zip(shards, pipe.execute()):
+                if renewed:
+                    self._expires[shard] = started + self.lease_ms / 1000
+                else:
+                    del self._expires[shard]
+        return max(1, nodes)
+
+    def rebalance(self) -> Set[int]:
+        """
+        Продлевает аренду и приводит число своих шардов к доле узла:
+        отдает лишние и занимает свободные.
+
+        Returns:
+            Set[int]: Шарды, которыми узел владеет после шага
+        """
+        nodes = self.renew()
+        share = -(-self.shard_count // nodes)
+
+        extra = sorted(
+            self._expires, key=self._order.index
+        )[share:]
+        if extra:
+            self._release_shards(extra)
+
+        need = share - len(self._expires)
+        if need > 0:
+            started = time.monotonic()
+            holders = self.client.mget(
+                [self._key(shard) for shard in range(self.shard_count)]
+            )
+            free = [
+                shard for shard in self._order if holders[shard] is None
+            ][:need]
+            if free:
+                pipe = self.client.pipeline(transaction=False)
+                for shard in free:
+                    pipe.set(
+                        self._key(shard), self.node, nx=True, px=self.lease_ms
+                    )
+                for shard, acquired in zip(free, pipe.execute()):
+                    if acquired:
+                        self._expires[shard] = (
+                            started + self.lease_ms / 1000
+                        )
+        return self.owned()
+
+    def _release_shards(self, shards):
+        pipe = self.client.pipeline(transaction=False)
+        for shard in shards:
+            self._release(
+                keys=[self._key(shard)], args=[self.node], client=pipe
+            )
+            self._expires.pop(shard, None)
+        pipe.execute()
+
+    def release_all(self):
+        """Отдает все шарды и снимает узел из списка живых."""
+        self._release_shards(list(self._expires))
+        self.client.zrem(DISPATCH_NODES_KEY, self.node)
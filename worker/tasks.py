@@ -1,50 +1,244 @@
 import asyncio
+from typing import Optional
 
 import dramatiq
+from dramatiq.middleware import CurrentMessage
 
-from bot.keyboards.reply import reply_keyboard
-from bot.core.loader import bot
-from database.session import AsyncSessionLocal
-from database.crud.reminders import get_reminder, mark_reminder_as_sent
-from database.crud.users import get_user
+from bot.core.clock import clock
+from bot.core.config import settings
+from bot.core.redis import (
+    BROADCAST_OWNER_KEY,
+    BROADCAST_RATE_KEY,
+    get_redis
+)
+from bot.core.tracing import tracer
+from database.crud.broadcasts import advance_broadcast, get_broadcast
+from database.crud.users import get_recipient_batch, mark_unreachable
+from worker.broker import broker
+from worker.client import TelegramError
+from worker.delivery import deliver, is_unreachable, remember_unreachable
+from worker.delivery_log import DeliveryLogMiddleware
+from worker.dispatcher import DispatcherMiddleware
+from worker.health import HealthMiddleware
+from worker.promoter import PromoterMiddleware
+from worker.ratelimit import TokenBucket
+from worker.retries import dead_letter, retry_delay
+from worker.runtime import (
+    ThreadCleanupMiddleware,
+    get_client,
+    get_sessions,
+    run
+)
 
 
-@dramatiq.actor
+# Обработчики остановки вызываются в порядке добавления: журнал
+# доставок и трассы выгружаются после остановки диспетчера
+# и продвижения.
+broker.add_middleware(CurrentMessage())
+broker.add_middleware(HealthMiddleware())
+broker.add_middleware(DispatcherMiddleware())
+broker.add_middleware(PromoterMiddleware())
+broker.add_middleware(DeliveryLogMiddleware())
+broker.add_middleware(ThreadCleanupMiddleware())
+
+# Общий для всех процессов воркера предел частоты сообщений рассылки.
+broadcast_bucket = TokenBucket(BROADCAST_RATE_KEY, settings.BROADCAST_RATE)
+
+
+@dramatiq.actor(max_retries=settings.DELIVERY_MAX_RETRIES)
 def send_reminder(reminder_id: int, user_id: int, text: str):
     """
     Фоновая задача для отправки напоминания пользователю.
 
+    Если включено объединение (COALESCE_WINDOW_SECONDS), другие
+    напоминания пользователя, срабатывающие в пределах окна,
+    отправляются тем же сообщением и помечаются отправленными вместе;
+    их собственные сообщения в очереди затем пропускаются.
+
+    Для повторяющихся напоминаний после отправки вычисляется
+    и планируется только следующее срабатывание.
+
+    Если бот заблокирован пользователем (403 или "chat not found"),
+    пользователь помечается недоступным, и все его напоминания,
+    уже стоящие в очереди, пропускаются проверкой множества в Redis
+    без обращения к базе и Bot API.
+
+    После временной ошибки (сеть, 5xx, 429) сообщение повторяется
+    через задержку retry_delay(); после постоянной ошибки или
+    DELIVERY_MAX_RETRIES повторов напоминание записывается
+    в недоставленные.
+
     Args:
         reminder_id: ID напоминания в базе данных
         user_id: ID пользователя в Telegram
         text: Текст напоминания для отправки
+
+    Raises:
+        dramatiq.Retry: Повторить сообщение через заданную задержку
     """
+    message = CurrentMessage.get_current_message()
+    attempt = message.options.get("retries", 0) if message else 0
 
     async def send():
         """
         Асинхронная функция отправки сообщения с напоминанием.
+
+        Returns:
+            Optional[float]: Задержка до повтора в секундах или None
         """
         try:
-            async with AsyncSessionLocal() as db:
-                user = await get_user(db, user_id)
-                if user.is_blocked:
-                    return
+            await deliver(reminder_id, user_id, text)
+        except Exception as e:
+            delay = retry_delay(e, attempt)
+            if delay is None:
+                await dead_letter(reminder_id, user_id, e, attempt + 1)
+                return None
+            print(
+                f"DRAMATIQ: Ошибка отправки, повтор через "
+                f"{delay:.1f} с: {e!r}"
+            )
+            return delay
 
-                reminder = await get_reminder(db, reminder_id)
-                if not reminder or reminder.is_sent:
-                    return
+    if is_unreachable(user_id):
+        return
 
-                keyboard = reply_keyboard(reminder_id)
+    with tracer.span("worker.send_reminder", reminder_id=reminder_id):
+        delay = run(send())
+    if delay is not None:
+        raise dramatiq.Retry(
+            f"Повтор доставки {reminder_id}", delay=int(delay * 1000)
+        )
 
-                await bot.send_message(
-                    chat_id=user_id,
-                    text=f"🔔 Напоминание: {text}",
-                    reply_markup=keyboard
-                )
 
-                await mark_reminder_as_sent(db, reminder_id)
+async def _send_broadcast_message(chat_id: int, text: str) -> str:
+    """
+    Отправляет одно сообщение рассылки с учетом общего лимита.
 
-        except Exception as e:
-            print(f"DRAMATIQ: Ошибка отправки: {e}")
+    На 429 ждет retry_after и пробует еще раз.
+
+    Returns:
+        str: "sent", "failed" или "unreachable" (бот заблокирован)
+    """
+    client = get_client()
+    for _ in range(2):
+        await broadcast_bucket.acquire()
+        try:
+            await client.send_message(chat_id, text)
+            return "sent"
+        except TelegramError as e:
+            if e.chat_unavailable:
+                return "unreachable"
+            if e.code != 429:
+                return "failed"
+            await asyncio.sleep(e.retry_after or 1)
+        except Exception:
+            return "failed"
+    return "failed"
+
+
+def _broadcast_status(broadcast, now: float) -> str:
+    elapsed = max(1.0, now - broadcast.started_at)
+    state = "✅ Рассылка завершена" if broadcast.finished_at else (
+        "📣 Рассылка идет"
+    )
+    return (
+        f"{state} (#{broadcast.id})\n\n"
+        f"Доставлено: {broadcast.sent}\n"
+        f"Ошибок: {broadcast.failed}\n"
+        f"Скорость: {broadcast.sent / elapsed:.1f} сообщ./с"
+    )
+
+
+def _own_broadcast(broadcast_id: int, token: str) -> bool:
+    """
+    Проверяет, что цепочка token владеет рассылкой, и продлевает
+    владение на BROADCAST_STALE_SECONDS.
+
+    Если владение истекло (например, пока задача ждала повтора),
+    цепочка снова берет его, если рассылку никто не продолжил.
+    """
+    client = get_redis()
+    key = BROADCAST_OWNER_KEY.format(broadcast_id=broadcast_id)
+    ttl = settings.BROADCAST_STALE_SECONDS
+    if client.set(key, token, nx=True, ex=ttl):
+        return True
+    owner = client.get(key)
+    if owner is None or owner.decode() != token:
+        return False
+    client.expire(key, ttl)
+    return True
+
+
+@dramatiq.actor(max_retries=5)
+def process_broadcast(broadcast_id: int, token: Optional[str] = None):
+    """
+    Обрабатывает одну пачку получателей рассылки.
+
+    Получатели выбираются по курсору рассылки, сообщения пачки
+    отправляются параллельно через общий ограничитель частоты.
+    После пачки прогресс сохраняется в базе, сообщение администратора
+    обновляется, и задача ставит в очередь следующую пачку. При сбое
+    рассылка продолжается с сохраненного курсора (сообщения
+    незавершенной пачки могут быть доставлены повторно).
+
+    Рассылку ведет одна цепочка задач: пачка цепочки, которая больше
+    не владеет рассылкой (ее продолжила /broadcast_resume), ничего
+    не отправляет.
+
+    Args:
+        broadcast_id: ID рассылки
+        token: Токен цепочки; None - сообщение, поставленное до
+            появления токенов
+    """
+
+    async def process():
+        async with get_sessions()() as db:
+            broadcast = await get_broadcast(db, broadcast_id)
+            if not broadcast or broadcast.finished_at:
+                return False
+
+            recipients = await get_recipient_batch(
+                db,
+                broadcast.cursor,
+                settings.BROADCAST_BATCH_SIZE
+            )
+            results = await asyncio.gather(*(
+                _send_broadcast_message(tg_id, broadcast.text)
+                for _, tg_id in recipients
+            ))
+            sent = results.count("sent")
+            unreachable = [
+                tg_id for (_, tg_id), result in zip(recipients, results)
+                if result == "unreachable"
+            ]
+            await mark_unreachable(db, unreachable)
+            remember_unreachable(unreachable)
+            finished = len(recipients) < settings.BROADCAST_BATCH_SIZE
+            broadcast = await advance_broadcast(
+                db,
+                broadcast_id,
+                recipients[-1][0] if recipients else broadcast.cursor,
+                sent,
+                len(results) - sent,
+                int(clock.time()) if finished else None
+            )
+
+        if broadcast.status_message_id:
+            try:
+                await get_client().call(
+                    "editMessageText",
+                    chat_id=broadcast.admin_chat_id,
+                    message_id=broadcast.status_message_id,
+                    text=_broadcast_status(broadcast, clock.time())
+                )
+            except Exception as e:
+                print(f"DRAMATIQ: Ошибка обновления статуса рассылки: {e}")
+        return not finished
+
+    if token is not None and not _own_broadcast(broadcast_id, token):
+        print(f"DRAMATIQ: Рассылка {broadcast_id} продолжена другой цепочкой")
+        return
 
-    asyncio.run(send())
+    with tracer.span("worker.process_broadcast", broadcast_id=broadcast_id):
+        if run(process()):
+            process_broadcast.send(broadcast_id, token)